@@ -0,0 +1,28 @@
+"""Add blogposts keyset index
+
+Revision ID: 4b1e9d2a7c53
+Revises: c78aa705c096
+Create Date: 2026-10-18 09:02:11.204318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b1e9d2a7c53'
+down_revision: Union[str, None] = 'c78aa705c096'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_blogposts_created_at_id', 'blogposts', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_blogposts_created_at_id', table_name='blogposts')
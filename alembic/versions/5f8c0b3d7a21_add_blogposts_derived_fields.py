@@ -0,0 +1,34 @@
+"""Add blogposts derived content fields
+
+Revision ID: 5f8c0b3d7a21
+Revises: e2a7c4b19f06
+Create Date: 2026-10-18 12:14:27.518304
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f8c0b3d7a21'
+down_revision: Union[str, None] = 'e2a7c4b19f06'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('blogposts', sa.Column('excerpt', sa.String(), nullable=True))
+    op.add_column('blogposts', sa.Column('word_count', sa.Integer(), nullable=True))
+    op.add_column('blogposts', sa.Column('reading_time', sa.Integer(), nullable=True))
+    op.add_column('blogposts', sa.Column('content_hash', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('blogposts', 'content_hash')
+    op.drop_column('blogposts', 'reading_time')
+    op.drop_column('blogposts', 'word_count')
+    op.drop_column('blogposts', 'excerpt')
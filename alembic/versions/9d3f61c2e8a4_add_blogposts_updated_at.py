@@ -0,0 +1,30 @@
+"""Add blogposts updated_at
+
+Revision ID: 9d3f61c2e8a4
+Revises: 4b1e9d2a7c53
+Create Date: 2026-10-18 10:14:37.518042
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d3f61c2e8a4'
+down_revision: Union[str, None] = '4b1e9d2a7c53'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('blogposts', sa.Column('updated_at', sa.DateTime(), nullable=True))
+    op.execute("UPDATE blogposts SET updated_at = COALESCE(created_at, timezone('utc', now()))")
+    op.alter_column('blogposts', 'updated_at', nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('blogposts', 'updated_at')
@@ -0,0 +1,138 @@
+"""Add tag and tech stats
+
+Revision ID: a3d9e6f1c482
+Revises: 5f8c0b3d7a21
+Create Date: 2026-10-18 13:02:41.730518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3d9e6f1c482'
+down_revision: Union[str, None] = '5f8c0b3d7a21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Frozen copy of the trigger DDL in app.models.stats as of this revision, so
+# that later changes to the models do not change what this migration runs.
+#
+# (summary table, key, counter, link table, item table, item key)
+FACETS = (
+    ("tag_stats", "tag_id", "post_count", "blogpost_tags", "blogposts", "blogpost_id"),
+    (
+        "tech_stats",
+        "tech_id",
+        "project_count",
+        "project_techs",
+        "projects",
+        "project_id",
+    ),
+)
+
+
+def facet_triggers_ddl(
+    stats: str, key: str, counter: str, link: str, items: str, item_key: str
+) -> list[str]:
+    upsert = (
+        f"ON CONFLICT ({key}) DO UPDATE "
+        f"SET {counter} = {stats}.{counter} + EXCLUDED.{counter};"
+    )
+
+    return [
+        f"""
+        CREATE OR REPLACE FUNCTION {stats}_on_link() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO {stats} ({key}, {counter})
+            SELECT changed.{key},
+                   count(*) * CASE TG_OP WHEN 'INSERT' THEN 1 ELSE -1 END
+            FROM changed JOIN {items} ON {items}.id = changed.{item_key}
+            WHERE {items}.is_active
+            GROUP BY changed.{key}
+            {upsert}
+            RETURN NULL;
+        END $$ LANGUAGE plpgsql;
+        """,
+        f"""
+        CREATE OR REPLACE FUNCTION {stats}_on_item_update() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO {stats} ({key}, {counter})
+            SELECT {link}.{key},
+                   sum(CASE WHEN coalesce(new_rows.is_active, false)
+                       THEN 1 ELSE -1 END)
+            FROM old_rows
+            JOIN new_rows ON new_rows.id = old_rows.id
+            JOIN {link} ON {link}.{item_key} = new_rows.id
+            WHERE coalesce(old_rows.is_active, false)
+                  <> coalesce(new_rows.is_active, false)
+            GROUP BY {link}.{key}
+            {upsert}
+            RETURN NULL;
+        END $$ LANGUAGE plpgsql;
+        """,
+        f"""
+        CREATE OR REPLACE TRIGGER {stats}_link_insert AFTER INSERT ON {link}
+        REFERENCING NEW TABLE AS changed
+        FOR EACH STATEMENT EXECUTE FUNCTION {stats}_on_link();
+        """,
+        f"""
+        CREATE OR REPLACE TRIGGER {stats}_link_delete AFTER DELETE ON {link}
+        REFERENCING OLD TABLE AS changed
+        FOR EACH STATEMENT EXECUTE FUNCTION {stats}_on_link();
+        """,
+        f"""
+        CREATE OR REPLACE TRIGGER {stats}_item_update AFTER UPDATE ON {items}
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION {stats}_on_item_update();
+        """,
+    ]
+
+
+def facet_rebuild_sql(
+    stats: str, key: str, counter: str, link: str, items: str, item_key: str
+) -> list[str]:
+    return [
+        f"DELETE FROM {stats};",
+        f"""
+        INSERT INTO {stats} ({key}, {counter})
+        SELECT {link}.{key}, count(*)
+        FROM {link} JOIN {items} ON {items}.id = {link}.{item_key}
+        WHERE {items}.is_active
+        GROUP BY {link}.{key};
+        """,
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('tag_stats',
+    sa.Column('tag_id', sa.Integer(), nullable=False),
+    sa.Column('post_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['tag_id'], ['tags.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('tag_id')
+    )
+    op.create_table('tech_stats',
+    sa.Column('tech_id', sa.Integer(), nullable=False),
+    sa.Column('project_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['tech_id'], ['techs.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('tech_id')
+    )
+    for facet in FACETS:
+        for statement in facet_triggers_ddl(*facet) + facet_rebuild_sql(*facet):
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for stats, _, _, link, items, _ in FACETS:
+        op.execute(f'DROP TRIGGER IF EXISTS {stats}_link_insert ON {link}')
+        op.execute(f'DROP TRIGGER IF EXISTS {stats}_link_delete ON {link}')
+        op.execute(f'DROP TRIGGER IF EXISTS {stats}_item_update ON {items}')
+        op.execute(f'DROP FUNCTION IF EXISTS {stats}_on_link()')
+        op.execute(f'DROP FUNCTION IF EXISTS {stats}_on_item_update()')
+    op.drop_table('tech_stats')
+    op.drop_table('tag_stats')
@@ -0,0 +1,32 @@
+"""Add users lower login indexes
+
+Revision ID: d41b8e7f2c95
+Revises: 7c2e5a9f1d36
+Create Date: 2026-10-18 15:58:43.620177
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41b8e7f2c95'
+down_revision: Union[str, None] = '7c2e5a9f1d36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Fails if two users only differ by the casing of their username or email,
+    # those have to be merged or renamed first.
+    op.create_index('ix_users_username_lower', 'users', [sa.text('lower(username)')], unique=True)
+    op.create_index('ix_users_email_lower', 'users', [sa.text('lower(email)')], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_email_lower', table_name='users')
+    op.drop_index('ix_users_username_lower', table_name='users')
@@ -0,0 +1,41 @@
+"""Add blogposts search vector
+
+Revision ID: e2a7c4b19f06
+Revises: 9d3f61c2e8a4
+Create Date: 2026-10-18 11:03:52.907113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a7c4b19f06'
+down_revision: Union[str, None] = '9d3f61c2e8a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('blogposts', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(preview, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(content, '')), 'C')",
+            persisted=True,
+        ),
+        nullable=True,
+    ))
+    op.create_index('ix_blogposts_search_vector', 'blogposts', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_blogposts_search_vector', table_name='blogposts', postgresql_using='gin')
+    op.drop_column('blogposts', 'search_vector')
@@ -1,5 +1,7 @@
+from .admin import router_admin
 from .auth import router_auth
 from .blogpost import router_blog
+from .metrics import router_metrics
 from .project import router_project
 from .tag import router_tag
 from .user import router_user
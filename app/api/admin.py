@@ -0,0 +1,76 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from app.core.auth import get_current_user
+from app.core.cache import caches
+from app.core.jobs import job_queue
+from app.core.password import password_hasher
+from app.db import session
+from app.db.pool import get_pool_stats
+from app.schemas import (
+    CacheStatsShow,
+    JobQueueStatsShow,
+    PasswordHasherStatsShow,
+    PoolStatsShow,
+    ResponseBase,
+    UserShow,
+)
+
+router_admin = APIRouter(tags=["admin"])
+
+
+def ensure_admin(current_user: UserShow, detail: str) -> None:
+    if not current_user.role.is_admin():
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=detail)
+
+
+@router_admin.get("/admin/db/pool", response_model=ResponseBase[PoolStatsShow])
+async def get_db_pool_stats(
+    current_user: UserShow = Depends(get_current_user),
+) -> dict:
+    """Get connection pool occupancy and checkout wait statistics"""
+
+    ensure_admin(current_user, "You do not have permission to view pool statistics")
+
+    return {"success": True, "data": get_pool_stats(session.async_engine.pool)}
+
+
+@router_admin.get(
+    "/admin/caches", response_model=ResponseBase[dict[str, CacheStatsShow]]
+)
+async def get_cache_stats(
+    current_user: UserShow = Depends(get_current_user),
+) -> dict:
+    """Get hit, miss and eviction counters of the in-process caches"""
+
+    ensure_admin(current_user, "You do not have permission to view cache statistics")
+
+    return {
+        "success": True,
+        "data": {name: cache.stats() for name, cache in caches.items()},
+    }
+
+
+@router_admin.get(
+    "/admin/password-hasher", response_model=ResponseBase[PasswordHasherStatsShow]
+)
+async def get_password_hasher_stats(
+    current_user: UserShow = Depends(get_current_user),
+) -> dict:
+    """Get queue depth and timings of the password hashing pool"""
+
+    ensure_admin(
+        current_user, "You do not have permission to view password hasher statistics"
+    )
+
+    return {"success": True, "data": password_hasher.stats()}
+
+
+@router_admin.get("/admin/jobs", response_model=ResponseBase[JobQueueStatsShow])
+async def get_job_queue_stats(
+    current_user: UserShow = Depends(get_current_user),
+) -> dict:
+    """Get depth and outcome counters of the background job queue"""
+
+    ensure_admin(current_user, "You do not have permission to view job statistics")
+
+    return {"success": True, "data": job_queue.stats()}
@@ -1,16 +1,25 @@
+from typing import cast
+
 from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
 from fastapi.responses import JSONResponse
 from fastapi.security import OAuth2PasswordRequestForm
-from jose import JWTError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.auth import set_secure_cookie, validate_refresh_token
+from app.core.exceptions import PasswordHasherBusyError
 from app.core.jwt import (
     create_access_token,
     create_refresh_token,
     decode_expired_token,
     verify_access_token,
 )
+from app.core.password import verify_and_update_password
+from app.core.ratelimit import (
+    login_rate_limit,
+    login_username_rate_limit,
+    refresh_rate_limit,
+)
+from app.core.revocation import token_revocations
 from app.crud import crud_get_user
 from app.db.session import get_db
 from app.schemas import ResponseBase, Token
@@ -22,26 +31,49 @@ router_auth = APIRouter(tags=["auth"])
     "/login",
     status_code=status.HTTP_200_OK,
     response_model=ResponseBase[Token],
+    dependencies=[Depends(login_rate_limit), Depends(login_username_rate_limit)],
 )
-def login_user(
+async def login_user(
     form_data: OAuth2PasswordRequestForm = Depends(),
     fingerprint: str = Header(None, alias="x-Device-Fingerprint"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> dict:
     """Login a user and return an access token and a refresh token as a secure cookie"""
 
-    user = crud_get_user(
+    user = await crud_get_user(
         db=db,
         username=form_data.username,
         only_active=True,
     )
 
-    if not user or not user.verify_password(form_data.password):
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid username or password",
+        )
+
+    try:
+        valid, new_hash = await verify_and_update_password(
+            form_data.password, cast(str, user.password)
+        )
+    except PasswordHasherBusyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
+
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid username or password",
         )
 
+    if new_hash:
+        # Stored with outdated hashing parameters, upgrade it transparently.
+        user.password = new_hash  # type: ignore[assignment]
+        await db.commit()
+
     refresh_token = create_refresh_token(sub=str(user.id), fingerprint=fingerprint)
     access_token = create_access_token(sub=str(user.id))
 
@@ -58,12 +90,16 @@ def login_user(
 
 
 @router_auth.post(
-    "/refresh", status_code=status.HTTP_200_OK, response_model=ResponseBase[Token]
+    "/refresh",
+    status_code=status.HTTP_200_OK,
+    response_model=ResponseBase[Token],
+    dependencies=[Depends(refresh_rate_limit)],
 )
-def refresh_token(
+async def refresh_token(
     request: Request,
     access_token: str | None = Header(None, alias="Authorization"),
     fingerprint: str = Header(None, alias="x-Device-Fingerprint"),
+    db: AsyncSession = Depends(get_db),
 ) -> dict:
     """Refresh user token"""
 
@@ -79,7 +115,7 @@ def refresh_token(
     try:
         refresh_token_payload = verify_access_token(refresh_token)
         access_token_payload = decode_expired_token(access_token)
-    except JWTError:
+    except ValueError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token",
@@ -87,6 +123,13 @@ def refresh_token(
 
     validate_refresh_token(refresh_token_payload, access_token_payload, fingerprint)
 
+    jti = refresh_token_payload.get("jti")
+    if jti and await token_revocations.is_revoked(db, jti):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Refresh token has been revoked. Please login again.",
+        )
+
     new_access_token = create_access_token(sub=str(access_token_payload.get("sub")))
 
     return JSONResponse(
@@ -103,8 +146,23 @@ def refresh_token(
     status_code=status.HTTP_200_OK,
     response_model=ResponseBase[None],
 )
-def logout_user() -> dict:
-    """Logout a user by clearing cookies"""
+async def logout_user(
+    request: Request,
+    access_token: str | None = Header(None, alias="Authorization"),
+    db: AsyncSession = Depends(get_db),
+) -> dict:
+    """Logout a user by revoking its tokens and clearing cookies"""
+
+    tokens = [request.cookies.get("refresh_token")]
+    if access_token and " " in access_token:
+        tokens.append(access_token.split(" ")[1])
+
+    for token in filter(None, tokens):
+        try:
+            payload = verify_access_token(token)
+        except ValueError:
+            continue
+        await token_revocations.revoke_claims(db, payload)
 
     response = JSONResponse(
         content={"success": True, "data": None, "message": "Logout successful"}
@@ -1,51 +1,98 @@
-from fastapi import APIRouter, Depends, HTTPException, Path, status
-from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import cast
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Path,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.auth import get_current_user
-from app.core.exceptions import ConflictError, NotFoundError
+from app.core.conditional import (
+    has_conditional_headers,
+    is_not_modified,
+    make_etag,
+    not_modified,
+    representation_etag,
+)
+from app.core.config import settings
+from app.core.exceptions import ConflictError, InvalidCursorError, NotFoundError
+from app.core.ndjson import iter_ndjson
+from app.core.pagination import (
+    DEFAULT_PAGE_SIZE,
+    decode_cursor,
+    decode_offset_cursor,
+    encode_offset_cursor,
+    paginate,
+)
+from app.core.ratelimit import write_rate_limit
+from app.core.responses import cached_envelope, envelope
 from app.crud import (
     crud_create_blogpost,
     crud_delete_blogpost,
-    crud_get_blogpost,
-    crud_get_blogposts,
+    crud_get_blogpost_cached,
+    crud_get_blogpost_validators,
+    crud_get_blogposts_cached,
+    crud_import_blogposts,
+    crud_search_blogposts,
     crud_update_blogpost,
     is_author_of_blogpost,
 )
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.schemas import (
     BlogpostCreate,
+    BlogpostImportResult,
+    BlogpostListItem,
+    BlogpostSearchResult,
     BlogpostShow,
     BlogpostUpdate,
+    PageBase,
     ResponseBase,
     UserShow,
 )
 
 router_blog = APIRouter(tags=["blogpost"])
 
+LIST_ITEM_FIELDS = tuple(BlogpostListItem.model_fields)
 
-@router_blog.get("/get/blogposts", response_model=ResponseBase[list[BlogpostShow]])
-async def get_blogposts(db: Session = Depends(get_db)) -> dict:
-    """Get all blogposts"""
 
-    data = crud_get_blogposts(db=db, tag="all", only_active=True)
-    return {"success": True, "data": data}
+def blogpost_etag(id: int, updated_at: datetime) -> str:
+    return make_etag("blogpost", id, updated_at.isoformat())
 
 
-@router_blog.get(
-    "/get/blogposts/{tag}", response_model=ResponseBase[list[BlogpostShow]]
-)
-async def get_blogposts_by_tag(tag: str = "all", db: Session = Depends(get_db)) -> dict:
-    """Get all blogposts by tag"""
+def blogposts_page_etag(tag: str, limit: int, cursor: str | None, page: dict) -> str:
+    items = (f"{item.id}:{item.updated_at.isoformat()}" for item in page["items"])
+    return make_etag("blogposts", tag, limit, cursor, page["next_cursor"], *items)
 
-    data = crud_get_blogposts(db=db, tag=tag, only_active=True)
-    return {"success": True, "data": data}
 
+async def conditional_blogpost(
+    request: Request,
+    db: AsyncSession,
+    id: int | None = None,
+    slug: str | None = None,
+) -> Response:
+    """
+    Fetch one blogpost, honoring If-None-Match and If-Modified-Since.
 
-@router_blog.get("/get/blogpost/{id}", response_model=ResponseBase[BlogpostShow])
-async def get_blogpost_by_id(id: int, db: Session = Depends(get_db)) -> dict:
-    """Get one blogpost by id"""
+    Conditional requests are validated against (id, updated_at) first, so a
+    304 neither loads the post content nor serializes the body.
+    """
+
+    if has_conditional_headers(request):
+        validators = await crud_get_blogpost_validators(db=db, id=id, slug=slug)
+
+        if validators is not None:
+            etag = representation_etag(request, blogpost_etag(*validators))
+            if is_not_modified(request, etag, validators[1]):
+                return not_modified(etag, validators[1])
 
-    data = crud_get_blogpost(db=db, id=id)
+    data = await crud_get_blogpost_cached(db=db, id=id, slug=slug)
 
     if not data:
         raise HTTPException(
@@ -53,41 +100,163 @@ async def get_blogpost_by_id(id: int, db: Session = Depends(get_db)) -> dict:
             detail="Blogpost not found",
         )
 
-    return {"success": True, "data": data}
+    # The schema allows a null id, a stored post always has one.
+    etag = blogpost_etag(cast(int, data.id), data.updated_at)
+    return cached_envelope(request, data, etag, data.updated_at)
 
 
-@router_blog.get("/get/blogpost/{id_slug}", response_model=ResponseBase[BlogpostShow])
-async def get_blogpost_by_slug(
-    id_slug: str = Path(..., pattern=r"^[a-zA-Z0-9_]+$"), db: Session = Depends(get_db)
+async def list_blogposts_page(
+    db: AsyncSession, tag: str, limit: int, cursor: str | None
 ) -> dict:
-    """Get one blogpost by slug"""
+    """Fetch one keyset page of active blogposts"""
 
-    if id_slug.isdigit():
-        data = crud_get_blogpost(db=db, id=int(id_slug))
-    else:
-        data = crud_get_blogpost(db=db, slug=id_slug)
+    try:
+        position = decode_cursor(cursor) if cursor else None
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
 
-    if not data:
+    rows = await crud_get_blogposts_cached(
+        db=db, tag=tag, only_active=True, limit=limit + 1, cursor=position
+    )
+    return paginate(rows, limit)
+
+
+async def conditional_blogposts_page(
+    request: Request,
+    db: AsyncSession,
+    tag: str,
+    limit: int,
+    cursor: str | None,
+) -> Response:
+    """
+    Fetch one listing page, answering If-None-Match with 304.
+
+    Listings only carry an ETag: a deletion does not move the newest
+    updated_at of a page, so Last-Modified could hide it.
+    """
+
+    data = await list_blogposts_page(db=db, tag=tag, limit=limit, cursor=cursor)
+    etag = blogposts_page_etag(tag, limit, cursor, data)
+
+    sent_etag = representation_etag(request, etag)
+    if is_not_modified(request, sent_etag):
+        return not_modified(sent_etag)
+
+    return cached_envelope(request, data, etag)
+
+
+@router_blog.get(
+    "/get/blogposts", response_model=ResponseBase[PageBase[BlogpostListItem]]
+)
+async def get_blogposts(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=100),
+    cursor: str | None = Query(None),
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
+    """Get all blogposts"""
+
+    return await conditional_blogposts_page(
+        request, db=db, tag="all", limit=limit, cursor=cursor
+    )
+
+
+@router_blog.get(
+    "/get/blogposts/{tag}", response_model=ResponseBase[PageBase[BlogpostListItem]]
+)
+async def get_blogposts_by_tag(
+    request: Request,
+    tag: str = "all",
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=100),
+    cursor: str | None = Query(None),
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
+    """Get all blogposts by tag"""
+
+    return await conditional_blogposts_page(
+        request, db=db, tag=tag, limit=limit, cursor=cursor
+    )
+
+
+@router_blog.get(
+    "/search/blogposts", response_model=ResponseBase[PageBase[BlogpostSearchResult]]
+)
+async def search_blogposts(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=100),
+    cursor: str | None = Query(None),
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
+    """Full-text search over active blogposts, best matches first"""
+
+    try:
+        offset = decode_offset_cursor(cursor) if cursor else 0
+    except InvalidCursorError as e:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Blogpost not found",
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+    rows = await crud_search_blogposts(db=db, q=q, limit=limit + 1, offset=offset)
+
+    items = [
+        BlogpostSearchResult.model_validate(
+            {
+                **{name: getattr(blogpost, name) for name in LIST_ITEM_FIELDS},
+                "rank": rank,
+                "snippet": snippet,
+            },
+            from_attributes=True,
         )
+        for blogpost, rank, snippet in rows[:limit]
+    ]
+    next_cursor = encode_offset_cursor(offset + limit) if len(rows) > limit else None
 
-    return {"success": True, "data": data}
+    return envelope({"items": items, "next_cursor": next_cursor})
+
+
+@router_blog.get("/get/blogpost/{id:int}", response_model=ResponseBase[BlogpostShow])
+async def get_blogpost_by_id(
+    request: Request,
+    id: int,
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
+    """Get one blogpost by id"""
+
+    return await conditional_blogpost(request, db=db, id=id)
+
+
+@router_blog.get("/get/blogpost/{id_slug}", response_model=ResponseBase[BlogpostShow])
+async def get_blogpost_by_slug(
+    request: Request,
+    id_slug: str = Path(..., pattern=r"^[a-zA-Z0-9_]+$"),
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
+    """Get one blogpost by slug"""
+
+    if id_slug.isdigit():
+        return await conditional_blogpost(request, db=db, id=int(id_slug))
+    return await conditional_blogpost(request, db=db, slug=id_slug)
 
 
 @router_blog.post(
     "/create/blogpost",
     status_code=status.HTTP_201_CREATED,
     response_model=ResponseBase[BlogpostShow],
+    dependencies=[Depends(write_rate_limit)],
 )
 async def create_blogpost(
-    blogpost: BlogpostCreate, db: Session = Depends(get_db)
+    blogpost: BlogpostCreate, db: AsyncSession = Depends(get_db)
 ) -> dict:
     """Create a new blogpost"""
 
     try:
-        new_blogpost = crud_create_blogpost(blogpost_data=blogpost, db=db)
+        new_blogpost = await crud_create_blogpost(
+            blogpost_data=blogpost.model_dump(), db=db
+        )
     except ConflictError as e:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -102,17 +271,53 @@ async def create_blogpost(
     return {"success": True, "data": new_blogpost}
 
 
-@router_blog.put("/update/blogpost/{id}", response_model=ResponseBase[BlogpostShow])
+@router_blog.post(
+    "/import/blogposts",
+    response_model=ResponseBase[BlogpostImportResult],
+    dependencies=[Depends(write_rate_limit)],
+)
+async def import_blogposts(
+    request: Request,
+    batch_size: int = Query(settings.IMPORT_BATCH_SIZE, ge=1, le=5000),
+    db: AsyncSession = Depends(get_db),
+    current_user: UserShow = Depends(get_current_user),
+) -> dict:
+    """
+    Bulk import blogposts from an NDJSON body, one blogpost per line.
+
+    The body is streamed and inserted in batches, rows that fail are reported
+    with their line number and do not stop the import.
+    """
+
+    if not current_user.role.is_admin():
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have permission to import blogposts",
+        )
+
+    rows = iter_ndjson(request.stream(), settings.IMPORT_MAX_LINE_BYTES)
+    result = await crud_import_blogposts(
+        db=db, rows=rows, author_id=current_user.id, batch_size=batch_size
+    )
+
+    return {"success": True, "data": result}
+
+
+@router_blog.put(
+    "/update/blogpost/{id}",
+    response_model=ResponseBase[BlogpostShow],
+    dependencies=[Depends(write_rate_limit)],
+)
 async def update_blogpost(
     id: int,
     new_data: BlogpostUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserShow = Depends(get_current_user),
 ) -> dict:
     """Update an existing blogpost"""
 
     if (
-        is_author_of_blogpost(db=db, blogpost_id=id, user_id=current_user.id)
+        await is_author_of_blogpost(db=db, blogpost_id=id, user_id=current_user.id)
         and not current_user.role.is_admin()
     ):
         raise HTTPException(
@@ -123,7 +328,7 @@ async def update_blogpost(
     blogpost_data = new_data.model_dump(exclude_unset=True)
 
     try:
-        updated_blogpost = crud_update_blogpost(
+        updated_blogpost = await crud_update_blogpost(
             id=id, blogpost_data=blogpost_data, db=db
         )
     except NotFoundError as e:
@@ -140,16 +345,20 @@ async def update_blogpost(
     return {"success": True, "data": updated_blogpost}
 
 
-@router_blog.delete("/delete/blogpost/{id}", response_model=ResponseBase[None])
+@router_blog.delete(
+    "/delete/blogpost/{id}",
+    response_model=ResponseBase[None],
+    dependencies=[Depends(write_rate_limit)],
+)
 async def delete_blogpost(
     id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserShow = Depends(get_current_user),
 ) -> dict:
     """Delete a blogpost"""
 
     if (
-        is_author_of_blogpost(db=db, blogpost_id=id, user_id=current_user.id)
+        await is_author_of_blogpost(db=db, blogpost_id=id, user_id=current_user.id)
         and not current_user.role.is_admin()
     ):
         raise HTTPException(
@@ -158,7 +367,7 @@ async def delete_blogpost(
         )
 
     try:
-        crud_delete_blogpost(id=id, db=db)
+        await crud_delete_blogpost(id=id, db=db)
     except NotFoundError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
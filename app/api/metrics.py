@@ -0,0 +1,17 @@
+from fastapi import APIRouter, HTTPException, Response, status
+
+from app.core.config import settings
+from app.core.metrics import CONTENT_TYPE, render_metrics
+from app.db import session
+
+router_metrics = APIRouter(tags=["metrics"])
+
+
+@router_metrics.get("/metrics", include_in_schema=False)
+async def get_metrics() -> Response:
+    """Request latency, in-flight requests and pool metrics for Prometheus"""
+
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+    return Response(render_metrics(session.async_engine.pool), media_type=CONTENT_TYPE)
@@ -1,6 +1,9 @@
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.schemas import ResponseBase, TagCreate, TagShow, TagUpdate
+from app.crud import crud_get_tag_stats
+from app.db.session import get_db
+from app.schemas import ResponseBase, TagCreate, TagShow, TagStatsShow, TagUpdate
 
 router_tag = APIRouter(tags=["tag"])
 
@@ -12,6 +15,13 @@ async def get_tags() -> dict:
     return {"success": True, "data": []}
 
 
+@router_tag.get("/get/tags/stats", response_model=ResponseBase[TagStatsShow])
+async def get_tag_stats(db: AsyncSession = Depends(get_db)) -> dict:
+    """Get the number of active blogposts per tag and projects per tech"""
+
+    return {"success": True, "data": await crud_get_tag_stats(db=db)}
+
+
 @router_tag.post(
     "/create/tag",
     response_model=ResponseBase[TagShow],
@@ -1,8 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, Path, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.auth import get_current_user
-from app.core.exceptions import ConflictError, NotFoundError
+from app.core.exceptions import (
+    ConflictError,
+    NotFoundError,
+    PasswordHasherBusyError,
+)
+from app.core.password import hash_password_async
+from app.core.ratelimit import write_rate_limit
 from app.crud import (
     crud_create_user,
     crud_delete_user,
@@ -10,7 +16,7 @@ from app.crud import (
     crud_update_user,
     crud_update_user_password,
 )
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.schemas import (
     ResponseBase,
     UserCreate,
@@ -24,14 +30,15 @@ router_user = APIRouter(tags=["user"])
 
 @router_user.get("/get/user/{user_id}", response_model=ResponseBase[UserShow])
 async def get_user(
-    user_id: str = Path(..., pattern=r"^[a-zA-Z0-9_]+$"), db: Session = Depends(get_db)
+    user_id: str = Path(..., pattern=r"^[a-zA-Z0-9_]+$"),
+    db: AsyncSession = Depends(get_read_db),
 ) -> dict:
     """Get an user by id or username"""
 
     if user_id.isdigit():
-        user = crud_get_user(id=int(user_id), db=db)
+        user = await crud_get_user(id=int(user_id), db=db)
     else:
-        user = crud_get_user(username=user_id, db=db)
+        user = await crud_get_user(username=user_id, db=db)
 
     if not user:
         raise HTTPException(
@@ -46,14 +53,24 @@ async def get_user(
     "/create/user",
     status_code=status.HTTP_201_CREATED,
     response_model=ResponseBase[UserShow],
+    dependencies=[Depends(write_rate_limit)],
 )
-async def create_user(user: UserCreate, db: Session = Depends(get_db)) -> dict:
+async def create_user(user: UserCreate, db: AsyncSession = Depends(get_db)) -> dict:
     """Create a new user"""
 
     user_data = user.model_dump(exclude={"password2"})
 
     try:
-        new_user = crud_create_user(user_data=user_data, db=db)
+        user_data["password"] = await hash_password_async(user.password)
+    except PasswordHasherBusyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
+
+    try:
+        new_user = await crud_create_user(user_data=user_data, db=db)
     except ConflictError as e:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -68,11 +85,15 @@ async def create_user(user: UserCreate, db: Session = Depends(get_db)) -> dict:
     return {"success": True, "message": "User created", "data": new_user}
 
 
-@router_user.put("/update/user/{id}", response_model=ResponseBase[UserShow])
+@router_user.put(
+    "/update/user/{id}",
+    response_model=ResponseBase[UserShow],
+    dependencies=[Depends(write_rate_limit)],
+)
 async def update_user(
     id: int,
     new_data: UserUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserShow = Depends(get_current_user),
 ) -> dict:
     """Update an existing user"""
@@ -86,7 +107,7 @@ async def update_user(
     user_data = new_data.model_dump(exclude_unset=True)
 
     try:
-        updated_user = crud_update_user(id=id, user_data=user_data, db=db)
+        updated_user = await crud_update_user(id=id, user_data=user_data, db=db)
     except NotFoundError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -105,14 +126,15 @@ async def update_user(
     "/update/password/{id}",
     status_code=status.HTTP_200_OK,
     response_model=ResponseBase[None],
+    dependencies=[Depends(write_rate_limit)],
 )
 async def update_password(
-    id: int, user_password: UserPasswordUpdate, db: Session = Depends(get_db)
+    id: int, user_password: UserPasswordUpdate, db: AsyncSession = Depends(get_db)
 ) -> dict:
     """Update an existing user's password"""
 
     try:
-        response = crud_update_user_password(
+        response = await crud_update_user_password(
             id=id,
             password_data=user_password.model_dump(exclude={"new_password2"}),
             db=db,
@@ -122,6 +144,17 @@ async def update_password(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e),
         )
+    except PermissionError as e:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=str(e),
+        )
+    except PasswordHasherBusyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -134,10 +167,11 @@ async def update_password(
 @router_user.delete(
     "/delete/user/{id}",
     status_code=status.HTTP_200_OK,
+    dependencies=[Depends(write_rate_limit)],
 )
 async def delete_user(
     id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserShow = Depends(get_current_user),
 ) -> dict:
     """Delete a user"""
@@ -149,7 +183,7 @@ async def delete_user(
         )
 
     try:
-        response = crud_delete_user(id=id, db=db)
+        response = await crud_delete_user(id=id, db=db)
     except NotFoundError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
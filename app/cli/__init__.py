@@ -0,0 +1,90 @@
+import argparse
+from typing import Sequence
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    backfill = commands.add_parser(
+        "backfill", help="Compute the derived content fields of existing blogposts"
+    )
+    backfill.add_argument("--batch-size", type=int, default=500)
+    backfill.add_argument(
+        "--workers", type=int, default=None, help="Defaults to the CPU count"
+    )
+    backfill.add_argument(
+        "--all",
+        action="store_true",
+        help="Recompute every blogpost, not only those missing the fields",
+    )
+
+    importer = commands.add_parser(
+        "import", help="Bulk import blogposts from an NDJSON file ('-' for stdin)"
+    )
+    importer.add_argument("file", type=argparse.FileType("rb"))
+    importer.add_argument("--author", required=True, help="Username of the author")
+    importer.add_argument("--batch-size", type=int, default=None)
+
+    commands.add_parser(
+        "refresh-stats", help="Recount the tag and tech facet summary tables"
+    )
+
+    serve = commands.add_parser("serve", help="Run the API with uvicorn workers")
+    serve.add_argument("--host", default=None)
+    serve.add_argument("--port", type=int, default=None)
+    serve.add_argument(
+        "--workers", type=int, default=None, help="Defaults to the CPU count"
+    )
+    serve.add_argument("--log-level", default="info")
+
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    args = build_parser().parse_args(argv)
+
+    if args.command == "backfill":
+        from app.cli.backfill import run_backfill
+        from app.db.session import engine
+
+        updated = run_backfill(
+            engine,
+            batch_size=args.batch_size,
+            workers=args.workers,
+            only_missing=not args.all,
+        )
+        print(f"Updated {updated} blogposts")
+
+    elif args.command == "refresh-stats":
+        from app.cli.stats import rebuild_facet_stats
+        from app.db.session import engine
+
+        rebuild_facet_stats(engine)
+
+    elif args.command == "import":
+        import asyncio
+
+        from app.cli.importer import print_summary, run_import
+        from app.core.config import settings
+        from app.db.session import AsyncSessionLocal
+
+        summary = asyncio.run(
+            run_import(
+                AsyncSessionLocal,
+                args.file,
+                author=args.author,
+                batch_size=args.batch_size or settings.IMPORT_BATCH_SIZE,
+            )
+        )
+        print_summary(summary)
+
+    elif args.command == "serve":
+        from app.cli.serve import serve
+
+        serve(
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+            log_level=args.log_level,
+        )
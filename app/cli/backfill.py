@@ -0,0 +1,93 @@
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Iterator
+
+from sqlalchemy import Engine, bindparam, select, update
+
+from app.core.content import analyze_content
+from app.models import Blogpost
+
+
+def analyze_row(row: tuple[int, str]) -> dict:
+    id, content = row
+    return {"row_id": id, **analyze_content(content)}
+
+
+def iter_batches(
+    engine: Engine, batch_size: int, only_missing: bool
+) -> Iterator[list[tuple[int, str]]]:
+    """Yield (id, content) batches, paging on the primary key."""
+
+    last_id = 0
+    while True:
+        query = (
+            select(Blogpost.id, Blogpost.content)
+            .where(Blogpost.id > last_id)
+            .order_by(Blogpost.id)
+            .limit(batch_size)
+        )
+        if only_missing:
+            query = query.where(Blogpost.content_hash.is_(None))
+
+        with engine.connect() as conn:
+            rows = [(id, content) for id, content in conn.execute(query)]
+
+        if not rows:
+            return
+
+        yield rows
+        last_id = rows[-1][0]
+
+
+def run_backfill(
+    engine: Engine,
+    batch_size: int = 500,
+    workers: int | None = None,
+    only_missing: bool = True,
+    executor: Executor | None = None,
+) -> int:
+    """
+    Compute the derived content fields of existing blogposts.
+
+    Content analysis is CPU bound, so it is spread over a process pool. While
+    the pool analyzes a batch, this process writes the previous one back with
+    one executemany and reads the next one. Returns the number of updated
+    blogposts.
+    """
+
+    statement = (
+        update(Blogpost)
+        .where(Blogpost.id == bindparam("row_id"))
+        .values(
+            word_count=bindparam("word_count"),
+            reading_time=bindparam("reading_time"),
+            excerpt=bindparam("excerpt"),
+            content_hash=bindparam("content_hash"),
+        )
+    )
+    pool = executor or ProcessPoolExecutor(max_workers=workers)
+    updated = 0
+
+    def write(results: Iterator[dict]) -> int:
+        values = list(results)
+        with engine.begin() as conn:
+            conn.execute(statement, values)
+        return len(values)
+
+    try:
+        # `map` submits the whole batch at once: the previous batch is written
+        # and the next one read while the pool works on this one.
+        pending = None
+        for rows in iter_batches(engine, batch_size, only_missing):
+            chunksize = max(1, len(rows) // ((workers or 1) * 4))
+            submitted = pool.map(analyze_row, rows, chunksize=chunksize)
+            if pending is not None:
+                updated += write(pending)
+            pending = submitted
+
+        if pending is not None:
+            updated += write(pending)
+    finally:
+        if executor is None:
+            pool.shutdown()
+
+    return updated
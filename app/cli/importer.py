@@ -0,0 +1,42 @@
+import json
+from typing import BinaryIO, cast
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.config import settings
+from app.core.ndjson import iter_chunks, iter_ndjson
+from app.crud import crud_get_user, crud_import_blogposts
+
+CHUNK_SIZE = 64 * 1024
+
+
+async def run_import(
+    sessionmaker: async_sessionmaker,
+    file: BinaryIO,
+    author: str,
+    batch_size: int = settings.IMPORT_BATCH_SIZE,
+) -> dict:
+    """Stream an NDJSON file of blogposts into the database."""
+
+    async with sessionmaker() as db:
+        user = await crud_get_user(db=db, username=author)
+        if user is None:
+            raise SystemExit(f"Unknown author: {author}")
+
+        chunks = iter_chunks(iter(lambda: file.read(CHUNK_SIZE), b""))
+        return await crud_import_blogposts(
+            db=db,
+            rows=iter_ndjson(chunks, settings.IMPORT_MAX_LINE_BYTES),
+            author_id=cast(int, user.id),
+            batch_size=batch_size,
+        )
+
+
+def print_summary(summary: dict) -> None:
+    for error in summary["failed"]:
+        print(json.dumps(error))
+
+    omitted = summary["failed_count"] - len(summary["failed"])
+    if omitted:
+        print(f"... and {omitted} more failed rows")
+    print(f"Imported {summary['imported']} blogposts, {summary['failed_count']} failed")
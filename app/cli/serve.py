@@ -0,0 +1,147 @@
+import asyncio
+import logging
+import os
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+
+try:
+    import uvicorn
+except ImportError:
+    uvicorn = None
+
+logger = logging.getLogger(__name__)
+
+
+def available_cpus() -> int:
+    """CPUs this process may run on, which can be fewer than the machine has."""
+
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def worker_count(requested: int | None = None) -> int:
+    """
+    Worker processes to start: `requested`, else `SERVER_WORKERS`, else one
+    per available CPU. Each worker runs its own event loop, so one per CPU
+    keeps every core busy without the workers competing for them.
+    """
+
+    return max(1, requested or settings.SERVER_WORKERS or available_cpus())
+
+
+def size_pools(
+    max_connections: int,
+    reserved: int,
+    workers: int,
+    pool_size: int,
+    max_overflow: int,
+) -> tuple[int, int]:
+    """
+    Shrink the pool size and overflow of each worker, when needed, so that
+    `workers` full pools stay within `max_connections - reserved`.
+    """
+
+    per_worker = (max_connections - reserved) // workers
+    if per_worker < 1:
+        raise ValueError(
+            f"{workers} workers cannot each get a connection out of "
+            f"{max_connections} ({reserved} reserved)."
+        )
+
+    pool_size = min(pool_size, per_worker)
+    return pool_size, min(max_overflow, per_worker - pool_size)
+
+
+async def server_max_connections(url: str) -> int:
+    engine = create_async_engine(url, poolclass=NullPool, connect_args={"timeout": 5})
+    try:
+        async with engine.connect() as conn:
+            return int(await conn.scalar(text("SHOW max_connections")))
+    finally:
+        await engine.dispose()
+
+
+def pin_pool_sizes(workers: int) -> None:
+    """
+    Fit the pools of every worker under the database connection limit.
+
+    The sizes go in the settings of this process and in the environment the
+    workers inherit. The limit is `DB_MAX_CONNECTIONS`, or read from the
+    server; when it cannot be read the configured sizes are kept. Replicas
+    get the same sizes, they are assumed to accept as many connections.
+    """
+
+    max_connections = settings.DB_MAX_CONNECTIONS
+    if max_connections is None:
+        try:
+            max_connections = asyncio.run(server_max_connections(settings.ASYNC_DB_URL))
+        except Exception:
+            logger.warning(
+                "Could not read max_connections, keeping the configured pool sizes",
+                exc_info=True,
+            )
+            return
+
+    pool_size, max_overflow = size_pools(
+        max_connections,
+        settings.DB_RESERVED_CONNECTIONS,
+        workers,
+        settings.DB_POOL_SIZE,
+        settings.DB_MAX_OVERFLOW,
+    )
+    if (pool_size, max_overflow) != (settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW):
+        logger.warning(
+            "Pools reduced to %d + %d overflow per worker to fit %d workers "
+            "in %d connections",
+            pool_size,
+            max_overflow,
+            workers,
+            max_connections,
+        )
+
+    settings.DB_POOL_SIZE = pool_size
+    settings.DB_MAX_OVERFLOW = max_overflow
+    os.environ["DB_POOL_SIZE"] = str(pool_size)
+    os.environ["DB_MAX_OVERFLOW"] = str(max_overflow)
+
+
+def serve(
+    host: str | None = None,
+    port: int | None = None,
+    workers: int | None = None,
+    log_level: str = "info",
+) -> None:
+    """
+    Run the API with uvicorn.
+
+    With several workers this process only supervises them and never imports
+    the app, so no engine or connection exists before they start; the fork
+    hooks of the engines cover servers that preload it. On SIGTERM every worker
+    stops accepting connections and finishes the requests in flight, for at
+    most `SERVER_GRACEFUL_TIMEOUT` seconds, before its lifespan disposes of
+    the pools.
+    """
+
+    if uvicorn is None:
+        raise SystemExit("Serving requires the `uvicorn` package.")
+
+    workers = worker_count(workers)
+    try:
+        pin_pool_sizes(workers)
+    except ValueError as e:
+        raise SystemExit(str(e))
+
+    uvicorn.run(
+        "app.main:app",
+        host=host or settings.SERVER_HOST,
+        port=port or settings.SERVER_PORT,
+        workers=workers,
+        log_level=log_level,
+        timeout_keep_alive=settings.SERVER_KEEP_ALIVE,
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_TIMEOUT,
+    )
@@ -0,0 +1,18 @@
+from sqlalchemy import Engine, text
+
+from app.models.stats import FACETS, facet_rebuild_sql
+
+
+def rebuild_facet_stats(engine: Engine) -> None:
+    """
+    Recount the tag and tech summary tables in one transaction.
+
+    The triggers keep them exact, this is only needed after loading data with
+    the triggers disabled or to repair them.
+    """
+
+    with engine.begin() as conn:
+        for facet in FACETS:
+            conn.execute(text(f"LOCK TABLE {facet[0]} IN EXCLUSIVE MODE"))
+            for statement in facet_rebuild_sql(*facet):
+                conn.execute(text(statement))
@@ -1,38 +1,46 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.responses import JSONResponse
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.core.jwt import verify_access_token
+from app.core.revocation import token_revocations
+from app.crud import crud_get_principal
 from app.db.session import get_db
-from app.models import User
 from app.schemas import UserShow
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/login")
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
+async def get_current_user(
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)
 ) -> UserShow:
     try:
         payload = verify_access_token(token)
-        user_id = payload.get("sub")
-    except (JWTError, ValueError):
+        user_id = int(payload.get("sub", ""))
+    except (ValueError, TypeError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token",
         )
 
-    user = db.query(User).filter(User.id == user_id).first()
+    # Revoked in any worker: the denylist is shared through the database.
+    jti = payload.get("jti")
+    if jti and await token_revocations.is_revoked(db, jti):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked. Please login again.",
+        )
+
+    user = await crud_get_principal(db=db, id=user_id)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
 
-    return UserShow.model_validate(user)
+    return user
 
 
 def set_secure_cookie(response: JSONResponse, name: str, value: str) -> JSONResponse:
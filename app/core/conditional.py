@@ -0,0 +1,100 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response, status
+
+from app.core.compression import coded_etag, negotiate_encoding
+from app.core.config import settings
+
+
+def make_etag(*parts: object) -> str:
+    """
+    Strong ETag over the given validator parts.
+
+    The API version is mixed in so a release that changes the serialized shape
+    also changes every ETag.
+    """
+
+    raw = "|".join(str(part) for part in (settings.APP_VERSION, *parts))
+    return '"' + hashlib.sha1(raw.encode()).hexdigest()[:20] + '"'
+
+
+def representation_etag(request: Request, etag: str) -> str:
+    """
+    `etag` for the coding negotiated with the client.
+
+    Bodies too small to be compressed are sent as is under the coded ETag
+    too: one body may have several ETags, one ETag may not cover several
+    bodies.
+    """
+
+    if not settings.COMPRESSION_ENABLED:
+        return etag
+    return coded_etag(etag, negotiate_encoding(request.headers.get("accept-encoding")))
+
+
+def http_date(value: datetime) -> str:
+    """Format a naive UTC datetime as an HTTP date."""
+
+    return format_datetime(value.replace(tzinfo=timezone.utc), usegmt=True)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+
+    # If-None-Match uses the weak comparison function.
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in candidates
+
+
+def is_not_modified(
+    request: Request, etag: str, last_modified: datetime | None = None
+) -> bool:
+    """
+    Evaluate the request's conditional headers against the current validators.
+
+    If-None-Match takes precedence, If-Modified-Since is only considered when
+    it is absent.
+    """
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+
+    modified = last_modified.replace(tzinfo=timezone.utc, microsecond=0)
+    return modified <= since
+
+
+def has_conditional_headers(request: Request) -> bool:
+    headers = request.headers
+    return "if-none-match" in headers or "if-modified-since" in headers
+
+
+def set_validators(
+    response: Response, etag: str, last_modified: datetime | None = None
+) -> None:
+    response.headers["ETag"] = etag
+    if last_modified is not None:
+        response.headers["Last-Modified"] = http_date(last_modified)
+
+
+def not_modified(etag: str, last_modified: datetime | None = None) -> Response:
+    """Empty 304 response carrying the validators."""
+
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_validators(response, etag, last_modified)
+    return response
@@ -1,5 +1,7 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from app.core.enums import LoadStrategy, RateLimitAlgorithm, RateLimitBackend
+
 
 class Settings(BaseSettings):
     SECRET_KEY: str
@@ -15,10 +17,92 @@ class Settings(BaseSettings):
     DB_PORT: int
     IS_DEV: bool
 
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_WARM: int | None = None
+    # Connections the server accepts, read from it when unset, minus those
+    # kept free for migrations, admin sessions and scripts.
+    DB_MAX_CONNECTIONS: int | None = None
+    DB_RESERVED_CONNECTIONS: int = 10
+    STARTUP_PRELOAD: bool = True
+
+    SERVER_HOST: str = "127.0.0.1"
+    SERVER_PORT: int = 8000
+    # Defaults to the number of CPUs this process may run on.
+    SERVER_WORKERS: int | None = None
+    SERVER_GRACEFUL_TIMEOUT: int = 30
+    SERVER_KEEP_ALIVE: int = 5
+
+    # Comma separated postgresql:// URLs of read replicas, empty for none.
+    DB_REPLICA_URLS: str = ""
+    DB_REPLICA_CONNECT_TIMEOUT: float = 2
+    DB_REPLICA_RETRY_INTERVAL: float = 30
+    READ_YOUR_WRITES_WINDOW: float = 5
+
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
 
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 64
+
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_ALGORITHM: RateLimitAlgorithm = RateLimitAlgorithm.TOKEN_BUCKET
+    RATE_LIMIT_BACKEND: RateLimitBackend = RateLimitBackend.MEMORY
+    RATE_LIMIT_REDIS_URL: str | None = None
+    RATE_LIMIT_TRUST_FORWARDED_FOR: bool = False
+    RATE_LIMIT_LOGIN: str = "10/minute"
+    RATE_LIMIT_LOGIN_USERNAME: str = "5/minute"
+    RATE_LIMIT_REFRESH: str = "30/minute"
+    RATE_LIMIT_WRITE: str = "60/minute"
+
+    TOKEN_CACHE_SIZE: int = 4096
+    TOKEN_CACHE_TTL: float = 900
+
+    REVOCATION_FILTER_CAPACITY: int = 100_000
+    REVOCATION_FILTER_ERROR_RATE: float = 0.001
+    REVOCATION_SYNC_INTERVAL: float = 5
+    REVOCATION_PRUNE_INTERVAL: float = 3600
+
+    PRINCIPAL_CACHE_SIZE: int = 1024
+    PRINCIPAL_CACHE_TTL: float = 30
+    AUTH_STRICT_USER_LOOKUP: bool = False
+
+    BLOGPOST_LOAD_STRATEGY: LoadStrategy = LoadStrategy.SELECTIN
+    BLOGPOST_CACHE_SIZE: int = 1024
+    BLOGPOST_CACHE_TTL: float = 60
+    # Reload the listings a blogpost write invalidated, in a background job.
+    BLOGPOST_CACHE_WARMUP: bool = True
+
+    METRICS_ENABLED: bool = True
+    SQL_SLOW_QUERY_MS: float = 100
+    SQL_REPEAT_WARN_THRESHOLD: int = 10
+
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024
+    GZIP_LEVEL: int = 6
+    BROTLI_QUALITY: int = 5
+    RESPONSE_CACHE_SIZE: int = 512
+    RESPONSE_CACHE_TTL: float = 60
+
+    JOBS_WORKERS: int = 4
+    JOBS_QUEUE_SIZE: int = 1000
+    JOBS_ENQUEUE_TIMEOUT: float = 1
+    JOBS_MAX_RETRIES: int = 3
+    JOBS_RETRY_DELAY: float = 0.5
+    JOBS_THREAD_WORKERS: int = 4
+    # Defaults to the CPU count.
+    JOBS_PROCESS_WORKERS: int | None = None
+    JOBS_SHUTDOWN_TIMEOUT: float = 10
+
+    IMPORT_BATCH_SIZE: int = 500
+    IMPORT_MAX_LINE_BYTES: int = 1024 * 1024
+    IMPORT_MAX_ERRORS: int = 100
+
     model_config = SettingsConfigDict(env_file=".env")
 
     @property
@@ -29,5 +113,21 @@ class Settings(BaseSettings):
     def TEST_DB_URL(self) -> str:
         return f"postgresql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/test_{self.DB_NAME}"  # noqa: E501
 
+    @property
+    def ASYNC_DB_URL(self) -> str:
+        return self.DB_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+    @property
+    def ASYNC_REPLICA_URLS(self) -> list[str]:
+        return [
+            url.strip().replace("postgresql://", "postgresql+asyncpg://", 1)
+            for url in self.DB_REPLICA_URLS.split(",")
+            if url.strip()
+        ]
+
+    @property
+    def ASYNC_TEST_DB_URL(self) -> str:
+        return self.TEST_DB_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
+
 
 settings = Settings()
@@ -0,0 +1,51 @@
+import hashlib
+import html
+import math
+import re
+
+WORDS_PER_MINUTE = 200
+EXCERPT_LENGTH = 280
+
+_CODE_BLOCK = re.compile(r"```.*?```", re.DOTALL)
+_HTML_TAG = re.compile(r"<[^>]+>")
+_MD_IMAGE = re.compile(r"!\[([^\]]*)\]\([^)]*\)")
+_MD_LINK = re.compile(r"\[([^\]]*)\]\([^)]*\)")
+_MD_SYNTAX = re.compile(r"(^|\s)#{1,6}\s|[*_`~>|]")
+_WHITESPACE = re.compile(r"\s+")
+_WORD = re.compile(r"\w+(?:['’-]\w+)*")
+
+
+def to_plain_text(content: str) -> str:
+    """Strip markdown and HTML markup, keeping the readable text."""
+
+    text = _CODE_BLOCK.sub(" ", content)
+    text = _HTML_TAG.sub(" ", text)
+    text = _MD_IMAGE.sub(r"\1", text)
+    text = _MD_LINK.sub(r"\1", text)
+    text = _MD_SYNTAX.sub(" ", text)
+    return _WHITESPACE.sub(" ", html.unescape(text)).strip()
+
+
+def make_excerpt(text: str, length: int = EXCERPT_LENGTH) -> str:
+    """Cut plain text at a word boundary, adding an ellipsis when shortened."""
+
+    if len(text) <= length:
+        return text
+    return text[:length].rsplit(" ", 1)[0].rstrip(".,;:") + "…"
+
+
+def analyze_content(content: str) -> dict:
+    """
+    Fields derived from a blogpost's content, persisted at write time so
+    listings never need to load the content itself.
+    """
+
+    text = to_plain_text(content)
+    word_count = len(_WORD.findall(text))
+
+    return {
+        "word_count": word_count,
+        "reading_time": max(1, math.ceil(word_count / WORDS_PER_MINUTE)),
+        "excerpt": make_excerpt(text),
+        "content_hash": hashlib.sha256(content.encode()).hexdigest(),
+    }
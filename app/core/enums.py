@@ -27,3 +27,36 @@ class Tier(Enum):
     @classmethod
     def allowed_tiers(cls) -> set[str]:
         return {tier.value for tier in cls}
+
+
+class LoadStrategy(Enum):
+    SELECTIN = "selectin"
+    JOINED = "joined"
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class RateLimitAlgorithm(Enum):
+    TOKEN_BUCKET = "token_bucket"
+    SLIDING_WINDOW = "sliding_window"
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class RateLimitBackend(Enum):
+    MEMORY = "memory"
+    REDIS = "redis"
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class JobExecutor(Enum):
+    ASYNC = "async"
+    THREAD = "thread"
+    PROCESS = "process"
+
+    def __str__(self) -> str:
+        return self.name
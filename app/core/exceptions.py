@@ -8,3 +8,21 @@ class ConflictError(Exception):
     """Exception raised when there is a conflict, such as duplicate entries."""
 
     pass
+
+
+class InvalidCursorError(ValueError):
+    """Exception raised when a pagination cursor cannot be decoded."""
+
+    pass
+
+
+class PasswordHasherBusyError(Exception):
+    """Exception raised when the password hasher queue is full."""
+
+    pass
+
+
+class JobQueueFullError(Exception):
+    """Exception raised when the background job queue stays full."""
+
+    pass
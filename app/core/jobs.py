@@ -0,0 +1,299 @@
+import asyncio
+import logging
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable
+
+from app.core.config import settings
+from app.core.enums import JobExecutor
+from app.core.exceptions import JobQueueFullError
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Job:
+    fn: Callable[..., Any]
+    args: tuple
+    key: Hashable
+    executor: JobExecutor
+    retries: int
+    attempts: int = 0
+
+    @property
+    def name(self) -> str:
+        return getattr(self.fn, "__qualname__", repr(self.fn))
+
+
+class JobQueue:
+    """
+    Bounded in-process queue of side effects, run after the request that
+    enqueued them has been answered.
+
+    Coroutine functions run on the event loop, other functions on a thread
+    pool, or on a process pool for CPU bound work. A failing job is retried
+    `retries` times with exponential backoff, then logged and dropped.
+
+    A job is not enqueued again while an identical one, by `key`, is still
+    waiting. With `maxsize` jobs waiting, `enqueue` waits `put_timeout`
+    seconds for room and then raises `JobQueueFullError`, `enqueue_nowait`
+    raises it at once.
+
+    Jobs live in the memory of one process and are lost when it stops: the
+    queue is for work that may be skipped or redone, not for what must happen.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        workers: int,
+        thread_workers: int,
+        process_workers: int | None,
+        retries: int,
+        retry_delay: float,
+        put_timeout: float,
+    ) -> None:
+        self.maxsize = maxsize
+        self.workers = workers
+        self.thread_workers = thread_workers
+        self.process_workers = process_workers
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.put_timeout = put_timeout
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._queue: asyncio.Queue[Job] | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._waiting: set[Hashable] = set()
+        self._thread_pool: ThreadPoolExecutor | None = None
+        self._process_pool: ProcessPoolExecutor | None = None
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        self.enqueued = 0
+        self.deduplicated = 0
+        self.rejected = 0
+        self.completed = 0
+        self.retried = 0
+        self.failed = 0
+
+    def _started(self) -> asyncio.Queue[Job]:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._queue is None:
+            # The queue and its workers belong to the loop that first uses
+            # them, a new loop (a forked worker, each test) starts afresh.
+            self._loop = loop
+            self._queue = asyncio.Queue(self.maxsize)
+            self._waiting.clear()
+            self._tasks = [
+                loop.create_task(self._work(self._queue)) for _ in range(self.workers)
+            ]
+        return self._queue
+
+    def _executor(self, kind: JobExecutor) -> Executor:
+        if kind is JobExecutor.PROCESS:
+            if self._process_pool is None:
+                self._process_pool = ProcessPoolExecutor(self.process_workers)
+            return self._process_pool
+
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(
+                self.thread_workers, thread_name_prefix="jobs"
+            )
+        return self._thread_pool
+
+    def _new_job(
+        self,
+        fn: Callable[..., Any],
+        args: tuple,
+        executor: JobExecutor | None,
+        key: Hashable | None,
+        retries: int | None,
+    ) -> Job | None:
+        if executor is None:
+            is_async = asyncio.iscoroutinefunction(fn)
+            executor = JobExecutor.ASYNC if is_async else JobExecutor.THREAD
+        if key is None:
+            key = (fn, args)
+
+        if key in self._waiting:
+            self.deduplicated += 1
+            return None
+
+        self._waiting.add(key)
+        return Job(
+            fn=fn,
+            args=args,
+            key=key,
+            executor=executor,
+            retries=self.retries if retries is None else retries,
+        )
+
+    def _reject(self, job: Job) -> None:
+        self._waiting.discard(job.key)
+        self.rejected += 1
+        raise JobQueueFullError("Too many background jobs queued.")
+
+    async def enqueue(
+        self,
+        fn: Callable[..., Any],
+        *args: Hashable,
+        executor: JobExecutor | None = None,
+        key: Hashable | None = None,
+        retries: int | None = None,
+    ) -> bool:
+        """
+        Queue `fn(*args)`, returns False when an identical job is waiting.
+
+        Jobs are identical when their `key` is, by default the function and
+        its arguments. Process pool jobs need a module level `fn` and
+        picklable arguments.
+        """
+
+        queue = self._started()
+        job = self._new_job(fn, args, executor, key, retries)
+        if job is None:
+            return False
+
+        try:
+            queue.put_nowait(job)
+        except asyncio.QueueFull:
+            try:
+                await asyncio.wait_for(queue.put(job), self.put_timeout)
+            except asyncio.TimeoutError:
+                self._reject(job)
+            except BaseException:
+                # Cancelled while waiting for room, the job was never queued.
+                self._waiting.discard(job.key)
+                raise
+
+        self.enqueued += 1
+        return True
+
+    def enqueue_nowait(
+        self,
+        fn: Callable[..., Any],
+        *args: Hashable,
+        executor: JobExecutor | None = None,
+        key: Hashable | None = None,
+        retries: int | None = None,
+    ) -> bool:
+        """
+        `enqueue` without waiting for room, for callers that must not be held
+        up by a full queue. Must be called from the event loop.
+        """
+
+        queue = self._started()
+        job = self._new_job(fn, args, executor, key, retries)
+        if job is None:
+            return False
+
+        try:
+            queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self._reject(job)
+
+        self.enqueued += 1
+        return True
+
+    async def _work(self, queue: asyncio.Queue[Job]) -> None:
+        while True:
+            job = await queue.get()
+            # Running from here on, an identical job may be queued again.
+            self._waiting.discard(job.key)
+            try:
+                await self._run(job)
+            finally:
+                queue.task_done()
+
+    async def _run(self, job: Job) -> None:
+        # Backoff sleeps hold this worker, the others keep going.
+        while True:
+            job.attempts += 1
+            try:
+                if job.executor is JobExecutor.ASYNC:
+                    await job.fn(*job.args)
+                else:
+                    await asyncio.get_running_loop().run_in_executor(
+                        self._executor(job.executor), job.fn, *job.args
+                    )
+            except Exception:
+                if job.attempts > job.retries:
+                    self.failed += 1
+                    logger.exception(
+                        "Background job %s failed %d times", job.name, job.attempts
+                    )
+                    return
+
+                self.retried += 1
+                await asyncio.sleep(self.retry_delay * 2 ** (job.attempts - 1))
+            else:
+                self.completed += 1
+                return
+
+    async def drain(self) -> None:
+        """Wait until every queued job has run, retries included."""
+
+        if self._queue is not None and self._loop is asyncio.get_running_loop():
+            await self._queue.join()
+
+    async def shutdown(self, timeout: float | None = None) -> None:
+        """Run the queued jobs for at most `timeout` seconds, then stop."""
+
+        if self._loop is asyncio.get_running_loop():
+            try:
+                await asyncio.wait_for(self.drain(), timeout)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    "Dropped %d background jobs on shutdown", self.stats()["queued"]
+                )
+
+            for task in self._tasks:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+        self._loop = None
+        self._queue = None
+        self._tasks = []
+        self._waiting.clear()
+
+        for pool in (self._thread_pool, self._process_pool):
+            if pool is not None:
+                pool.shutdown(wait=True)
+        self._thread_pool = None
+        self._process_pool = None
+
+    def reset_after_fork(self) -> None:
+        # Neither the loop nor the executor threads and processes of the
+        # parent are usable in a forked child.
+        self._loop = None
+        self._queue = None
+        self._tasks = []
+        self._waiting.clear()
+        self._thread_pool = None
+        self._process_pool = None
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "maxsize": self.maxsize,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "enqueued": self.enqueued,
+            "deduplicated": self.deduplicated,
+            "rejected": self.rejected,
+            "completed": self.completed,
+            "retried": self.retried,
+            "failed": self.failed,
+        }
+
+
+job_queue = JobQueue(
+    maxsize=settings.JOBS_QUEUE_SIZE,
+    workers=settings.JOBS_WORKERS,
+    thread_workers=settings.JOBS_THREAD_WORKERS,
+    process_workers=settings.JOBS_PROCESS_WORKERS,
+    retries=settings.JOBS_MAX_RETRIES,
+    retry_delay=settings.JOBS_RETRY_DELAY,
+    put_timeout=settings.JOBS_ENQUEUE_TIMEOUT,
+)
+os.register_at_fork(after_in_child=job_queue.reset_after_fork)
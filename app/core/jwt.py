@@ -1,40 +1,92 @@
+import hashlib
+import time
+import uuid
 from datetime import datetime, timedelta, timezone
+from typing import Any
 
-from jose import jwt
-
+from app.core.cache import TTLCache
 from app.core.config import settings
 
+# Claims of verified tokens by digest, each entry expires with its token.
+verified_tokens = TTLCache(
+    maxsize=settings.TOKEN_CACHE_SIZE,
+    ttl=settings.TOKEN_CACHE_TTL,
+    name="tokens",
+)
+
+
+def jose_jwt() -> Any:
+    """
+    python-jose's jwt module, imported on first use with its crypto backends.
+
+    Cached tokens are verified without it.
+    """
+
+    from jose import jwt
+
+    return jwt
+
+
+def token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def seconds_until_expiry(payload: dict) -> float:
+    exp = payload.get("exp")
+    return float(exp) - time.time() if exp is not None else 0.0
+
 
 def create_token(data: dict, expires_delta: timedelta) -> str:
     to_encode = data.copy()
     to_encode["exp"] = datetime.now(timezone.utc) + expires_delta
-    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    return jose_jwt().encode(
+        to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
+    )
 
 
 def create_access_token(sub: str) -> str:
     return create_token(
-        {"sub": sub},
+        {"sub": sub, "jti": uuid.uuid4().hex},
         expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
     )
 
 
 def create_refresh_token(sub: str, fingerprint: str) -> str:
     return create_token(
-        {"sub": sub, "fingerprint": fingerprint},
+        {"sub": sub, "fingerprint": fingerprint, "jti": uuid.uuid4().hex},
         expires_delta=timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
     )
 
 
-def verify_access_token(token: str) -> dict:
+def decode_token(token: str) -> dict:
+    jwt = jose_jwt()
     try:
         return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
     except jwt.JWTError:
         raise ValueError("Invalid or expired token")
 
 
+def verify_access_token(token: str) -> dict:
+    """
+    Verify a token and return its claims.
+
+    Verified claims are cached by token digest until the token expires, so a
+    token is only decoded and its signature checked once. Revocation is not
+    checked here, see `app.core.revocation`.
+    """
+
+    digest = token_digest(token)
+    payload = verified_tokens.get(digest)
+    if payload is None or seconds_until_expiry(payload) <= 0:
+        payload = decode_token(token)
+        verified_tokens.set(digest, payload, ttl=seconds_until_expiry(payload))
+
+    return dict(payload)
+
+
 def decode_expired_token(token: str) -> dict:
     try:
-        return jwt.decode(
+        return jose_jwt().decode(
             token,
             settings.SECRET_KEY,
             algorithms=[settings.ALGORITHM],
@@ -0,0 +1,186 @@
+import threading
+import time
+from bisect import bisect_left
+from typing import Iterable
+
+from sqlalchemy.pool import Pool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.db.pool import get_pool_stats
+
+# Upper bounds, in seconds, of the latency histogram buckets.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Label of requests no route matched, keeping raw paths out of the labels.
+UNMATCHED_ROUTE = "<unmatched>"
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Histogram:
+    """Bucket counts of one label set, the last bucket being +Inf."""
+
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self, buckets: int) -> None:
+        self.counts = [0] * (buckets + 1)
+        self.sum = 0.0
+        self.count = 0
+
+
+class RequestMetrics:
+    """
+    Request latency histograms per (method, route template, status) and the
+    number of requests in flight.
+
+    Recording a request is a bisect and three increments under a lock, the
+    aggregation into cumulative buckets only happens when scraped.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._histograms: dict[tuple[str, str, str], Histogram] = {}
+        self.in_flight = 0
+
+    def started(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+
+    def finished(self, method: str, route: str, status: int, seconds: float) -> None:
+        index = bisect_left(self.buckets, seconds)
+        key = (method, route, str(status))
+
+        with self._lock:
+            self.in_flight -= 1
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(len(self.buckets))
+            histogram.counts[index] += 1
+            histogram.sum += seconds
+            histogram.count += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+    def render(self) -> Iterable[str]:
+        with self._lock:
+            histograms = [
+                (key, list(h.counts), h.sum, h.count)
+                for key, h in sorted(self._histograms.items())
+            ]
+            in_flight = self.in_flight
+
+        name = "http_request_duration_seconds"
+        yield f"# HELP {name} Request latency by method, route and status."
+        yield f"# TYPE {name} histogram"
+
+        bounds = [format_value(bound) for bound in self.buckets] + ["+Inf"]
+        for (method, route, status), counts, total, count in histograms:
+            labels = format_labels(method=method, route=route, status=status)
+            cumulative = 0
+            for bound, bucket_count in zip(bounds, counts):
+                cumulative += bucket_count
+                yield f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}'
+            yield f"{name}_sum{{{labels}}} {format_value(total)}"
+            yield f"{name}_count{{{labels}}} {count}"
+
+        yield "# HELP http_requests_in_flight Requests currently being served."
+        yield "# TYPE http_requests_in_flight gauge"
+        yield f"http_requests_in_flight {in_flight}"
+
+
+request_metrics = RequestMetrics()
+
+
+def escape_label(value: str) -> str:
+    return value.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+def format_labels(**labels: str) -> str:
+    return ",".join(f'{name}="{escape_label(value)}"' for name, value in labels.items())
+
+
+def format_value(value: float) -> str:
+    return repr(float(value))
+
+
+# (metric, type, pool stats key, scale, help)
+POOL_METRICS = (
+    ("db_pool_size", "gauge", "size", 1, "Connections kept open by the pool."),
+    ("db_pool_max_overflow", "gauge", "max_overflow", 1, "Overflow allowed."),
+    ("db_pool_checked_in", "gauge", "checked_in", 1, "Idle connections."),
+    ("db_pool_checked_out", "gauge", "checked_out", 1, "Connections in use."),
+    ("db_pool_overflow", "gauge", "overflow", 1, "Overflow connections open."),
+    ("db_pool_utilization", "gauge", "utilization", 1, "Share of capacity in use."),
+    ("db_pool_checkouts_total", "counter", "checkouts", 1, "Checkouts."),
+    ("db_pool_timeouts_total", "counter", "timeouts", 1, "Checkouts timed out."),
+    (
+        "db_pool_wait_p95_seconds",
+        "gauge",
+        "p95_wait_ms",
+        0.001,
+        "95th percentile of recent checkout waits.",
+    ),
+    (
+        "db_pool_wait_max_seconds",
+        "gauge",
+        "max_wait_ms",
+        0.001,
+        "Longest checkout wait.",
+    ),
+)
+
+
+def render_pool_metrics(pool: Pool) -> Iterable[str]:
+    stats = get_pool_stats(pool)
+    for name, kind, key, scale, description in POOL_METRICS:
+        yield f"# HELP {name} {description}"
+        yield f"# TYPE {name} {kind}"
+        yield f"{name} {format_value(stats[key] * scale)}"
+
+
+def render_metrics(pool: Pool, metrics: RequestMetrics = request_metrics) -> str:
+    """All metrics in the Prometheus text exposition format."""
+
+    lines = [*metrics.render(), *render_pool_metrics(pool)]
+    return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """
+    Time every HTTP request into `request_metrics`.
+
+    Requests are labelled with the template of the route that served them,
+    read from the scope once routing is done, so path parameters do not
+    multiply the series.
+    """
+
+    def __init__(self, app: ASGIApp, metrics: RequestMetrics = request_metrics) -> None:
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        self.metrics.started()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            self.metrics.finished(
+                scope["method"], route, status, time.perf_counter() - start
+            )
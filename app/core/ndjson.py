@@ -0,0 +1,82 @@
+import json
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, TypeVar
+
+T = TypeVar("T")
+
+
+class NDJSONLineError(ValueError):
+    """A line of an NDJSON stream that could not be decoded."""
+
+    def __init__(self, line: int, message: str) -> None:
+        super().__init__(message)
+        self.line = line
+
+
+async def iter_ndjson(
+    chunks: AsyncIterable[bytes], max_line_bytes: int
+) -> AsyncIterator[tuple[int, Any]]:
+    """
+    Decode an NDJSON byte stream into (line number, value) pairs.
+
+    Only the current line is buffered, so memory stays flat whatever the size
+    of the stream. Blank lines are skipped. Undecodable or oversized lines are
+    yielded as `NDJSONLineError` values instead of stopping the stream.
+    """
+
+    buffer = b""
+    line_no = 0
+    skipping = False
+
+    async for chunk in chunks:
+        buffer += chunk
+
+        while True:
+            end = buffer.find(b"\n")
+            if end == -1:
+                break
+
+            line, buffer = buffer[:end], buffer[end + 1 :]
+            line_no += 1
+
+            if skipping:
+                # Tail of an oversized line, already reported.
+                skipping = False
+                continue
+
+            if line.strip():
+                yield line_no, decode_line(line_no, line)
+
+        if len(buffer) > max_line_bytes:
+            if not skipping:
+                yield line_no + 1, NDJSONLineError(line_no + 1, "Line is too long")
+            buffer = b""
+            skipping = True
+
+    if buffer.strip() and not skipping:
+        yield line_no + 1, decode_line(line_no + 1, buffer)
+
+
+def decode_line(line_no: int, line: bytes) -> Any:
+    try:
+        return json.loads(line)
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        return NDJSONLineError(line_no, f"Invalid JSON: {e}")
+
+
+async def batched(items: AsyncIterable[T], size: int) -> AsyncIterator[list[T]]:
+    batch: list[T] = []
+    async for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
+
+
+async def iter_chunks(chunks: Iterable[bytes]) -> AsyncIterator[bytes]:
+    """Adapt a blocking iterable of chunks, like an open file, to async."""
+
+    for chunk in chunks:
+        yield chunk
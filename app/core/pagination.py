@@ -0,0 +1,63 @@
+import base64
+import binascii
+from datetime import datetime
+from typing import Any, Sequence
+
+from app.core.exceptions import InvalidCursorError
+
+DEFAULT_PAGE_SIZE = 20
+
+
+def encode_cursor(created_at: datetime, id: int) -> str:
+    """Encode a (created_at, id) keyset position as an opaque cursor."""
+
+    raw = f"{created_at.isoformat()}|{id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decode a cursor produced by `encode_cursor`."""
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        created_at, id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursorError("Invalid pagination cursor.")
+
+
+def encode_offset_cursor(offset: int) -> str:
+    """Encode an offset as an opaque cursor, for result sets without a stable key."""
+
+    return base64.urlsafe_b64encode(f"offset|{offset}".encode()).decode().rstrip("=")
+
+
+def decode_offset_cursor(cursor: str) -> int:
+    """Decode a cursor produced by `encode_offset_cursor`."""
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        prefix, offset = base64.urlsafe_b64decode(padded.encode()).decode().split("|")
+        if prefix != "offset" or int(offset) < 0:
+            raise ValueError(cursor)
+        return int(offset)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursorError("Invalid pagination cursor.")
+
+
+def paginate(rows: Sequence[Any], limit: int) -> dict:
+    """
+    Build a page from rows fetched with `limit + 1`.
+
+    The extra row only signals that another page exists; it is not returned.
+    """
+
+    items = list(rows[:limit])
+    next_cursor = None
+
+    if len(rows) > limit and items:
+        last = items[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+
+    return {"items": items, "next_cursor": next_cursor}
@@ -1,13 +1,182 @@
-from passlib.context import CryptContext
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import cache
+from typing import TYPE_CHECKING, Any, Callable, TypeVar
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.core.config import settings
+from app.core.exceptions import PasswordHasherBusyError
+from app.db.pool import percentile
+
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
+T = TypeVar("T")
+
+
+@cache
+def get_pwd_context() -> "CryptContext":
+    """
+    The password hashing context, built on first use.
+
+    passlib and its bcrypt backend are only imported then, processes that
+    never check a password do not pay for them.
+    """
+
+    from passlib.context import CryptContext
+
+    # Hashes below the configured cost are upgraded on the next successful
+    # login.
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__rounds=settings.BCRYPT_ROUNDS,
+        bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    )
+
+
+def load_password_backend() -> None:
+    """Import and initialize the bcrypt backend ahead of the first login."""
+
+    get_pwd_context().handler("bcrypt").get_backend()
 
 
 def hash_password(password: str) -> str:
     """Hash a password using bcrypt."""
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against a hashed password."""
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
+
+
+class PasswordHasher:
+    """
+    Bounded thread pool running the bcrypt work off the event loop.
+
+    bcrypt releases the GIL, so `workers` hashes run in parallel while the
+    loop keeps serving other requests. At most `max_pending` jobs are queued
+    or running; beyond that `PasswordHasherBusyError` is raised right away
+    instead of letting the queue, and every caller's latency, grow.
+    """
+
+    def __init__(self, workers: int, max_pending: int, window: int = 1000) -> None:
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._recent_waits: deque[float] = deque(maxlen=window)
+        self.pending = 0
+        self.max_seen_pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.total_run = 0.0
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="password-hasher"
+            )
+        return self._executor
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise PasswordHasherBusyError("Too many password operations queued.")
+            self.pending += 1
+            self.max_seen_pending = max(self.max_seen_pending, self.pending)
+
+        enqueued = time.perf_counter()
+
+        def job() -> T:
+            started = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                self._record(started - enqueued, time.perf_counter() - started)
+
+        try:
+            future = self.executor.submit(job)
+        except BaseException:
+            self._release()
+            raise
+
+        # A cancelled caller stops waiting, but a running job still holds its
+        # slot: it is released when the job finishes, or is cancelled before
+        # it starts.
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, future: Future | None = None) -> None:
+        with self._lock:
+            self.pending -= 1
+
+    def _record(self, wait: float, run: float) -> None:
+        with self._lock:
+            self.completed += 1
+            self.total_wait += wait
+            self.total_run += run
+            self._recent_waits.append(wait)
+
+    def reset_after_fork(self) -> None:
+        # The executor threads are not copied into a forked child.
+        self._executor = None
+        self._lock = threading.Lock()
+        self.pending = 0
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        """Queue depth and timings, in milliseconds."""
+
+        with self._lock:
+            completed = self.completed
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "pending": self.pending,
+                "max_seen_pending": self.max_seen_pending,
+                "completed": completed,
+                "rejected": self.rejected,
+                "avg_wait_ms": self.total_wait / completed * 1000 if completed else 0,
+                "p95_wait_ms": percentile(sorted(self._recent_waits), 0.95) * 1000,
+                "avg_run_ms": self.total_run / completed * 1000 if completed else 0,
+                "rounds": settings.BCRYPT_ROUNDS,
+            }
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
+os.register_at_fork(after_in_child=password_hasher.reset_after_fork)
+
+
+async def hash_password_async(password: str) -> str:
+    """`hash_password` on the password hasher pool."""
+    return await password_hasher.run(hash_password, password)
+
+
+async def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """
+    Verify a password on the password hasher pool.
+
+    Also returns a new hash when the stored one was made with outdated
+    parameters, so the caller can replace it.
+    """
+
+    return await password_hasher.run(
+        get_pwd_context().verify_and_update, plain_password, hashed_password
+    )
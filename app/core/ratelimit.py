@@ -0,0 +1,294 @@
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Sequence
+
+from fastapi import HTTPException, Request, status
+
+from app.core.config import settings
+from app.core.enums import RateLimitAlgorithm, RateLimitBackend
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+@dataclass(frozen=True)
+class Rate:
+    limit: int
+    period: float
+
+    @classmethod
+    def parse(cls, value: str) -> "Rate":
+        """Parse rates written as `<limit>/<second|minute|hour|day>`."""
+
+        try:
+            limit, period = value.split("/")
+            return cls(int(limit), PERIODS[period.strip().rstrip("s")])
+        except (KeyError, ValueError):
+            raise ValueError(f"Invalid rate: {value!r}")
+
+
+class CounterStore(ABC):
+    """Expiring integer counters, the only primitive a shared backend needs."""
+
+    @abstractmethod
+    async def incr(self, key: str, ttl: float) -> int:
+        """Increment `key`, created to expire after `ttl` seconds."""
+
+    @abstractmethod
+    async def get(self, key: str) -> int:
+        """Current value of `key`, 0 when missing or expired."""
+
+    def reset(self) -> None:
+        pass
+
+
+class MemoryCounterStore(CounterStore):
+    """Per-process counters, also the local stand-in for a shared store."""
+
+    def __init__(
+        self, maxsize: int = 100_000, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.maxsize = maxsize
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._data: OrderedDict[str, tuple[float, int]] = OrderedDict()
+
+    async def incr(self, key: str, ttl: float) -> int:
+        now = self._clock()
+        with self._lock:
+            expires, value = self._data.get(key, (0.0, 0))
+            if expires <= now:
+                expires, value = now + ttl, 0
+
+            self._data[key] = (expires, value + 1)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+            return value + 1
+
+    async def get(self, key: str) -> int:
+        with self._lock:
+            expires, value = self._data.get(key, (0.0, 0))
+            return value if expires > self._clock() else 0
+
+    def reset(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class RedisCounterStore(CounterStore):
+    """Counters shared by every worker through Redis (`redis` package)."""
+
+    def __init__(self, url: str) -> None:
+        try:
+            from redis import asyncio as aioredis
+        except ImportError:
+            raise RuntimeError(
+                "The redis rate limit backend requires the `redis` package."
+            )
+
+        self._client = aioredis.from_url(url)
+
+    async def incr(self, key: str, ttl: float) -> int:
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.incr(key)
+            pipe.expire(key, math.ceil(ttl), nx=True)
+            value, _ = await pipe.execute()
+        return int(value)
+
+    async def get(self, key: str) -> int:
+        return int(await self._client.get(key) or 0)
+
+
+class RateLimiter(ABC):
+    @abstractmethod
+    async def hit(self, key: str, rate: Rate) -> float:
+        """
+        Count a request against `key`.
+
+        Returns 0 when it is allowed, otherwise the seconds to wait.
+        """
+
+    def reset(self) -> None:
+        pass
+
+
+class TokenBucketLimiter(RateLimiter):
+    """
+    Buckets of `rate.limit` tokens refilled continuously over `rate.period`.
+
+    Allows short bursts up to the limit, the state lives in this process.
+    """
+
+    def __init__(
+        self, maxsize: int = 100_000, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.maxsize = maxsize
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    async def hit(self, key: str, rate: Rate) -> float:
+        now = self._clock()
+        refill = rate.limit / rate.period
+
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (float(rate.limit), now))
+            tokens = min(rate.limit, tokens + (now - updated) * refill)
+
+            retry_after = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                retry_after = (1 - tokens) / refill
+
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+
+            return retry_after
+
+    def reset(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+class SlidingWindowLimiter(RateLimiter):
+    """
+    Sliding window counter over a `CounterStore`.
+
+    The count of the previous fixed window is weighted by how much of it the
+    sliding window still covers, which only needs atomic increments and so
+    works the same on a shared store.
+    """
+
+    def __init__(
+        self, store: CounterStore, clock: Callable[[], float] = time.time
+    ) -> None:
+        self.store = store
+        self._clock = clock
+
+    async def hit(self, key: str, rate: Rate) -> float:
+        now = self._clock()
+        window = int(now // rate.period)
+        elapsed = now - window * rate.period
+
+        # Rejected requests are counted too, hammering clients stay blocked.
+        current = await self.store.incr(f"{key}:{window}", ttl=2 * rate.period)
+        previous = await self.store.get(f"{key}:{window - 1}")
+
+        weight = 1 - elapsed / rate.period
+        if previous * weight + current <= rate.limit:
+            return 0.0
+
+        if current > rate.limit or previous == 0:
+            return rate.period - elapsed
+
+        # Wait until the previous window's share has decayed enough.
+        needed_weight = (rate.limit - current) / previous
+        return max(0.0, (1 - needed_weight) * rate.period - elapsed)
+
+    def reset(self) -> None:
+        self.store.reset()
+
+
+def build_rate_limiter() -> RateLimiter:
+    if settings.RATE_LIMIT_BACKEND == RateLimitBackend.REDIS:
+        if settings.RATE_LIMIT_ALGORITHM != RateLimitAlgorithm.SLIDING_WINDOW:
+            raise ValueError("The redis rate limit backend needs the sliding window.")
+        if not settings.RATE_LIMIT_REDIS_URL:
+            raise ValueError("RATE_LIMIT_REDIS_URL is required for redis.")
+        return SlidingWindowLimiter(RedisCounterStore(settings.RATE_LIMIT_REDIS_URL))
+
+    if settings.RATE_LIMIT_ALGORITHM == RateLimitAlgorithm.SLIDING_WINDOW:
+        return SlidingWindowLimiter(MemoryCounterStore())
+    return TokenBucketLimiter()
+
+
+rate_limiter = build_rate_limiter()
+
+
+def client_ip(request: Request) -> str:
+    if settings.RATE_LIMIT_TRUST_FORWARDED_FOR:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+async def request_key(request: Request, kind: str) -> str | None:
+    if kind == "ip":
+        return client_ip(request)
+    if kind == "fingerprint":
+        return request.headers.get("x-device-fingerprint")
+    if kind == "username":
+        # Parsed once, the endpoint's form dependency reuses it.
+        username = (await request.form()).get("username")
+        return username.lower() if isinstance(username, str) else None
+    raise ValueError(f"Unknown rate limit key: {kind}")
+
+
+class RateLimit:
+    """
+    Dependency rejecting requests over `rate` with 429 and Retry-After.
+
+    Declared before the endpoint's other dependencies, it runs before any
+    database or password work. Each kind in `keys` (`ip`, `username`,
+    `fingerprint`) is limited separately, requests missing a key skip it.
+    """
+
+    def __init__(
+        self,
+        scope: str,
+        rate: str | Callable[[], str],
+        keys: Sequence[str] = ("ip",),
+        limiter: Callable[[], RateLimiter] = lambda: rate_limiter,
+    ) -> None:
+        self.scope = scope
+        self.rate = rate
+        self.keys = keys
+        self.limiter = limiter
+
+    async def __call__(self, request: Request) -> None:
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+
+        rate = Rate.parse(self.rate() if callable(self.rate) else self.rate)
+        limiter = self.limiter()
+        retry_after = 0.0
+
+        for kind in self.keys:
+            value = await request_key(request, kind)
+            if value:
+                key = f"ratelimit:{self.scope}:{kind}:{value}"
+                retry_after = max(retry_after, await limiter.hit(key, rate))
+
+        if retry_after > 0:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests, please try again later",
+                headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+            )
+
+
+def setting(name: str) -> Callable[[], Any]:
+    """Read a rate from settings at request time, so it can be changed live."""
+
+    return lambda: getattr(settings, name)
+
+
+login_rate_limit = RateLimit(
+    "login", setting("RATE_LIMIT_LOGIN"), keys=("ip", "fingerprint")
+)
+login_username_rate_limit = RateLimit(
+    "login", setting("RATE_LIMIT_LOGIN_USERNAME"), keys=("username",)
+)
+refresh_rate_limit = RateLimit(
+    "refresh", setting("RATE_LIMIT_REFRESH"), keys=("ip", "fingerprint")
+)
+write_rate_limit = RateLimit("write", setting("RATE_LIMIT_WRITE"), keys=("ip",))
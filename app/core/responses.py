@@ -0,0 +1,134 @@
+from datetime import datetime
+from typing import Any, Mapping
+
+import pydantic_core
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+
+from app.core.cache import TTLCache
+from app.core.compression import compress, negotiate_encoding
+from app.core.conditional import representation_etag, set_validators
+from app.core.config import settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize plain JSON-compatible content, with `orjson` when installed."""
+
+    if orjson is None:
+        return pydantic_core.to_json(content)
+    return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    Default response class.
+
+    FastAPI has already validated and encoded the content to plain data, which
+    `orjson` renders several times faster than the stdlib encoder.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class SchemaJSONResponse(JSONResponse):
+    """
+    Response whose content may hold validated schema instances.
+
+    pydantic serializes them in the same pass as the rest of the payload,
+    producing the same JSON as `response_model` would.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return pydantic_core.to_json(content)
+
+
+def envelope(
+    data: Any,
+    message: str | None = None,
+    status_code: int = 200,
+    headers: Mapping[str, str] | None = None,
+) -> SchemaJSONResponse:
+    """
+    A successful `ResponseBase` response built straight from validated data.
+
+    Returning a response skips the route's `response_model`, so `data` must
+    already be made of the declared schemas, e.g. the instances cached by the
+    crud layer.
+    """
+
+    return SchemaJSONResponse(
+        {"success": True, "message": message, "data": data, "error": None},
+        status_code=status_code,
+        headers=headers,
+    )
+
+
+# Rendered, and possibly compressed, envelope bodies keyed by (ETag, coding).
+# An ETag changes whenever its data does, so entries never go stale.
+rendered_responses = TTLCache(
+    maxsize=settings.RESPONSE_CACHE_SIZE,
+    ttl=settings.RESPONSE_CACHE_TTL,
+    name="responses",
+)
+
+
+def render_cached(
+    etag: str, data: Any, encoding: str | None
+) -> tuple[bytes, str | None]:
+    """
+    The body of `envelope(data)` and the coding it was compressed with.
+
+    Bodies under `COMPRESSION_MIN_SIZE` are not worth compressing and are
+    returned as is.
+    """
+
+    if encoding is not None:
+        body = rendered_responses.get((etag, encoding))
+        if body is not None:
+            return body, encoding
+
+    body = rendered_responses.get((etag, None))
+    if body is None:
+        body = envelope(data).body
+        rendered_responses.set((etag, None), body)
+
+    if encoding is None or len(body) < settings.COMPRESSION_MIN_SIZE:
+        return body, None
+
+    body = compress(body, encoding)
+    rendered_responses.set((etag, encoding), body)
+    return body, encoding
+
+
+def cached_envelope(
+    request: Request,
+    data: Any,
+    etag: str,
+    last_modified: datetime | None = None,
+) -> Response:
+    """
+    `envelope(data)` carrying the validators, served from `rendered_responses`.
+
+    Repeated requests for the same ETag skip serialization and, for clients
+    accepting a supported coding, compression too. The ETag sent is the
+    `representation_etag` of `etag`, distinct for every coding.
+    """
+
+    encoding = None
+    if settings.COMPRESSION_ENABLED:
+        encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+
+    body, encoding = render_cached(etag, data, encoding)
+    headers = {"Vary": "Accept-Encoding"}
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+
+    response = Response(body, media_type="application/json", headers=headers)
+    set_validators(response, representation_etag(request, etag), last_modified)
+    return response
@@ -0,0 +1,128 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import AsyncContextManager, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.bloom import BloomFilter
+from app.core.config import settings
+from app.crud import (
+    crud_get_revoked_jtis,
+    crud_is_token_revoked,
+    crud_prune_revoked_tokens,
+    crud_revoke_token,
+)
+
+logger = logging.getLogger(__name__)
+
+# Rows revoked by other workers may commit slightly out of order.
+SYNC_OVERLAP = timedelta(seconds=60)
+
+
+class RevocationList:
+    """
+    Denylist of access and refresh tokens by `jti`, persisted in
+    `revoked_tokens` and fronted by an in-memory Bloom filter.
+
+    A token absent from the filter is not revoked, which answers the common
+    case without I/O; only filter matches are confirmed in the database. Every
+    `sync_interval` seconds the filter picks up tokens revoked by other
+    workers, and every `prune_interval` seconds it is rebuilt from the
+    unexpired ones. Syncing only reads, expired rows are deleted by
+    `prune_revoked_tokens` in the background.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        error_rate: float,
+        sync_interval: float,
+        prune_interval: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self.prune_interval = prune_interval
+        self._clock = clock
+        self.reset()
+
+    def reset(self) -> None:
+        self.filter = BloomFilter(self.capacity, self.error_rate)
+        self._synced_at: float | None = None
+        self._rebuilt_at: float | None = None
+        self._seen_until: datetime | None = None
+        self.checks = 0
+        self.db_checks = 0
+
+    async def sync(self, db: AsyncSession) -> None:
+        now = self._clock()
+        if self._synced_at is not None and now - self._synced_at < self.sync_interval:
+            return
+
+        if self._rebuilt_at is None or now - self._rebuilt_at >= self.prune_interval:
+            rows = await crud_get_revoked_jtis(db)
+            self.filter = BloomFilter.from_items(
+                (jti for jti, _ in rows), self.capacity, self.error_rate
+            )
+            self._rebuilt_at = now
+        else:
+            since = self._seen_until - SYNC_OVERLAP if self._seen_until else None
+            rows = await crud_get_revoked_jtis(db, since=since)
+            for jti, _ in rows:
+                self.filter.add(jti)
+
+        if rows:
+            latest = max(revoked_at for _, revoked_at in rows)
+            self._seen_until = max(self._seen_until or latest, latest)
+        self._synced_at = now
+
+    async def is_revoked(self, db: AsyncSession, jti: str) -> bool:
+        await self.sync(db)
+        self.checks += 1
+
+        if jti not in self.filter:
+            return False
+
+        self.db_checks += 1
+        return await crud_is_token_revoked(db, jti)
+
+    async def revoke(self, db: AsyncSession, jti: str, expires_at: datetime) -> None:
+        await crud_revoke_token(db, jti=jti, expires_at=expires_at)
+        self.filter.add(jti)
+
+    async def revoke_claims(self, db: AsyncSession, payload: dict) -> None:
+        """Revoke the token with these claims, unless it has no `jti`."""
+
+        if not payload.get("jti"):
+            return
+
+        expires_at = datetime.fromtimestamp(payload["exp"], timezone.utc)
+        await self.revoke(db, payload["jti"], expires_at.replace(tzinfo=None))
+
+
+async def prune_revoked_tokens(
+    sessionmaker: Callable[[], AsyncContextManager[AsyncSession]], interval: float
+) -> None:
+    """
+    Delete the expired denylist rows every `interval` seconds until cancelled,
+    on a session of its own rather than in a request.
+    """
+
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with sessionmaker() as db:
+                await crud_prune_revoked_tokens(db)
+        except Exception:
+            logger.warning("Could not prune revoked tokens", exc_info=True)
+
+
+token_revocations = RevocationList(
+    capacity=settings.REVOCATION_FILTER_CAPACITY,
+    error_rate=settings.REVOCATION_FILTER_ERROR_RATE,
+    sync_interval=settings.REVOCATION_SYNC_INTERVAL,
+    prune_interval=settings.REVOCATION_PRUNE_INTERVAL,
+)
@@ -2,13 +2,27 @@ from .blogpost import (
     crud_create_blogpost,
     crud_delete_blogpost,
     crud_get_blogpost,
+    crud_get_blogpost_cached,
+    crud_get_blogpost_validators,
     crud_get_blogposts,
+    crud_get_blogposts_cached,
+    crud_search_blogposts,
     crud_update_blogpost,
+    invalidate_blogpost_cache,
     is_author_of_blogpost,
 )
+from .bulk import crud_import_blogposts, crud_insert_blogposts_batch
+from .tag import crud_get_tag_stats, crud_resolve_tag_ids, crud_resolve_tags
+from .token import (
+    crud_get_revoked_jtis,
+    crud_is_token_revoked,
+    crud_prune_revoked_tokens,
+    crud_revoke_token,
+)
 from .user import (
     crud_create_user,
     crud_delete_user,
+    crud_get_principal,
     crud_get_user,
     crud_update_user,
     crud_update_user_password,
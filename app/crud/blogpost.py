@@ -1,24 +1,117 @@
-from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Iterable, cast
 
-from app.core.exceptions import ConflictError, NotFoundError
+from sqlalchemy import ColumnElement, exists, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer, joinedload, selectinload
+from sqlalchemy.orm.interfaces import LoaderOption
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.content import analyze_content
+from app.core.enums import LoadStrategy
+from app.core.exceptions import ConflictError, JobQueueFullError, NotFoundError
+from app.core.jobs import job_queue
+from app.core.pagination import DEFAULT_PAGE_SIZE
+from app.db import session
+from app.db.base import utc_now
+from app.db.replicas import PINNED_SESSION, REPLICA_SESSION
 from app.models import Blogpost
+from app.models.blogpost import SEARCH_CONFIG
+from app.schemas import BlogpostListItem, BlogpostShow
+
+from .tag import crud_resolve_tags
+
+# Read-through cache of serialized blogposts. Detail entries are keyed by
+# ("blogpost", "id" | "slug", value), listings by ("blogposts", tag, ...).
+blogpost_cache = TTLCache(
+    maxsize=settings.BLOGPOST_CACHE_SIZE,
+    ttl=settings.BLOGPOST_CACHE_TTL,
+    name="blogposts",
+)
+
+
+def reads_cache(db: AsyncSession) -> bool:
+    """Whether `db` may be served from the cache, not for pinned clients."""
+    return not db.info.get(PINNED_SESSION)
+
+
+def fills_cache(db: AsyncSession) -> bool:
+    """Whether what `db` reads may be cached, not when read from a replica."""
+    return not db.info.get(REPLICA_SESSION)
+
+
+def blogpost_cache_key(id: int | None = None, slug: str | None = None) -> tuple:
+    if id is not None:
+        return ("blogpost", "id", id)
+    return ("blogpost", "slug", slug)
+
+
+def with_derived_fields(blogpost_data: dict, fill_preview: bool = True) -> dict:
+    """
+    Add the fields derived from `content` (word count, reading time, excerpt
+    and hash), and use the excerpt as preview when none is given.
+    """
+
+    content = blogpost_data.get("content")
+    if content is None:
+        return blogpost_data
+
+    derived = analyze_content(content)
+    data = {**blogpost_data, **derived}
+
+    if fill_preview and not data.get("preview"):
+        data["preview"] = derived["excerpt"]
+
+    return data
+
+
+def tags_loader(strategy: LoadStrategy | None = None) -> LoaderOption:
+    """
+    Eager loading option for `Blogpost.tags`.
+
+    Serializing a blogpost reads its tags, so leaving the relationship lazy
+    costs one extra SELECT per post. SELECTIN adds a single query per listing,
+    JOINED folds the tags into the main query.
+    """
+
+    strategy = strategy or settings.BLOGPOST_LOAD_STRATEGY
 
+    if strategy == LoadStrategy.JOINED:
+        return joinedload(Blogpost.tags)
+    return selectinload(Blogpost.tags)
 
-def is_author_of_blogpost(db: Session, blogpost_id: int, user_id: int) -> bool:
+
+async def is_author_of_blogpost(
+    db: AsyncSession, blogpost_id: int, user_id: int
+) -> bool:
     """Check if the user is the author of the blogpost."""
 
-    return db.query(
-        db.query(Blogpost)
-        .filter(Blogpost.id == blogpost_id, Blogpost.author_id == user_id)
-        .exists()
-    ).scalar()
+    query = select(
+        exists().where(Blogpost.id == blogpost_id, Blogpost.author_id == user_id)
+    )
+    return bool(await db.scalar(query))
 
 
-def crud_get_blogposts(
-    db: Session, tag: str = "all", only_active: bool = True
+async def crud_get_blogposts(
+    db: AsyncSession,
+    tag: str = "all",
+    only_active: bool = True,
+    limit: int | None = None,
+    cursor: tuple[datetime, int] | None = None,
+    load_strategy: LoadStrategy | None = None,
 ) -> list[Blogpost]:
-    """Fetch all blogposts, optionally filtered by tag."""
-    query = db.query(Blogpost)
+    """
+    Fetch blogposts newest first, optionally filtered by tag.
+
+    Listings never need the post body, so `content` is deferred and left out of
+    the SELECT. Pagination is keyset based on (created_at, id): `cursor` is the
+    position of the last row of the previous page.
+    """
+    query = select(Blogpost).options(
+        defer(Blogpost.content, raiseload=True),  # type: ignore[arg-type]
+        tags_loader(load_strategy),
+    )
 
     if tag != "all":
         query = query.filter(Blogpost.tags.any(name=tag))
@@ -26,54 +119,291 @@ def crud_get_blogposts(
     if only_active:
         query = query.filter(Blogpost.is_active == True)  # noqa: E712
 
-    return query.all()
+    if cursor is not None:
+        query = query.filter(tuple_(Blogpost.created_at, Blogpost.id) < cursor)
 
+    query = query.order_by(Blogpost.created_at.desc(), Blogpost.id.desc())
+
+    if limit is not None:
+        query = query.limit(limit)
+
+    result = await db.scalars(query)
+    return list(result.unique().all())
+
+
+def html_escaped(text: ColumnElement) -> ColumnElement:
+    """SQL counterpart of `html.escape`."""
+
+    for char, entity in (
+        ("&", "&amp;"),
+        ("<", "&lt;"),
+        (">", "&gt;"),
+        ('"', "&quot;"),
+        ("'", "&#x27;"),
+    ):
+        text = func.replace(text, char, entity)
+    return text
+
+
+async def crud_search_blogposts(
+    db: AsyncSession,
+    q: str,
+    limit: int = 20,
+    offset: int = 0,
+    only_active: bool = True,
+) -> list[tuple[Blogpost, float, str]]:
+    """
+    Full-text search over title, preview and content, best matches first.
+
+    Matching and ranking run on the GIN indexed `search_vector`. The snippet is
+    computed with ts_headline, which re-parses the document, so it is only
+    evaluated for the rows of the requested page. The document is HTML
+    escaped first, the `<mark>` tags are the only markup of the snippet.
+    """
+
+    ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+    rank = func.ts_rank(Blogpost.search_vector, ts_query)
+
+    matches = select(Blogpost.id, rank.label("rank")).where(
+        Blogpost.search_vector.bool_op("@@")(ts_query)
+    )
+    if only_active:
+        matches = matches.where(Blogpost.is_active == True)  # noqa: E712
+
+    page = (
+        matches.order_by(rank.desc(), Blogpost.id.desc())
+        .limit(limit)
+        .offset(offset)
+        .subquery()
+    )
+
+    snippet = func.ts_headline(
+        SEARCH_CONFIG,
+        html_escaped(func.concat_ws(" ", Blogpost.preview, Blogpost.content)),
+        ts_query,
+        "StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=30, MinWords=10",
+    )
+    query = (
+        select(Blogpost, page.c.rank, snippet.label("snippet"))
+        .join(page, Blogpost.id == page.c.id)
+        .options(
+            defer(Blogpost.content, raiseload=True),  # type: ignore[arg-type]
+            tags_loader(),
+        )
+        .order_by(page.c.rank.desc(), Blogpost.id.desc())
+    )
+
+    result = await db.execute(query)
+    return [(row.Blogpost, row.rank, row.snippet) for row in result.unique()]
+
+
+async def crud_get_blogpost(
+    db: AsyncSession,
+    id: int | None = None,
+    slug: str | None = None,
+    load_strategy: LoadStrategy | None = None,
+) -> Blogpost | None:
+    """Fetch a single blogpost by ID or slug, tags included."""
+    query = select(Blogpost).options(tags_loader(load_strategy))
 
-def crud_get_blogpost(
-    db: Session, id: int | None = None, slug: str | None = None
-) -> Blogpost:
-    """Fetch a single blogpost by ID or slug."""
     if id is not None:
-        return db.query(Blogpost).filter_by(id=id).first()
+        query = query.filter_by(id=id)
+    elif slug is not None:
+        query = query.filter_by(slug=slug)
+    else:
+        raise ValueError("Either id or slug must be provided.")
 
-    if slug is not None:
-        return db.query(Blogpost).filter_by(slug=slug).first()
+    result = await db.scalars(query)
+    return result.unique().first()
 
-    raise ValueError("Either id or slug must be provided.")
 
+async def crud_get_blogpost_validators(
+    db: AsyncSession, id: int | None = None, slug: str | None = None
+) -> tuple[int, datetime] | None:
+    """
+    Fetch the (id, updated_at) of a blogpost, enough to answer a conditional
+    request. Served from the cache when possible, otherwise the row itself is
+    not loaded.
+    """
 
-def crud_create_blogpost(blogpost_data: dict, db: Session) -> Blogpost:
+    if reads_cache(db):
+        cached = blogpost_cache.get(blogpost_cache_key(id=id, slug=slug))
+        if cached is not None:
+            return cached.id, cached.updated_at
+
+    query = select(Blogpost.id, Blogpost.updated_at)
+
+    if id is not None:
+        query = query.filter_by(id=id)
+    elif slug is not None:
+        query = query.filter_by(slug=slug)
+    else:
+        raise ValueError("Either id or slug must be provided.")
+
+    row = (await db.execute(query)).first()
+    return (row.id, row.updated_at) if row else None
+
+
+async def crud_get_blogposts_cached(
+    db: AsyncSession,
+    tag: str = "all",
+    only_active: bool = True,
+    limit: int | None = None,
+    cursor: tuple[datetime, int] | None = None,
+) -> list[BlogpostListItem]:
+    """Cached `crud_get_blogposts`, serialized as listing items."""
+
+    key = ("blogposts", tag, only_active, limit, cursor)
+    data = blogpost_cache.get(key) if reads_cache(db) else None
+
+    if data is None:
+        blogposts = await crud_get_blogposts(
+            db=db, tag=tag, only_active=only_active, limit=limit, cursor=cursor
+        )
+        data = [BlogpostListItem.model_validate(b) for b in blogposts]
+        if fills_cache(db):
+            blogpost_cache.set(key, data)
+
+    return data
+
+
+async def crud_get_blogpost_cached(
+    db: AsyncSession, id: int | None = None, slug: str | None = None
+) -> BlogpostShow | None:
+    """Cached `crud_get_blogpost`. Missing blogposts are not cached."""
+
+    key = blogpost_cache_key(id=id, slug=slug)
+    data = blogpost_cache.get(key) if reads_cache(db) else None
+
+    if data is None:
+        blogpost = await crud_get_blogpost(db=db, id=id, slug=slug)
+        if blogpost is None:
+            return None
+
+        data = BlogpostShow.model_validate(blogpost)
+        if fills_cache(db):
+            blogpost_cache.set(blogpost_cache_key(id=data.id), data)
+            blogpost_cache.set(blogpost_cache_key(slug=data.slug), data)
+
+    return data
+
+
+def invalidate_blogpost_cache(
+    id: int | None = None, slugs: Iterable[str] = (), tags: Iterable[str] = ()
+) -> None:
+    """
+    Drop the cache entries a blogpost write can affect: the post itself under
+    each of its slugs, and the `all` listing plus the listing of every tag the
+    post had before or has after the write.
+    """
+
+    keys = [blogpost_cache_key(slug=slug) for slug in slugs]
+    if id is not None:
+        keys.append(blogpost_cache_key(id=id))
+    blogpost_cache.invalidate(*keys)
+
+    listings = {"all", *tags}
+    blogpost_cache.invalidate_where(
+        lambda key: key[0] == "blogposts" and key[1] in listings
+    )
+
+
+async def warm_blogpost_listing(tag: str) -> None:
+    """Load the first page of a listing back into the cache."""
+
+    # On the primary, a replica may not have the write yet.
+    async with session.AsyncSessionLocal() as db:
+        await crud_get_blogposts_cached(
+            db=db, tag=tag, only_active=True, limit=DEFAULT_PAGE_SIZE + 1
+        )
+
+
+def schedule_listing_warmup(tags: Iterable[str]) -> None:
+    """
+    Queue warming the `all` listing and those of `tags` after a write, so the
+    next reader does not pay for them. Never waits: the jobs are dropped when
+    the job queue is full.
+    """
+
+    if not settings.BLOGPOST_CACHE_WARMUP:
+        return
+
+    for tag in sorted({"all", *tags}):
+        try:
+            job_queue.enqueue_nowait(warm_blogpost_listing, tag)
+        except JobQueueFullError:
+            return
+
+
+async def crud_create_blogpost(blogpost_data: dict, db: AsyncSession) -> Blogpost:
     """Create a new blogpost in the database."""
-    if crud_get_blogpost(slug=blogpost_data.get("slug"), db=db):
+    if await crud_get_blogpost(slug=blogpost_data.get("slug"), db=db):
         raise ConflictError("Blogpost with this slug already exists.")
 
+    blogpost_data = with_derived_fields(blogpost_data)
+    if blogpost_data.get("tags"):
+        blogpost_data["tags"] = await crud_resolve_tags(db, blogpost_data["tags"])
+
     new_blogpost = Blogpost(**blogpost_data)
     db.add(new_blogpost)
-    db.commit()
-    db.refresh(new_blogpost)
-    return new_blogpost
+    await db.commit()
+
+    blogpost_id = cast(int, new_blogpost.id)
+    blogpost = await crud_get_blogpost(id=blogpost_id, db=db)
+    tags = {tag.name for tag in new_blogpost.tags}
+    invalidate_blogpost_cache(
+        id=blogpost_id, slugs={cast(str, new_blogpost.slug)}, tags=tags
+    )
+    schedule_listing_warmup(tags)
+    return blogpost
 
 
-def crud_update_blogpost(id: int, blogpost_data: dict, db: Session) -> Blogpost:
+async def crud_update_blogpost(
+    id: int, blogpost_data: dict, db: AsyncSession
+) -> Blogpost:
     """Update an existing blogpost in the database."""
-    blogpost = crud_get_blogpost(id=id, db=db)
+    blogpost = await crud_get_blogpost(id=id, db=db)
     if not blogpost:
         raise NotFoundError("Blogpost not found.")
 
+    slugs = {cast(str, blogpost.slug)}
+    tags = {tag.name for tag in blogpost.tags}
+
+    # Previews that were generated follow the content, hand written ones stay.
+    auto_preview = bool(not blogpost.preview or blogpost.preview == blogpost.excerpt)
+    blogpost_data = with_derived_fields(
+        blogpost_data, fill_preview=auto_preview and "preview" not in blogpost_data
+    )
+    if blogpost_data.get("tags") is not None:
+        blogpost_data["tags"] = await crud_resolve_tags(db, blogpost_data["tags"])
+
     for key, value in blogpost_data.items():
         setattr(blogpost, key, value)
 
-    db.commit()
-    db.refresh(blogpost)
+    # Bumped explicitly, tag changes do not touch the blogposts row.
+    blogpost.updated_at = utc_now()  # type: ignore[assignment]
+    await db.commit()
+
+    tags |= {tag.name for tag in blogpost.tags}
+    invalidate_blogpost_cache(
+        id=id, slugs=slugs | {cast(str, blogpost.slug)}, tags=tags
+    )
+    schedule_listing_warmup(tags)
     return blogpost
 
 
-def crud_delete_blogpost(id: int, db: Session) -> None:
+async def crud_delete_blogpost(id: int, db: AsyncSession) -> None:
     """Delete a blogpost from the database."""
-    blogpost = crud_get_blogpost(id=id, db=db)
+    blogpost = await crud_get_blogpost(id=id, db=db)
     if not blogpost:
         raise NotFoundError("Blogpost not found.")
 
-    db.delete(blogpost)
-    db.commit()
+    slugs = {cast(str, blogpost.slug)}
+    tags = {tag.name for tag in blogpost.tags}
+
+    await db.delete(blogpost)
+    await db.commit()
+
+    invalidate_blogpost_cache(id=id, slugs=slugs, tags=tags)
+    schedule_listing_warmup(tags)
     return None
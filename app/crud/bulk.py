@@ -0,0 +1,192 @@
+from datetime import datetime, timezone
+from typing import Any, AsyncIterable
+
+from pydantic import ValidationError
+from sqlalchemy import or_, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.ndjson import NDJSONLineError, batched
+from app.db.base import utc_now
+from app.models import Blogpost, Series, blogpost_tags
+from app.schemas import BlogpostImport
+
+from .blogpost import invalidate_blogpost_cache, with_derived_fields
+from .tag import crud_resolve_tag_ids
+
+
+def import_error(line: int, slug: str | None, error: str) -> dict:
+    return {"line": line, "slug": slug, "error": error}
+
+
+def validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(loc) for loc in e['loc'])}: {e['msg']}" for e in error.errors()
+    )
+
+
+def to_naive_utc(value: datetime | None) -> datetime:
+    if value is None:
+        return utc_now()
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def tag_payloads(row: BlogpostImport) -> list[dict]:
+    return [
+        {"name": tag} if isinstance(tag, str) else tag.model_dump() for tag in row.tags
+    ]
+
+
+async def crud_insert_blogposts_batch(
+    db: AsyncSession, batch: list[tuple[int, Any]], author_id: int
+) -> tuple[int, list[dict]]:
+    """
+    Insert a batch of decoded NDJSON rows in a single transaction.
+
+    Conflicts are looked up for the whole batch at once and rows that would
+    violate a constraint are reported instead of aborting the others. Posts,
+    tags and tag links are each written with one multi-row statement.
+
+    Returns the number of inserted blogposts and the failed rows.
+    """
+
+    failed: list[dict] = []
+    rows: list[tuple[int, BlogpostImport]] = []
+
+    for line, value in batch:
+        slug = value.get("slug") if isinstance(value, dict) else None
+
+        if isinstance(value, NDJSONLineError):
+            failed.append(import_error(line, None, str(value)))
+            continue
+
+        try:
+            rows.append((line, BlogpostImport.model_validate(value)))
+        except ValidationError as e:
+            failed.append(import_error(line, slug, validation_message(e)))
+
+    if not rows:
+        return 0, failed
+
+    slugs = {row.slug for _, row in rows}
+    titles = {row.title for _, row in rows}
+    existing = await db.execute(
+        select(Blogpost.slug, Blogpost.title).where(
+            or_(Blogpost.slug.in_(slugs), Blogpost.title.in_(titles))
+        )
+    )
+    taken_slugs, taken_titles = set(), set()
+    for slug, title in existing:
+        taken_slugs.add(slug)
+        taken_titles.add(title)
+
+    series_ids = {row.series_id for _, row in rows if row.series_id is not None}
+    known_series = set()
+    if series_ids:
+        known_series = set(
+            await db.scalars(select(Series.id).where(Series.id.in_(series_ids)))
+        )
+
+    accepted: list[tuple[int, BlogpostImport]] = []
+    for line, row in rows:
+        if row.slug in taken_slugs:
+            failed.append(
+                import_error(line, row.slug, "Blogpost with this slug already exists.")
+            )
+        elif row.title in taken_titles:
+            failed.append(
+                import_error(line, row.slug, "Blogpost with this title already exists.")
+            )
+        elif row.series_id is not None and row.series_id not in known_series:
+            failed.append(import_error(line, row.slug, "Series not found."))
+        else:
+            accepted.append((line, row))
+            # Later rows of the batch reusing the slug or title conflict too.
+            taken_slugs.add(row.slug)
+            taken_titles.add(row.title)
+
+    if not accepted:
+        return 0, failed
+
+    tag_ids = await crud_resolve_tag_ids(
+        db, (tag for _, row in accepted for tag in tag_payloads(row))
+    )
+
+    now = utc_now()
+    values = []
+    for _, row in accepted:
+        data = with_derived_fields(row.model_dump(exclude={"tags"}))
+        data["created_at"] = to_naive_utc(row.created_at)
+        data["updated_at"] = now
+        data["author_id"] = author_id
+        values.append(data)
+
+    # Rows racing a concurrent writer for a slug or title are skipped by the
+    # insert and reported below. NULLs are rendered so that rows with and
+    # without a series still go in one statement.
+    result = await db.execute(
+        insert(Blogpost).on_conflict_do_nothing().returning(Blogpost.id, Blogpost.slug),
+        values,
+        execution_options={"render_nulls": True},
+    )
+    inserted = {slug: id for id, slug in result}
+
+    links = []
+    tag_names = set()
+    for line, row in accepted:
+        if row.slug not in inserted:
+            failed.append(
+                import_error(
+                    line, row.slug, "Blogpost with this slug or title already exists."
+                )
+            )
+            continue
+
+        for name in {tag["name"] for tag in tag_payloads(row)}:
+            links.append({"blogpost_id": inserted[row.slug], "tag_id": tag_ids[name]})
+            tag_names.add(name)
+
+    if links:
+        await db.execute(insert(blogpost_tags), links)
+
+    await db.commit()
+
+    invalidate_blogpost_cache(tags=tag_names)
+    return len(inserted), failed
+
+
+async def crud_import_blogposts(
+    db: AsyncSession,
+    rows: AsyncIterable[tuple[int, Any]],
+    author_id: int,
+    batch_size: int,
+    max_errors: int | None = None,
+) -> dict:
+    """
+    Import a stream of (line number, row) pairs, committing every `batch_size`
+    rows.
+
+    Only the current batch and the first `max_errors` failed rows (defaults to
+    `IMPORT_MAX_ERRORS`) are kept in memory, the others are only counted.
+    """
+
+    if max_errors is None:
+        max_errors = settings.IMPORT_MAX_ERRORS
+
+    summary: dict = {"imported": 0, "failed": [], "failed_count": 0}
+
+    async for batch in batched(rows, batch_size):
+        imported, failed = await crud_insert_blogposts_batch(db, batch, author_id)
+        summary["imported"] += imported
+        summary["failed_count"] += len(failed)
+
+        # Batches come in line order, the kept errors are the first ones.
+        room = max_errors - len(summary["failed"])
+        if room > 0:
+            failed.sort(key=lambda error: error["line"])
+            summary["failed"].extend(failed[:room])
+
+    return summary
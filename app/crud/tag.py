@@ -0,0 +1,95 @@
+from typing import Iterable, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Tag, TagStats, Tech, TechStats
+
+
+async def crud_resolve_tags(db: AsyncSession, tags: Sequence[dict | Tag]) -> list[Tag]:
+    """
+    Map tag payloads to Tag rows by name with a single query. Tags that do not
+    exist yet are added to the session; Tag instances are passed through.
+    """
+
+    names = {tag["name"] for tag in tags if isinstance(tag, dict)}
+    existing = {}
+
+    if names:
+        result = await db.scalars(select(Tag).where(Tag.name.in_(names)))
+        existing = {tag.name: tag for tag in result}
+
+    resolved: list[Tag] = []
+    for tag in tags:
+        if isinstance(tag, Tag):
+            resolved.append(tag)
+            continue
+
+        if tag["name"] not in existing:
+            existing[tag["name"]] = Tag(
+                name=tag["name"],
+                icon=tag.get("icon"),
+                description=tag.get("description"),
+            )
+            db.add(existing[tag["name"]])
+
+        if existing[tag["name"]] not in resolved:
+            resolved.append(existing[tag["name"]])
+
+    return resolved
+
+
+async def crud_resolve_tag_ids(
+    db: AsyncSession, tags: Iterable[dict]
+) -> dict[str, int]:
+    """
+    Map tag payloads to tag ids by name, inserting the missing tags in bulk.
+
+    Concurrent writers creating the same tag do not conflict, the insert skips
+    names that already exist.
+    """
+
+    by_name = {tag["name"]: tag for tag in tags}
+    if not by_name:
+        return {}
+
+    # Rendering the missing icons and descriptions as NULL keeps the rows in
+    # a single statement.
+    await db.execute(
+        insert(Tag).on_conflict_do_nothing(index_elements=["name"]),
+        [
+            {
+                "name": name,
+                "icon": tag.get("icon"),
+                "description": tag.get("description"),
+            }
+            for name, tag in by_name.items()
+        ],
+        execution_options={"render_nulls": True},
+    )
+    result = await db.execute(select(Tag.name, Tag.id).where(Tag.name.in_(by_name)))
+    return {name: id for name, id in result}
+
+
+async def crud_get_tag_stats(db: AsyncSession) -> dict:
+    """
+    Active blogposts per tag and active projects per tech, most used first.
+
+    Reads the trigger maintained summary tables, nothing is counted here.
+    """
+
+    tags = await db.execute(
+        select(Tag.id, Tag.name, Tag.icon, TagStats.post_count.label("count"))
+        .join(TagStats, TagStats.tag_id == Tag.id)
+        .where(TagStats.post_count > 0)
+        .order_by(TagStats.post_count.desc(), Tag.name)
+    )
+    techs = await db.execute(
+        select(Tech.id, Tech.name, Tech.icon, TechStats.project_count.label("count"))
+        .join(TechStats, TechStats.tech_id == Tech.id)
+        .where(TechStats.project_count > 0)
+        .order_by(TechStats.project_count.desc(), Tech.name)
+    )
+
+    return {"tags": tags.mappings().all(), "techs": techs.mappings().all()}
@@ -0,0 +1,48 @@
+from datetime import datetime
+from typing import cast
+
+from sqlalchemy import CursorResult, delete, exists, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.base import utc_now
+from app.models import RevokedToken
+
+
+async def crud_revoke_token(db: AsyncSession, jti: str, expires_at: datetime) -> None:
+    """Add a token to the denylist, revoking it twice is a no-op."""
+
+    await db.execute(
+        insert(RevokedToken)
+        .values(jti=jti, expires_at=expires_at, revoked_at=utc_now())
+        .on_conflict_do_nothing(index_elements=[RevokedToken.jti])
+    )
+    await db.commit()
+
+
+async def crud_is_token_revoked(db: AsyncSession, jti: str) -> bool:
+    return bool(await db.scalar(select(exists().where(RevokedToken.jti == jti))))
+
+
+async def crud_get_revoked_jtis(
+    db: AsyncSession, since: datetime | None = None
+) -> list[tuple[str, datetime]]:
+    """Unexpired revoked tokens as (jti, revoked_at), optionally only newer ones."""
+
+    query = select(RevokedToken.jti, RevokedToken.revoked_at).where(
+        RevokedToken.expires_at > utc_now()
+    )
+    if since is not None:
+        query = query.where(RevokedToken.revoked_at >= since)
+
+    return [(jti, revoked_at) for jti, revoked_at in await db.execute(query)]
+
+
+async def crud_prune_revoked_tokens(db: AsyncSession) -> int:
+    """Delete denylist entries whose token has expired anyway."""
+
+    result = await db.execute(
+        delete(RevokedToken).where(RevokedToken.expires_at <= utc_now())
+    )
+    await db.commit()
+    return cast(CursorResult, result).rowcount
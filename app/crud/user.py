@@ -1,94 +1,162 @@
-from sqlalchemy import and_, or_
-from sqlalchemy.orm import Session
+from typing import cast
 
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
 from app.core.exceptions import ConflictError, NotFoundError
+from app.core.password import hash_password_async, verify_and_update_password
 from app.models import User
+from app.schemas import UserShow
+
+# Authenticated principals by user id, so verified requests skip the user
+# lookup. Entries are dropped by every write that can change a user's access.
+principal_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL,
+    name="principals",
+)
+
+
+def user_login_query(
+    login: str, only_active: bool = True, by_email: bool | None = None
+) -> Select:
+    """
+    Select a user by username or email, ignoring case.
+
+    Usernames cannot contain "@", so by default a login is matched against a
+    single column and probes only its `lower()` index.
+    """
 
+    if by_email is None:
+        by_email = "@" in login
 
-def crud_get_user(
-    db: Session,
+    column = User.email if by_email else User.username
+    query = select(User).where(func.lower(column) == func.lower(login))
+    if only_active:
+        query = query.where(User.is_active == True)  # noqa: E712
+    return query
+
+
+async def crud_get_user(
+    db: AsyncSession,
     id: int | None = None,
     username: str | None = None,
     only_active: bool = True,
-) -> User:
-    """Fetch a single user by ID or username."""
+) -> User | None:
+    """Fetch a single user by ID, or by username or email in any casing."""
 
     if id is not None:
         if only_active:
-            return db.query(User).filter_by(id=id, is_active=True).first()
-        return db.query(User).filter_by(id=id).first()
+            return await db.scalar(select(User).filter_by(id=id, is_active=True))
+        return await db.scalar(select(User).filter_by(id=id))
     if username is not None:
-        if only_active:
-            return (
-                db.query(User)
-                .filter(
-                    and_(
-                        User.is_active == True,  # noqa: E712
-                        or_(
-                            User.username == username,
-                            User.email == username,
-                        ),
-                    ),
-                )
-                .first()
-            )
-        return db.query(User).filter_by(username=username).first()
+        user = await db.scalar(user_login_query(username, only_active))
+        if user is None and "@" in username:
+            # Usernames created before "@" was rejected can still log in.
+            query = user_login_query(username, only_active, by_email=False)
+            user = await db.scalar(query)
+        return user
     raise ValueError("Either id or username must be provided.")
 
 
-def crud_create_user(user_data: dict, db: Session) -> User:
+async def crud_get_principal(
+    db: AsyncSession, id: int, strict: bool | None = None
+) -> UserShow | None:
+    """
+    Active user by ID, serialized and cached for `PRINCIPAL_CACHE_TTL`.
+
+    With `strict` (defaults to `AUTH_STRICT_USER_LOOKUP`) the user is always
+    read from the database, so access changes made by another worker apply
+    immediately.
+    """
+
+    if strict is None:
+        strict = settings.AUTH_STRICT_USER_LOOKUP
+
+    data = None if strict else principal_cache.get(id)
+
+    if data is None:
+        user = await crud_get_user(db=db, id=id)
+        if user is None:
+            return None
+
+        data = UserShow.model_validate(user)
+        if not strict:
+            principal_cache.set(id, data)
+
+    return data
+
+
+async def crud_create_user(user_data: dict, db: AsyncSession) -> User:
     """Create a new user in the database."""
 
-    if crud_get_user(username=user_data.get("username"), db=db):
+    # Each value is matched against its own column, whatever it contains.
+    username = user_login_query(user_data["username"], by_email=False)
+    if await db.scalar(username):
         raise ConflictError("Username already exists.")
 
+    email = user_login_query(user_data["email"], only_active=False, by_email=True)
+    if await db.scalar(email):
+        raise ConflictError("Email already exists.")
+
     new_user = User(**user_data)
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
     return new_user
 
 
-def crud_update_user(id: int, user_data: dict, db: Session) -> User:
+async def crud_update_user(id: int, user_data: dict, db: AsyncSession) -> User:
     """Update an existing user in the database."""
 
-    user = crud_get_user(id=id, db=db)
+    user = await crud_get_user(id=id, db=db)
     if not user:
         raise NotFoundError("User not found.")
 
     for key, value in user_data.items():
         setattr(user, key, value)
 
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    principal_cache.invalidate(id)
+    await db.refresh(user)
     return user
 
 
-def crud_update_user_password(id: int, password_data: dict, db: Session) -> dict:
+async def crud_update_user_password(
+    id: int, password_data: dict, db: AsyncSession
+) -> dict:
     """Update the password of an existing user in the database."""
 
-    user = crud_get_user(id=id, db=db)
+    user = await crud_get_user(id=id, db=db)
     if not user:
         raise NotFoundError("User not found.")
 
-    if user.password != password_data.get("old_password"):
+    old_password = password_data["old_password"]
+    new_password = password_data["new_password"]
+
+    valid, _ = await verify_and_update_password(old_password, cast(str, user.password))
+    if not valid:
         raise PermissionError("Old password is incorrect.")
 
-    if user.password == password_data.get("new_password"):
+    if new_password == old_password:
         raise ValueError("New password must be different from the current password.")
 
-    user.password = password_data.get("new_password")
-    db.commit()
+    user.password = await hash_password_async(new_password)  # type: ignore[assignment]
+    await db.commit()
+    principal_cache.invalidate(id)
     return {"message": "Password updated successfully"}
 
 
-def crud_delete_user(id: int, db: Session) -> dict:
+async def crud_delete_user(id: int, db: AsyncSession) -> dict:
     """Delete a user from the database."""
 
-    user = crud_get_user(id=id, db=db)
+    user = await crud_get_user(id=id, db=db)
     if not user:
         raise NotFoundError("User not found.")
 
-    db.delete(user)
-    db.commit()
+    await db.delete(user)
+    await db.commit()
+    principal_cache.invalidate(id)
     return {"message": "User deleted successfully"}
@@ -1,3 +1,4 @@
+from datetime import datetime, timezone
 from typing import Any
 
 from sqlalchemy.ext.declarative import declared_attr
@@ -8,6 +9,11 @@ class Base(DeclarativeBase):
     id: Any
     __name__: str
 
-    @declared_attr
+    @declared_attr.directive
     def __tablename__(cls) -> str:
         return cls.__name__.lower() + "s"
+
+
+def utc_now() -> datetime:
+    """Current UTC time as a naive datetime, as stored in `DateTime` columns."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
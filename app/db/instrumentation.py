@@ -0,0 +1,141 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_PLACEHOLDERS = re.compile(r"(?:\$\d+|%\(\w+\)s|\?)(?:\s*,\s*(?:\$\d+|%\(\w+\)s|\?))*")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """
+    Normalize a statement so executions differing only in bound values, or
+    in the length of an expanded IN list, share a shape.
+    """
+
+    return _WHITESPACE.sub(" ", _PLACEHOLDERS.sub("?", statement)).strip()
+
+
+class QueryStats:
+    """Statements executed while serving one request."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_time = 0.0
+        self.slow: list[tuple[str, float]] = []
+        self.shapes: Counter[str] = Counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.total_time += seconds
+        self.shapes[statement_shape(statement)] += 1
+
+        if seconds * 1000 >= settings.SQL_SLOW_QUERY_MS:
+            self.slow.append((statement, seconds))
+            logger.warning("Slow query (%.1f ms): %s", seconds * 1000, statement)
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Shapes executed more than `threshold` times, likely N+1 loads."""
+
+        return [(shape, n) for shape, n in self.shapes.most_common() if n > threshold]
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.total_time * 1000:.1f};desc="{self.count} queries"'
+
+
+# Statistics of the request being served, None outside of requests.
+current_query_stats: ContextVar[QueryStats | None] = ContextVar(
+    "current_query_stats", default=None
+)
+
+
+def _before_cursor_execute(
+    conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, *args: Any
+) -> None:
+    if current_query_stats.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(
+    conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, *args: Any
+) -> None:
+    stats = current_query_stats.get()
+    started = conn.info.get("query_started")
+    if stats is not None and started:
+        stats.record(statement, time.perf_counter() - started.pop())
+
+
+def _handle_error(context: Any) -> None:
+    if current_query_stats.get() is None or context.connection is None:
+        return
+
+    started = context.connection.info.get("query_started")
+    if started:
+        started.pop()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Record the statements run on `engine` into `current_query_stats`.
+
+    Statements run outside of a request cost a context variable lookup.
+    """
+
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+class QueryStatsMiddleware:
+    """
+    Collect `QueryStats` for every HTTP request.
+
+    In dev mode the count and time are sent in a Server-Timing header. Shapes
+    repeated more than `SQL_REPEAT_WARN_THRESHOLD` times are logged once the
+    request is done.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start" and settings.IS_DEV:
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", stats.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_query_stats.reset(token)
+
+            for shape, count in stats.repeated(settings.SQL_REPEAT_WARN_THRESHOLD):
+                logger.warning(
+                    "Statement ran %d times in %s %s, possible N+1: %s",
+                    count,
+                    scope["method"],
+                    scope["path"],
+                    shape,
+                )
@@ -0,0 +1,138 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Self
+
+from sqlalchemy import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+
+class PoolStats:
+    """
+    Running checkout statistics of a connection pool.
+
+    The wait of a checkout is the time spent in `Pool.connect()`: queueing for
+    a free connection plus opening a new one when the pool still has room.
+    """
+
+    def __init__(self, window: int = 1000) -> None:
+        self._lock = threading.Lock()
+        self._recent_waits: deque[float] = deque(maxlen=window)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record_checkout(self, wait: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            self._recent_waits.append(wait)
+
+    def record_timeout(self, wait: float) -> None:
+        with self._lock:
+            self.timeouts += 1
+            self.max_wait = max(self.max_wait, wait)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._recent_waits.clear()
+            self.checkouts = 0
+            self.timeouts = 0
+            self.total_wait = 0.0
+            self.max_wait = 0.0
+
+    def snapshot(self) -> dict:
+        """Aggregated wait times, in milliseconds."""
+
+        with self._lock:
+            waits = sorted(self._recent_waits)
+            checkouts = self.checkouts
+            return {
+                "checkouts": checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": (self.total_wait / checkouts * 1000) if checkouts else 0,
+                "p95_wait_ms": percentile(waits, 0.95) * 1000,
+                "max_wait_ms": self.max_wait * 1000,
+            }
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * fraction))
+    return sorted_values[index]
+
+
+class InstrumentedPoolMixin:
+    """Times every checkout of the pool into `self.stats`."""
+
+    stats: PoolStats
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def connect(self) -> Any:
+        start = time.perf_counter()
+        try:
+            connection = super().connect()  # type: ignore[misc]
+        except PoolTimeoutError:
+            self.stats.record_timeout(time.perf_counter() - start)
+            raise
+        self.stats.record_checkout(time.perf_counter() - start)
+        return connection
+
+    def recreate(self) -> Self:
+        pool = super().recreate()  # type: ignore[misc]
+        pool.stats = self.stats
+        return pool
+
+
+class InstrumentedAsyncQueuePool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def forget_inherited_connections(engine: Engine) -> None:
+    """
+    Give a forked child process a fresh pool for `engine`.
+
+    The inherited connections share their sockets with the parent, so they
+    are dropped without being closed, which would end the parent's sessions.
+    """
+
+    engine.dispose(close=False)
+    if isinstance(engine.pool, InstrumentedPoolMixin):
+        engine.pool.stats = PoolStats()
+
+
+def get_pool_stats(pool: Pool) -> dict:
+    """Live occupancy and checkout statistics of a pool."""
+
+    data: dict = {
+        "pool_class": type(pool).__name__,
+        "size": 0,
+        "max_overflow": 0,
+        "checked_in": 0,
+        "checked_out": 0,
+        "overflow": 0,
+        "utilization": 0.0,
+    }
+
+    if isinstance(pool, QueuePool):
+        capacity = pool.size() + max(pool._max_overflow, 0)
+        checked_out = pool.checkedout()
+        data.update(
+            size=pool.size(),
+            max_overflow=pool._max_overflow,
+            checked_in=pool.checkedin(),
+            checked_out=checked_out,
+            overflow=max(pool.overflow(), 0),
+            utilization=checked_out / capacity if capacity else 0.0,
+        )
+
+    stats = getattr(pool, "stats", None)
+    data.update(stats.snapshot() if stats else PoolStats().snapshot())
+    return data
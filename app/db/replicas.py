@@ -0,0 +1,205 @@
+import asyncio
+import itertools
+import math
+import os
+import threading
+import time
+from typing import Callable, Sequence
+
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import Settings, settings
+from app.db.instrumentation import instrument_engine
+from app.db.pool import InstrumentedAsyncQueuePool, forget_inherited_connections
+
+# Holds the time until which a client's reads go to the primary.
+PIN_COOKIE = "read_primary_until"
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# `Session.info` flags read by the caches: replica sessions may lag the
+# primary and must not fill them, pinned clients must not be served from them.
+REPLICA_SESSION = "replica"
+PINNED_SESSION = "pinned"
+
+# Errors meaning a replica could not be reached, rather than a bad query.
+CONNECT_ERRORS = (DBAPIError, OSError, asyncio.TimeoutError)
+
+
+def create_replica_engine(url: str, config: Settings = settings) -> AsyncEngine:
+    engine = create_async_engine(
+        url,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=config.DB_POOL_SIZE,
+        max_overflow=config.DB_MAX_OVERFLOW,
+        pool_timeout=config.DB_POOL_TIMEOUT,
+        pool_recycle=config.DB_POOL_RECYCLE,
+        pool_pre_ping=config.DB_POOL_PRE_PING,
+        connect_args={"timeout": config.DB_REPLICA_CONNECT_TIMEOUT},
+    )
+    instrument_engine(engine.sync_engine)
+    return engine
+
+
+class ReplicaSet:
+    """
+    Read replicas picked round-robin, skipping those marked down.
+
+    A replica that failed to connect is left out for `retry_interval`
+    seconds, then tried again by the next request that reaches it.
+    """
+
+    def __init__(
+        self,
+        engines: Sequence[AsyncEngine],
+        retry_interval: float = 30,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.engines = list(engines)
+        self.retry_interval = retry_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._next = itertools.count()
+        self._down_until: dict[int, float] = {}
+
+    def __len__(self) -> int:
+        return len(self.engines)
+
+    def choose(self) -> AsyncEngine | None:
+        """The next healthy replica, None when there is none."""
+
+        if not self.engines:
+            return None
+
+        now = self._clock()
+        with self._lock:
+            start = next(self._next)
+            for offset in range(len(self.engines)):
+                index = (start + offset) % len(self.engines)
+                if self._down_until.get(index, 0.0) <= now:
+                    return self.engines[index]
+        return None
+
+    def mark_down(self, engine: AsyncEngine) -> None:
+        with self._lock:
+            index = self.engines.index(engine)
+            self._down_until[index] = self._clock() + self.retry_interval
+
+    def healthy(self) -> list[AsyncEngine]:
+        now = self._clock()
+        with self._lock:
+            return [
+                engine
+                for index, engine in enumerate(self.engines)
+                if self._down_until.get(index, 0.0) <= now
+            ]
+
+    async def dispose(self) -> None:
+        for engine in self.engines:
+            await engine.dispose()
+
+    def reset_after_fork(self) -> None:
+        self._lock = threading.Lock()
+        self._down_until.clear()
+        for engine in self.engines:
+            forget_inherited_connections(engine.sync_engine)
+
+
+def create_replica_set(config: Settings) -> ReplicaSet:
+    return ReplicaSet(
+        [create_replica_engine(url, config) for url in config.ASYNC_REPLICA_URLS],
+        retry_interval=config.DB_REPLICA_RETRY_INTERVAL,
+    )
+
+
+def configure_replicas(config: Settings) -> ReplicaSet:
+    """Build the replica set from `config` and use it from now on."""
+
+    global replicas
+
+    replicas = create_replica_set(config)
+    return replicas
+
+
+def _reset_replicas_after_fork() -> None:
+    replicas.reset_after_fork()
+
+
+replicas = create_replica_set(settings)
+os.register_at_fork(after_in_child=_reset_replicas_after_fork)
+
+
+def is_pinned_to_primary(connection: HTTPConnection) -> bool:
+    """Whether the client wrote recently enough that a replica may lag it."""
+
+    try:
+        until = float(connection.cookies.get(PIN_COOKIE, 0))
+    except ValueError:
+        return False
+
+    # Forged far-future values are ignored.
+    now = time.time()
+    return now < until <= now + settings.READ_YOUR_WRITES_WINDOW
+
+
+async def open_replica_session(connection: HTTPConnection) -> AsyncSession | None:
+    """
+    A read-only session on a healthy replica, or None to use the primary.
+
+    The connection is opened right away, so a replica that is down is marked
+    as such and the request falls back to the primary instead of failing.
+    """
+
+    if not replicas or is_pinned_to_primary(connection):
+        return None
+
+    while (engine := replicas.choose()) is not None:
+        db = AsyncSession(
+            bind=engine.execution_options(postgresql_readonly=True),
+            autoflush=False,
+            expire_on_commit=False,
+            info={REPLICA_SESSION: True},
+        )
+        try:
+            await db.connection()
+        except CONNECT_ERRORS:
+            await db.close()
+            replicas.mark_down(engine)
+            continue
+        return db
+
+    return None
+
+
+class ReadYourWritesMiddleware:
+    """
+    Pin a client's reads to the primary for `READ_YOUR_WRITES_WINDOW` seconds
+    after each successful write, by setting a short-lived cookie.
+
+    Does nothing when no replica is configured.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS or not replicas:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_pin(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                window = settings.READ_YOUR_WRITES_WINDOW
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Set-Cookie",
+                    f"{PIN_COOKIE}={time.time() + window:.3f}; "
+                    f"Max-Age={math.ceil(window)}; Path=/; HttpOnly; SameSite=lax",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_with_pin)
@@ -1,20 +1,143 @@
-from typing import Generator
+import asyncio
+import os
+from typing import Any, AsyncGenerator
 
-from sqlalchemy import create_engine
+from sqlalchemy import Engine, create_engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+from starlette.requests import Request
 
-from app.core.config import settings
+from app.core.config import Settings, settings
+from app.db.instrumentation import instrument_engine
+from app.db.pool import InstrumentedAsyncQueuePool, forget_inherited_connections
+from app.db.replicas import PINNED_SESSION, is_pinned_to_primary, open_replica_session
+
+
+def create_primary_engine(config: Settings) -> AsyncEngine:
+    engine = create_async_engine(
+        config.ASYNC_DB_URL,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=config.DB_POOL_SIZE,
+        max_overflow=config.DB_MAX_OVERFLOW,
+        pool_timeout=config.DB_POOL_TIMEOUT,
+        pool_recycle=config.DB_POOL_RECYCLE,
+        pool_pre_ping=config.DB_POOL_PRE_PING,
+    )
+    instrument_engine(engine.sync_engine)
+    return engine
+
+
+def configure_engine(config: Settings) -> AsyncEngine:
+    """
+    Build the engine and session factory from `config` and use them from now
+    on, the lifespan of the app does so on startup. Modules read them through
+    this one, not by importing them.
+    """
+
+    global async_engine, AsyncSessionLocal
+
+    async_engine = create_primary_engine(config)
+    AsyncSessionLocal = create_sessionmaker(async_engine)
+    return async_engine
+
+
+def create_sessionmaker(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(bind=engine, autoflush=True, expire_on_commit=False)
+
+
+# Asynchronous engine, used by the API so database round trips never block
+# the event loop. Creating it opens no connection. Until an app starts, it is
+# built from the process settings, for scripts and the CLI.
+async_engine = create_primary_engine(settings)
+AsyncSessionLocal = create_sessionmaker(async_engine)
 
 DB_URL = settings.DB_URL
-engine = create_engine(DB_URL)
 
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=True, bind=engine)
+def __getattr__(name: str) -> Any:
+    # The synchronous engine, used by alembic migrations and offline scripts,
+    # is only built (and its driver imported) when one of them asks for it.
+    if name in ("engine", "SessionLocal"):
+        sync_engine = create_engine(DB_URL)
+        globals().update(
+            engine=sync_engine,
+            SessionLocal=sessionmaker(
+                autocommit=False, autoflush=True, bind=sync_engine
+            ),
+        )
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+engine: Engine
+SessionLocal: sessionmaker
+
+
+def _reset_pools_after_fork() -> None:
+    # Workers forked from a process that already connected, e.g. a server
+    # preloading the app, must open their own connections.
+    forget_inherited_connections(async_engine.sync_engine)
+    if "engine" in globals():
+        forget_inherited_connections(globals()["engine"])
+
 
+os.register_at_fork(after_in_child=_reset_pools_after_fork)
 
-def get_db() -> Generator:
-    try:
-        db = SessionLocal()
+
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    A session for routes that only read: a read-only one on a replica when
+    any is configured and healthy, else on the primary.
+
+    Clients that wrote within `READ_YOUR_WRITES_WINDOW` read from the primary,
+    bypassing the caches, which may hold entries older than their write.
+    """
+
+    pinned = is_pinned_to_primary(request)
+    db = None if pinned else await open_replica_session(request)
+    if db is None:
+        db = AsyncSessionLocal(info={PINNED_SESSION: pinned})
+
+    async with db:
         yield db
-    finally:
-        db.close()
+
+
+async def warm_pool(size: int) -> None:
+    """
+    Open `size` pooled connections concurrently and check them back in, so
+    the first requests do not pay for connecting.
+
+    `size` is capped to what the pool can hold, more would wait for
+    `DB_POOL_TIMEOUT` and fail.
+    """
+
+    pool = async_engine.pool
+    if isinstance(pool, QueuePool):
+        size = min(size, pool.size() + max(pool._max_overflow, 0))
+
+    async def open_connection() -> Any:
+        connection = await async_engine.connect()
+        await connection.exec_driver_sql("SELECT 1")
+        return connection
+
+    results = await asyncio.gather(
+        *(open_connection() for _ in range(size)), return_exceptions=True
+    )
+    for result in results:
+        if not isinstance(result, BaseException):
+            await result.close()
+
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
@@ -1,34 +1,139 @@
-from fastapi import FastAPI
-
-from .api import router_blog, router_project, router_tag, router_user
-from .core.config import settings
+import asyncio
+import logging
+from contextlib import asynccontextmanager, suppress
+from typing import Any, AsyncIterator
 
-# def create_tables():
-#     from .db.base import Base
-#     from .db.session import engine
+from fastapi import FastAPI
 
-#     from .models import User, Blogpost, Series, Project, Tag, Tech
+from .api import (
+    router_admin,
+    router_auth,
+    router_blog,
+    router_metrics,
+    router_project,
+    router_tag,
+    router_user,
+)
+from .api.blogpost import list_blogposts_page
+from .core import config
+from .core.compression import CompressionMiddleware
+from .core.config import Settings
+from .core.jobs import job_queue
+from .core.jwt import jose_jwt
+from .core.metrics import MetricsMiddleware
+from .core.pagination import DEFAULT_PAGE_SIZE
+from .core.password import load_password_backend, password_hasher
+from .core.responses import FastJSONResponse
+from .core.revocation import prune_revoked_tokens, token_revocations
+from .db import session
+from .db.instrumentation import QueryStatsMiddleware
+from .db.replicas import ReadYourWritesMiddleware, configure_replicas
+from .db.session import configure_engine, warm_pool
 
-#     Base.metadata.create_all(bind=engine)
+logger = logging.getLogger(__name__)
 
 
 def include_router(app: FastAPI) -> None:
+    app.include_router(router_auth, prefix="/api")
     app.include_router(router_blog, prefix="/api")
     app.include_router(router_project, prefix="/api")
     app.include_router(router_user, prefix="/api")
     app.include_router(router_tag, prefix="/api")
+    app.include_router(router_admin, prefix="/api")
+    app.include_router(router_metrics)
+
+
+async def preload() -> None:
+    """
+    Load what the first requests would otherwise wait for: the crypto
+    backends, the token revocation filter and the first listing page.
+    """
+
+    load_password_backend()
+    jose_jwt()
+
+    async with session.AsyncSessionLocal() as db:
+        await token_revocations.sync(db)
+        await list_blogposts_page(
+            db=db, tag="all", limit=DEFAULT_PAGE_SIZE, cursor=None
+        )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    settings: Settings = app.state.settings
+
+    # The pools belong to the running app and follow its settings. Creating
+    # them opens no connection.
+    engine = configure_engine(settings)
+    replicas = configure_replicas(settings)
 
+    # A database that is down at startup should not keep the workers from
+    # starting, requests will fail and recover with it.
+    try:
+        await warm_pool(settings.DB_POOL_WARM or settings.DB_POOL_SIZE)
+        if settings.STARTUP_PRELOAD:
+            await preload()
+    except Exception:
+        logger.warning("Could not warm up the application", exc_info=True)
+
+    pruner = asyncio.create_task(
+        prune_revoked_tokens(
+            session.AsyncSessionLocal, settings.REVOCATION_PRUNE_INTERVAL
+        )
+    )
+
+    try:
+        yield
+    finally:
+        pruner.cancel()
+        with suppress(asyncio.CancelledError):
+            await pruner
+        # Jobs still queued may need the pools, they go first.
+        await job_queue.shutdown(settings.JOBS_SHUTDOWN_TIMEOUT)
+        password_hasher.shutdown()
+        await engine.dispose()
+        await replicas.dispose()
+
+
+def create_app(settings: Settings | None = None) -> FastAPI:
+    """
+    Build the application for `settings`, by default those of the process.
+
+    Its lifespan builds the database engine and the replica pools from them.
+    What requests read at run time, like cache sizes and rate limits, still
+    follows the process settings.
+    """
+
+    if settings is None:
+        settings = config.settings
+
+    app = FastAPI(
+        title=settings.APP_NAME,
+        version=settings.APP_VERSION,
+        default_response_class=FastJSONResponse,
+        lifespan=lifespan,
+    )
+
+    app.state.settings = settings
 
-def start_application() -> FastAPI:
-    app = FastAPI(title=settings.APP_NAME, version=settings.APP_VERSION)
-    # create_tables()
     include_router(app)
-    return app
+    app.add_middleware(ReadYourWritesMiddleware)
+    app.add_middleware(CompressionMiddleware)
+    app.add_middleware(QueryStatsMiddleware)
+    app.add_middleware(MetricsMiddleware)
 
+    @app.get("/")
+    def read_root() -> dict:
+        return {"message": f"Welcome to {app.title} v{app.version}"}
 
-app = start_application()
+    return app
 
 
-@app.get("/")
-def read_root() -> dict:
-    return {"message": f"Welcome to {settings.APP_NAME} v{settings.APP_VERSION}"}
+def __getattr__(name: str) -> Any:
+    # `app.main:app` is built on first access, importing this module for
+    # `create_app` does not build a second application.
+    if name == "app":
+        app = globals()["app"] = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,5 +1,7 @@
 from .association_tables import blogpost_tags, project_techs
 from .blogpost import Blogpost, Series
 from .project import Project
+from .stats import TagStats, TechStats
 from .tag import Tag, Tech
+from .token import RevokedToken
 from .user import User
@@ -1,12 +1,30 @@
-from datetime import datetime, timezone
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Computed,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String
-from sqlalchemy.orm import relationship
-
-from app.db.base import Base
+from app.db.base import Base, utc_now
 
 from .association_tables import blogpost_tags
 
+# Text search configuration of `Blogpost.search_vector`, queries must use the
+# same one to hit the GIN index.
+SEARCH_CONFIG = "english"
+
+# Title matches rank above preview matches, which rank above content ones.
+SEARCH_VECTOR_SQL = " || ".join(
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce({column}, '')), '{weight}')"
+    for column, weight in (("title", "A"), ("preview", "B"), ("content", "C"))
+)
+
 
 class Series(Base):
     __tablename__ = "series"
@@ -29,16 +47,32 @@ class Blogpost(Base):
     banner = Column(String, nullable=True)
     content = Column(String, nullable=False)
     preview = Column(String, nullable=True)
-    created_at = Column(DateTime, default=datetime.now(timezone.utc))
+    excerpt = Column(String, nullable=True)
+    word_count = Column(Integer, nullable=True)
+    reading_time = Column(Integer, nullable=True)
+    content_hash = Column(String(64), nullable=True)
+    created_at = Column(DateTime, default=utc_now)
+    updated_at = Column(DateTime, default=utc_now, onupdate=utc_now, nullable=False)
     series_id = Column(Integer, ForeignKey("series.id"), nullable=True)
     part_number = Column(Integer, nullable=True)
     is_active = Column(Boolean, default=True)
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed(SEARCH_VECTOR_SQL, persisted=True),
+        )
+    )
 
     author = relationship("User", back_populates="blogposts")
     tags = relationship("Tag", secondary=blogpost_tags, back_populates="blogposts")
     project = relationship("Project", back_populates="blogpost")
     series = relationship("Series", back_populates="blogposts")
 
+    __table_args__ = (
+        Index("ix_blogposts_created_at_id", "created_at", "id"),
+        Index("ix_blogposts_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
     def __repr__(self) -> str:
         return (
             f"<Blogpost(id={self.id}, title={self.title}, author_id={self.author_id}, "
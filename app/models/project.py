@@ -1,10 +1,8 @@
-from datetime import datetime, timezone
-
 from sqlalchemy import Boolean, Column, DateTime, Enum, ForeignKey, Integer, String
 from sqlalchemy.orm import relationship
 
 from app.core.enums import Tier
-from app.db.base import Base
+from app.db.base import Base, utc_now
 
 from .association_tables import project_techs
 
@@ -22,8 +20,8 @@ class Project(Base):
     blogpost_id = Column(Integer, ForeignKey("blogposts.id"), nullable=True)
     preview_link = Column(String, nullable=True)
     github_link = Column(String, nullable=True)
-    created_at = Column(DateTime, default=datetime.now(timezone.utc))
-    last_update = Column(DateTime, default=datetime.now(timezone.utc))
+    created_at = Column(DateTime, default=utc_now)
+    last_update = Column(DateTime, default=utc_now)
     tier = Column(Enum(Tier), default=Tier.D, nullable=False)
     is_active = Column(Boolean, default=True)
 
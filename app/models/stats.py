@@ -0,0 +1,140 @@
+from sqlalchemy import Column, ForeignKey, Integer, event, text
+
+from app.db.base import Base
+
+
+class TagStats(Base):
+    """Number of active blogposts per tag, maintained by database triggers."""
+
+    __tablename__ = "tag_stats"
+
+    tag_id = Column(
+        Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True
+    )
+    post_count = Column(Integer, nullable=False, default=0)
+
+
+class TechStats(Base):
+    """Number of active projects per tech, maintained by database triggers."""
+
+    __tablename__ = "tech_stats"
+
+    tech_id = Column(
+        Integer, ForeignKey("techs.id", ondelete="CASCADE"), primary_key=True
+    )
+    project_count = Column(Integer, nullable=False, default=0)
+
+
+# (summary table, key, counter, link table, item table, item key)
+FACETS = (
+    ("tag_stats", "tag_id", "post_count", "blogpost_tags", "blogposts", "blogpost_id"),
+    (
+        "tech_stats",
+        "tech_id",
+        "project_count",
+        "project_techs",
+        "projects",
+        "project_id",
+    ),
+)
+
+
+def facet_triggers_ddl(
+    stats: str, key: str, counter: str, link: str, items: str, item_key: str
+) -> list[str]:
+    """
+    Statement level triggers keeping a summary table in step with its link table.
+
+    Counts change by the delta of each statement, read from its transition
+    tables, so a bulk insert costs one upsert per touched facet instead of a
+    recount. Only active items are counted: linking or unlinking an active
+    item, or toggling `is_active` on a linked one, moves the counters.
+    """
+
+    upsert = (
+        f"ON CONFLICT ({key}) DO UPDATE "
+        f"SET {counter} = {stats}.{counter} + EXCLUDED.{counter};"
+    )
+
+    return [
+        f"""
+        CREATE OR REPLACE FUNCTION {stats}_on_link() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO {stats} ({key}, {counter})
+            SELECT changed.{key},
+                   count(*) * CASE TG_OP WHEN 'INSERT' THEN 1 ELSE -1 END
+            FROM changed JOIN {items} ON {items}.id = changed.{item_key}
+            WHERE {items}.is_active
+            GROUP BY changed.{key}
+            {upsert}
+            RETURN NULL;
+        END $$ LANGUAGE plpgsql;
+        """,
+        f"""
+        CREATE OR REPLACE FUNCTION {stats}_on_item_update() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO {stats} ({key}, {counter})
+            SELECT {link}.{key},
+                   sum(CASE WHEN coalesce(new_rows.is_active, false)
+                       THEN 1 ELSE -1 END)
+            FROM old_rows
+            JOIN new_rows ON new_rows.id = old_rows.id
+            JOIN {link} ON {link}.{item_key} = new_rows.id
+            WHERE coalesce(old_rows.is_active, false)
+                  <> coalesce(new_rows.is_active, false)
+            GROUP BY {link}.{key}
+            {upsert}
+            RETURN NULL;
+        END $$ LANGUAGE plpgsql;
+        """,
+        f"""
+        CREATE OR REPLACE TRIGGER {stats}_link_insert AFTER INSERT ON {link}
+        REFERENCING NEW TABLE AS changed
+        FOR EACH STATEMENT EXECUTE FUNCTION {stats}_on_link();
+        """,
+        f"""
+        CREATE OR REPLACE TRIGGER {stats}_link_delete AFTER DELETE ON {link}
+        REFERENCING OLD TABLE AS changed
+        FOR EACH STATEMENT EXECUTE FUNCTION {stats}_on_link();
+        """,
+        f"""
+        CREATE OR REPLACE TRIGGER {stats}_item_update AFTER UPDATE ON {items}
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION {stats}_on_item_update();
+        """,
+    ]
+
+
+def facet_rebuild_sql(
+    stats: str, key: str, counter: str, link: str, items: str, item_key: str
+) -> list[str]:
+    """Recount a summary table from scratch, to seed it or repair drift."""
+
+    return [
+        f"DELETE FROM {stats};",
+        f"""
+        INSERT INTO {stats} ({key}, {counter})
+        SELECT {link}.{key}, count(*)
+        FROM {link} JOIN {items} ON {items}.id = {link}.{item_key}
+        WHERE {items}.is_active
+        GROUP BY {link}.{key};
+        """,
+    ]
+
+
+@event.listens_for(Base.metadata, "after_create")
+def create_facet_triggers(target: object, connection: object, **kw: object) -> None:
+    # The triggers span several tables, so they are only added once all of
+    # them exist.
+    for facet in FACETS:
+        for statement in facet_triggers_ddl(*facet):
+            connection.execute(text(statement))  # type: ignore[attr-defined]
+
+
+@event.listens_for(Base.metadata, "after_drop")
+def drop_facet_functions(target: object, connection: object, **kw: object) -> None:
+    for stats, *_ in FACETS:
+        for function in ("on_link", "on_item_update"):
+            connection.execute(  # type: ignore[attr-defined]
+                text(f"DROP FUNCTION IF EXISTS {stats}_{function}()")
+            )
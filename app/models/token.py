@@ -0,0 +1,13 @@
+from sqlalchemy import Column, DateTime, String
+
+from app.db.base import Base, utc_now
+
+
+class RevokedToken(Base):
+    """Refresh tokens revoked before their expiry, by `jti` claim."""
+
+    __tablename__ = "revoked_tokens"
+
+    jti = Column(String(32), primary_key=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    revoked_at = Column(DateTime, default=utc_now, nullable=False, index=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, Enum, Integer, String
+from sqlalchemy import Boolean, Column, Enum, Index, Integer, String, func
 from sqlalchemy.orm import relationship
 
 from app.core.enums import UserRoles
@@ -23,6 +23,12 @@ class User(Base):
         "Project", back_populates="author", cascade="all, delete-orphan"
     )
 
+    # Logins are matched case-insensitively, through a single one of these.
+    __table_args__ = (
+        Index("ix_users_username_lower", func.lower(username), unique=True),
+        Index("ix_users_email_lower", func.lower(email), unique=True),
+    )
+
     def verify_password(self, password: str) -> bool:
         """Verify the user's password."""
         return verify_password(password, self.password)
@@ -1,6 +1,22 @@
+from .admin import (
+    CacheStatsShow,
+    JobQueueStatsShow,
+    PasswordHasherStatsShow,
+    PoolStatsShow,
+)
 from .auth import Token
-from .blogpost import BlogpostBase, BlogpostCreate, BlogpostShow, BlogpostUpdate
+from .blogpost import (
+    BlogpostBase,
+    BlogpostCreate,
+    BlogpostImport,
+    BlogpostImportError,
+    BlogpostImportResult,
+    BlogpostListItem,
+    BlogpostSearchResult,
+    BlogpostShow,
+    BlogpostUpdate,
+)
 from .project import ProjectBase, ProjectCreate, ProjectShow, ProjectUpdate
-from .response import ResponseBase
-from .tag import TagBase, TagCreate, TagShow, TagUpdate
+from .response import PageBase, ResponseBase
+from .tag import FacetCount, TagBase, TagCreate, TagShow, TagStatsShow, TagUpdate
 from .user import UserBase, UserCreate, UserPasswordUpdate, UserShow, UserUpdate
@@ -0,0 +1,61 @@
+from pydantic import BaseModel
+
+
+class PoolStatsShow(BaseModel):
+    """Schema for showing connection pool statistics"""
+
+    pool_class: str
+    size: int
+    max_overflow: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    utilization: float
+    checkouts: int
+    timeouts: int
+    avg_wait_ms: float
+    p95_wait_ms: float
+    max_wait_ms: float
+
+
+class CacheStatsShow(BaseModel):
+    """Schema for showing in-process cache statistics"""
+
+    size: int
+    maxsize: int
+    ttl: float
+    hits: int
+    misses: int
+    hit_ratio: float
+    evictions: int
+    expirations: int
+    invalidations: int
+
+
+class PasswordHasherStatsShow(BaseModel):
+    """Schema for showing password hasher queue statistics"""
+
+    workers: int
+    max_pending: int
+    pending: int
+    max_seen_pending: int
+    completed: int
+    rejected: int
+    avg_wait_ms: float
+    p95_wait_ms: float
+    avg_run_ms: float
+    rounds: int
+
+
+class JobQueueStatsShow(BaseModel):
+    """Schema for showing background job queue statistics"""
+
+    workers: int
+    maxsize: int
+    queued: int
+    enqueued: int
+    deduplicated: int
+    rejected: int
+    completed: int
+    retried: int
+    failed: int
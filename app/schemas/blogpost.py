@@ -3,7 +3,7 @@ from typing import Optional
 
 from pydantic import BaseModel, ConfigDict
 
-from .tag import TagBase
+from .tag import TagBase, TagCreate
 
 
 class BlogpostBase(BaseModel):
@@ -14,8 +14,13 @@ class BlogpostBase(BaseModel):
     banner: str
     content: str
     preview: str
+    excerpt: Optional[str] = None
+    word_count: Optional[int] = None
+    reading_time: Optional[int] = None
+    content_hash: Optional[str] = None
     author_id: int
     created_at: datetime
+    updated_at: datetime
     series_id: Optional[int]
     part_number: Optional[int]
     is_active: bool
@@ -29,6 +34,36 @@ class BlogpostShow(BlogpostBase):
     pass
 
 
+class BlogpostListItem(BaseModel):
+    """Schema for blogpost listings, without the post content."""
+
+    id: int
+    title: str
+    slug: str
+    tags: list[TagBase] = []
+    banner: Optional[str]
+    preview: Optional[str]
+    excerpt: Optional[str] = None
+    word_count: Optional[int] = None
+    reading_time: Optional[int] = None
+    content_hash: Optional[str] = None
+    author_id: int
+    created_at: datetime
+    updated_at: datetime
+    series_id: Optional[int]
+    part_number: Optional[int]
+    is_active: bool
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class BlogpostSearchResult(BlogpostListItem):
+    """Schema for full-text search hits, with the highlighted snippet."""
+
+    rank: float
+    snippet: str
+
+
 class BlogpostCreate(BaseModel):
     """Schema for creating a new blogpost."""
 
@@ -37,12 +72,35 @@ class BlogpostCreate(BaseModel):
     tags: list[TagBase] = []
     banner: str
     content: str
-    preview: str
+    preview: Optional[str] = None
     series_id: Optional[int] = None
     part_number: Optional[int] = None
     is_active: bool = True
 
 
+class BlogpostImport(BlogpostCreate):
+    """Schema for a row of a bulk import, tags may be given by name."""
+
+    tags: list[str | TagCreate] = []  # type: ignore[assignment]
+    created_at: Optional[datetime] = None
+
+
+class BlogpostImportError(BaseModel):
+    """A row of a bulk import that was not inserted."""
+
+    line: int
+    slug: Optional[str] = None
+    error: str
+
+
+class BlogpostImportResult(BaseModel):
+    """Schema for the outcome of a bulk import."""
+
+    imported: int = 0
+    failed: list[BlogpostImportError] = []
+    failed_count: int = 0
+
+
 class BlogpostUpdate(BaseModel):
     """Schema for updating an existing blogpost."""
 
@@ -12,3 +12,10 @@ class ResponseBase(BaseModel, Generic[T]):
     message: Optional[str] = None
     data: Optional[T] = None
     error: Optional[str] = None
+
+
+class PageBase(BaseModel, Generic[T]):
+    """Base schema for keyset-paginated collections"""
+
+    items: list[T] = []
+    next_cursor: Optional[str] = None
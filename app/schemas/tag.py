@@ -6,7 +6,8 @@ from pydantic import BaseModel, ConfigDict
 class TagBase(BaseModel):
     id: Optional[int]
     name: str
-    icon: str
+    # Tags imported by name have no icon.
+    icon: Optional[str] = None
     description: Optional[str] = None
 
     model_config = ConfigDict(from_attributes=True)
@@ -32,3 +33,19 @@ class TagUpdate(BaseModel):
     name: Optional[str] = None
     icon: Optional[str] = None
     description: Optional[str] = None
+
+
+class FacetCount(BaseModel):
+    """A tag or tech with the number of active items using it."""
+
+    id: int
+    name: str
+    icon: Optional[str] = None
+    count: int
+
+
+class TagStatsShow(BaseModel):
+    """Schema for the tag and tech facet counts."""
+
+    tags: list[FacetCount] = []
+    techs: list[FacetCount] = []
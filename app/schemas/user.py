@@ -1,9 +1,17 @@
 from typing import Annotated, Optional
 
-from pydantic import BaseModel, ConfigDict, constr, model_validator
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    StringConstraints,
+    constr,
+    model_validator,
+)
 
 from app.core.enums import UserRoles
-from app.core.password import hash_password
+
+# Logins containing "@" are looked up as emails.
+Username = Annotated[str, StringConstraints(min_length=1, pattern=r"^[^@]+$")]
 
 
 class UserBase(BaseModel):
@@ -30,7 +38,7 @@ class UserShow(BaseModel):
 class UserCreate(BaseModel):
     """Schema for creating a new user"""
 
-    username: str
+    username: Username
     email: str
     password: Annotated[
         str,
@@ -47,15 +55,13 @@ class UserCreate(BaseModel):
     def validate_passwords(self) -> "UserCreate":
         if self.password != self.password2:
             raise ValueError("Passwords do not match")
-
-        self.password = hash_password(self.password)
         return self
 
 
 class UserUpdate(BaseModel):
     """Schema for updating an existing user"""
 
-    username: Optional[str] = None
+    username: Optional[Username] = None
     email: Optional[str] = None
     role: Optional[UserRoles] = None
     is_active: Optional[bool] = None
@@ -0,0 +1,266 @@
+"""
+Throughput and latency of every router, against a seeded database.
+
+    python -m benchmarks.bench_endpoints [--seed-db] [--mode inprocess uvicorn]
+        [--concurrency 1 10 50] [--requests 500]
+        [--save benchmarks/baselines/endpoints.json]
+        [--compare benchmarks/baselines/endpoints.json]
+
+The database is `bench_<DB_NAME>` unless --db-name is given, it is created
+and seeded (10k posts, 200 tags, 50 users by default) with --seed-db.
+In-process runs call the ASGI app directly, uvicorn runs go over HTTP to a
+`python -m app serve` server started for the run. Comparing against a saved
+baseline exits with status 1 when a p95 latency or a throughput moved past
+--tolerance.
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, AsyncIterator
+
+REGRESSION_METRICS = (("p95_ms", 1), ("rps", -1))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_endpoints")
+    parser.add_argument("--db-name", default=None)
+    parser.add_argument("--seed-db", action="store_true")
+    parser.add_argument("--posts", type=int, default=10_000)
+    parser.add_argument("--tags", type=int, default=200)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument(
+        "--mode", nargs="+", choices=("inprocess", "uvicorn"), default=["inprocess"]
+    )
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument(
+        "--scenario", nargs="*", default=None, help="Only run these scenarios"
+    )
+    parser.add_argument("--port", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--save", type=Path, default=None)
+    parser.add_argument("--compare", type=Path, default=None)
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    return parser
+
+
+def configure_environment(db_name: str | None) -> dict[str, str]:
+    """
+    Point the settings at the benchmark database, before `app` is imported.
+
+    Rate limits are disabled, they would reject most of the load.
+    """
+
+    os.environ.setdefault("DB_NAME", "blog")
+    os.environ["DB_NAME"] = db_name or f"bench_{os.environ['DB_NAME']}"
+    os.environ["RATE_LIMIT_ENABLED"] = "false"
+    return dict(os.environ)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@asynccontextmanager
+async def inprocess_client() -> AsyncIterator[Any]:
+    import httpx
+
+    from app.main import create_app
+
+    app = create_app()
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with app.router.lifespan_context(app), httpx.AsyncClient(
+        transport=transport, base_url="http://benchmark"
+    ) as client:
+        yield client
+
+
+@asynccontextmanager
+async def uvicorn_client(
+    env: dict[str, str], port: int | None, workers: int, connections: int
+) -> AsyncIterator[Any]:
+    import httpx
+
+    if importlib.util.find_spec("uvicorn") is None:
+        raise RuntimeError("The uvicorn mode requires the `uvicorn` package.")
+
+    port = port or free_port()
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "app",
+            "serve",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            "--log-level",
+            "warning",
+        ],
+        env=env,
+    )
+
+    limits = httpx.Limits(max_connections=connections)
+    try:
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{port}", limits=limits
+        ) as client:
+            await wait_until_ready(client, server)
+            yield client
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+async def wait_until_ready(
+    client: Any, server: subprocess.Popen, timeout: float = 30
+) -> None:
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError("The uvicorn server exited during startup.")
+        try:
+            await client.get("/")
+            return
+        except httpx.TransportError:
+            await asyncio.sleep(0.1)
+    raise RuntimeError("The uvicorn server did not start in time.")
+
+
+async def run_mode(mode: str, args: argparse.Namespace, env: dict[str, str]) -> dict:
+    from app.db.session import engine
+    from benchmarks.dataset import load_dataset
+    from benchmarks.load import build_scenarios, login, run_scenario
+
+    dataset = load_dataset(engine)
+    if not dataset.post_ids:
+        raise RuntimeError("The benchmark database is empty, run with --seed-db.")
+
+    if mode == "inprocess":
+        client_context = inprocess_client()
+    else:
+        client_context = uvicorn_client(
+            env, args.port, args.workers, max(args.concurrency)
+        )
+
+    results = {}
+    async with client_context as client:
+        session = await login(client, dataset)
+        scenarios = build_scenarios(dataset, session)
+
+        for scenario in scenarios:
+            if args.scenario and scenario.name not in args.scenario:
+                continue
+
+            for concurrency in args.concurrency:
+                key = f"{mode} | {scenario.name} | c{concurrency}"
+                results[key] = await run_scenario(
+                    client, scenario, concurrency, args.requests
+                )
+                print_result(key, results[key])
+
+    return results
+
+
+def print_result(key: str, result: dict) -> None:
+    print(
+        f"{key:<44} {result['rps']:>9.1f} rps  p50 {result['p50_ms']:>7.2f}  "
+        f"p95 {result['p95_ms']:>7.2f}  p99 {result['p99_ms']:>7.2f} ms  "
+        f"errors {result['errors']}"
+    )
+
+
+def compare(baseline: dict, current: dict, tolerance: float) -> list[str]:
+    """Describe the results that regressed past `tolerance` against `baseline`."""
+
+    regressions = []
+    for key, result in current["results"].items():
+        base = baseline["results"].get(key)
+        if base is None:
+            continue
+
+        for metric, direction in REGRESSION_METRICS:
+            before, after = base[metric], result[metric]
+            if not before:
+                continue
+
+            change = (after - before) / before
+            print(
+                f"{key:<44} {metric:>6} {before:>9.2f} -> {after:>9.2f} {change:+.1%}"
+            )
+            if change * direction > tolerance:
+                regressions.append(f"{key} {metric} {change:+.1%}")
+
+    return regressions
+
+
+def main() -> None:
+    parser = build_parser()
+    args = parser.parse_args()
+    env = configure_environment(args.db_name)
+
+    from app.core.config import settings
+
+    if args.seed_db and not settings.DB_NAME.startswith("bench"):
+        parser.error("--seed-db recreates the schema, use a bench* database")
+
+    if args.seed_db:
+        from sqlalchemy import create_engine
+
+        from benchmarks.dataset import ensure_database, seed_dataset
+
+        ensure_database(settings.DB_URL)
+        seed_engine = create_engine(settings.DB_URL)
+        started = time.perf_counter()
+        seed_dataset(seed_engine, posts=args.posts, tags=args.tags, users=args.users)
+        seed_engine.dispose()
+        print(f"Seeded {settings.DB_NAME} in {time.perf_counter() - started:.1f}s")
+
+    results: dict = {}
+    for mode in args.mode:
+        results.update(asyncio.run(run_mode(mode, args, env)))
+
+    report = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "app_version": settings.APP_VERSION,
+            "python": platform.python_version(),
+            "requests": args.requests,
+        },
+        "results": results,
+    }
+
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        args.save.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Saved baseline to {args.save}")
+
+    if args.compare:
+        regressions = compare(
+            json.loads(args.compare.read_text()), report, args.tolerance
+        )
+        if regressions:
+            print("Regressions:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Cost of rendering a large blogpost listing: FastAPI validating the returned
+dict against the route's `response_model` and encoding it with the stdlib,
+against `envelope` serializing the cached schema instances once. The default
+response class alone is measured too, for routes still returning dicts.
+
+    python -m benchmarks.bench_serialization [--items 1000] [--number 50]
+"""
+
+import argparse
+import asyncio
+import timeit
+from datetime import datetime, timedelta
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.core.responses import FastJSONResponse, envelope
+from app.schemas import BlogpostListItem, PageBase, ResponseBase
+
+
+def make_items(count: int) -> list[BlogpostListItem]:
+    now = datetime(2024, 1, 1)
+    return [
+        BlogpostListItem(
+            id=i,
+            title=f"Blogpost {i}",
+            slug=f"blogpost_{i}",
+            tags=[{"id": i % 20, "name": f"tag{i % 20}", "icon": "tag"}],
+            banner=f"https://example.com/banners/{i}.png",
+            preview="A short preview of the post",
+            excerpt="Some words from the beginning of the post " * 6,
+            word_count=1200 + i,
+            reading_time=6,
+            content_hash="0" * 64,
+            author_id=1,
+            created_at=now - timedelta(minutes=i),
+            updated_at=now,
+            series_id=None,
+            part_number=None,
+            is_active=True,
+        )
+        for i in range(count)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--number", type=int, default=50)
+    args = parser.parse_args()
+
+    data = {"items": make_items(args.items), "next_cursor": "cursor"}
+    field = create_model_field(
+        "Response", ResponseBase[PageBase[BlogpostListItem]], mode="serialization"
+    )
+
+    def validated(response_class: type[JSONResponse] = JSONResponse) -> bytes:
+        content = asyncio.run(
+            serialize_response(
+                field=field, response_content={"success": True, "data": data}
+            )
+        )
+        return response_class(content).body
+
+    def single_pass() -> bytes:
+        return envelope(data).body
+
+    results = {
+        "validated (before)": timeit.timeit(validated, number=args.number),
+        "validated + orjson": timeit.timeit(
+            lambda: validated(FastJSONResponse), number=args.number
+        ),
+        "envelope (after)": timeit.timeit(single_pass, number=args.number),
+    }
+
+    for name, total in results.items():
+        print(f"{name:>18}: {total / args.number * 1e3:8.2f} ms/response")
+
+    before, _, after = results.values()
+    print(f"{'speedup':>18}: {before / after:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
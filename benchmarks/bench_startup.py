@@ -0,0 +1,82 @@
+"""
+Cold start of a worker: importing the app module, building the application
+and, with --lifespan, running its startup against the configured database.
+Each run is a fresh interpreter.
+
+    python -m benchmarks.bench_startup [--runs 5] [--lifespan] [--top 15]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+MEASURE = """
+import asyncio, json, time
+started = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+application = app.main.create_app()
+built = time.perf_counter()
+timings = {"import": imported - started, "create_app": built - imported}
+if LIFESPAN:
+    async def startup():
+        async with application.router.lifespan_context(application):
+            return time.perf_counter()
+    timings["lifespan"] = asyncio.run(startup()) - built
+print(json.dumps(timings))
+"""
+
+
+def measure(lifespan: bool) -> dict[str, float]:
+    code = MEASURE.replace("LIFESPAN", str(lifespan))
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def slowest_imports(top: int) -> list[tuple[int, str]]:
+    """Modules with the largest cumulative import time, in microseconds."""
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        modules.append((int(cumulative), name.rstrip()))
+
+    return sorted(modules, reverse=True)[:top]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--lifespan", action="store_true")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    runs = [measure(args.lifespan) for _ in range(args.runs)]
+    for phase in runs[0]:
+        values = [run[phase] * 1000 for run in runs]
+        print(
+            f"{phase:>12}: median {statistics.median(values):8.1f} ms  "
+            f"min {min(values):8.1f} ms"
+        )
+
+    if args.top:
+        print("\nSlowest imports of app.main (cumulative):")
+        for cumulative, name in slowest_imports(args.top):
+            print(f"{cumulative / 1000:10.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Seeded dataset for the endpoint benchmarks.
+
+The same seed always produces the same posts, tags and users, so runs on
+different revisions are comparable.
+"""
+
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from sqlalchemy import Engine, create_engine, insert, text
+from sqlalchemy.engine import make_url
+
+from app.core.content import analyze_content
+from app.core.enums import UserRoles
+from app.core.password import hash_password
+from app.db.base import Base
+from app.models import Blogpost, Tag, User, blogpost_tags
+
+PASSWORD = "BenchPassword123!"
+
+WORDS = (
+    "api async cache database index query latency python postgres request "
+    "response server client token session pool worker thread event loop "
+    "benchmark profile memory throughput schema model router endpoint json "
+    "the a of to and in is that for it with as on be at by this from or an"
+).split()
+
+
+@dataclass
+class Dataset:
+    post_ids: list[int] = field(default_factory=list)
+    slugs: list[str] = field(default_factory=list)
+    tags: list[str] = field(default_factory=list)
+    user_ids: list[int] = field(default_factory=list)
+    admin: str = "user0"
+    password: str = PASSWORD
+
+
+def ensure_database(url: str) -> None:
+    """Create the database of `url` when it does not exist yet."""
+
+    url_obj = make_url(url)
+    server = create_engine(
+        url_obj.set(database="postgres"), isolation_level="AUTOCOMMIT"
+    )
+    try:
+        with server.connect() as conn:
+            exists = conn.scalar(
+                text("SELECT 1 FROM pg_database WHERE datname = :name"),
+                {"name": url_obj.database},
+            )
+            if not exists:
+                conn.execute(
+                    text(
+                        f'CREATE DATABASE "{url_obj.database}" '
+                        "ENCODING 'UTF8' TEMPLATE template0"
+                    )
+                )
+    finally:
+        server.dispose()
+
+
+def make_content(rng: random.Random, paragraphs: int) -> str:
+    return "\n\n".join(
+        " ".join(rng.choices(WORDS, k=rng.randint(60, 160))).capitalize() + "."
+        for _ in range(paragraphs)
+    )
+
+
+def seed_dataset(
+    engine: Engine,
+    posts: int = 10_000,
+    tags: int = 200,
+    users: int = 50,
+    seed: int = 0,
+    batch_size: int = 1000,
+) -> Dataset:
+    """
+    Recreate the schema on `engine` and fill it.
+
+    The first user is an admin, every user shares the `PASSWORD`. Posts get
+    one to four tags and are spread over the authors.
+    """
+
+    rng = random.Random(seed)
+    dataset = Dataset()
+
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    hashed = hash_password(PASSWORD)
+    base_date = datetime(2020, 1, 1)
+
+    with engine.begin() as conn:
+        dataset.user_ids = list(
+            conn.scalars(
+                insert(User.__table__).returning(User.id),
+                [
+                    {
+                        "username": f"user{i}",
+                        "email": f"user{i}@example.com",
+                        "password": hashed,
+                        "role": UserRoles.ADMIN if i == 0 else UserRoles.USER,
+                        "is_active": True,
+                    }
+                    for i in range(users)
+                ],
+            )
+        )
+
+        dataset.tags = [f"tag{i}" for i in range(tags)]
+        tag_ids = list(
+            conn.scalars(
+                insert(Tag.__table__).returning(Tag.id),
+                [{"name": name, "icon": f"{name}.svg"} for name in dataset.tags],
+            )
+        )
+
+        for start in range(0, posts, batch_size):
+            rows = []
+            for i in range(start, min(start + batch_size, posts)):
+                content = make_content(rng, rng.randint(3, 12))
+                created_at = base_date + timedelta(minutes=17 * i)
+                rows.append(
+                    {
+                        "title": f"Benchmark post {i}",
+                        "slug": f"benchmark_post_{i}",
+                        "author_id": rng.choice(dataset.user_ids),
+                        "banner": f"https://example.com/banners/{i}.png",
+                        "content": content,
+                        "preview": content[:200],
+                        "created_at": created_at,
+                        "updated_at": created_at,
+                        "is_active": rng.random() > 0.05,
+                        **analyze_content(content),
+                    }
+                )
+
+            ids = list(
+                conn.scalars(insert(Blogpost.__table__).returning(Blogpost.id), rows)
+            )
+            links = [
+                {"blogpost_id": id, "tag_id": tag_id}
+                for id in ids
+                for tag_id in rng.sample(
+                    tag_ids, k=min(len(tag_ids), rng.randint(1, 4))
+                )
+            ]
+            if links:
+                conn.execute(insert(blogpost_tags), links)
+
+            dataset.post_ids.extend(ids)
+            dataset.slugs.extend(row["slug"] for row in rows)
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("ANALYZE"))
+
+    return dataset
+
+
+def load_dataset(engine: Engine) -> Dataset:
+    """Describe an already seeded database, to rerun without seeding."""
+
+    with engine.connect() as conn:
+        return Dataset(
+            post_ids=list(conn.scalars(text("SELECT id FROM blogposts ORDER BY id"))),
+            slugs=list(conn.scalars(text("SELECT slug FROM blogposts ORDER BY id"))),
+            tags=list(conn.scalars(text("SELECT name FROM tags ORDER BY id"))),
+            user_ids=list(conn.scalars(text("SELECT id FROM users ORDER BY id"))),
+        )
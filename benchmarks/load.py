@@ -0,0 +1,172 @@
+"""
+Closed-loop load generation: a fixed number of clients each send their next
+request as soon as the previous one is answered.
+"""
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+import httpx
+
+from app.db.pool import percentile
+
+from .dataset import Dataset
+
+
+@dataclass
+class Scenario:
+    name: str
+    method: str
+    path: Callable[[random.Random], str]
+    # Extra `httpx` request arguments, e.g. headers or form data.
+    options: Callable[[], dict[str, Any]] = dict
+    # Caps the requests of slow scenarios such as password checks.
+    max_requests: int | None = None
+
+
+@dataclass
+class Session:
+    """Credentials obtained once, before the scenarios run."""
+
+    access_token: str = ""
+    refresh_token: str = ""
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+async def login(client: httpx.AsyncClient, dataset: Dataset) -> Session:
+    response = await client.post(
+        "/api/login", data={"username": dataset.admin, "password": dataset.password}
+    )
+    response.raise_for_status()
+
+    session = Session(
+        access_token=response.json()["data"]["access_token"],
+        refresh_token=response.cookies["refresh_token"],
+    )
+    session.headers = {"Authorization": f"Bearer {session.access_token}"}
+    return session
+
+
+def build_scenarios(dataset: Dataset, session: Session) -> list[Scenario]:
+    """One or more scenarios for every router in app/api."""
+
+    def auth() -> dict[str, Any]:
+        return {"headers": session.headers}
+
+    def refresh() -> dict[str, Any]:
+        return {
+            "headers": {
+                **session.headers,
+                "Cookie": f"refresh_token={session.refresh_token}",
+            }
+        }
+
+    def credentials() -> dict[str, Any]:
+        return {"data": {"username": dataset.admin, "password": dataset.password}}
+
+    def fixed(path: str) -> Callable[[random.Random], str]:
+        return lambda rng: path
+
+    return [
+        Scenario("blogposts", "GET", fixed("/api/get/blogposts")),
+        Scenario(
+            "blogposts by tag",
+            "GET",
+            lambda rng: f"/api/get/blogposts/{rng.choice(dataset.tags)}",
+        ),
+        Scenario(
+            "blogpost by id",
+            "GET",
+            lambda rng: f"/api/get/blogpost/{rng.choice(dataset.post_ids)}",
+        ),
+        Scenario(
+            "blogpost by slug",
+            "GET",
+            lambda rng: f"/api/get/blogpost/{rng.choice(dataset.slugs)}",
+        ),
+        Scenario(
+            "search",
+            "GET",
+            lambda rng: f"/api/search/blogposts?q={rng.choice(['cache', 'query'])}",
+        ),
+        Scenario("tags", "GET", fixed("/api/get/tags")),
+        Scenario("tag stats", "GET", fixed("/api/get/tags/stats")),
+        Scenario("techs", "GET", fixed("/api/get/techs")),
+        Scenario("projects", "GET", fixed("/api/get/projects")),
+        Scenario(
+            "user", "GET", lambda rng: f"/api/get/user/{rng.choice(dataset.user_ids)}"
+        ),
+        Scenario("refresh", "POST", fixed("/api/refresh"), options=refresh),
+        Scenario(
+            "login",
+            "POST",
+            fixed("/api/login"),
+            options=credentials,
+            max_requests=50,
+        ),
+        Scenario("admin pool", "GET", fixed("/api/admin/db/pool"), options=auth),
+        Scenario("admin caches", "GET", fixed("/api/admin/caches"), options=auth),
+        Scenario("metrics", "GET", fixed("/metrics")),
+    ]
+
+
+def summarize(latencies: list[float], elapsed: float, errors: int) -> dict:
+    """Throughput and latency percentiles, in milliseconds."""
+
+    ordered = sorted(latencies)
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "rps": len(ordered) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(ordered, 0.50) * 1000,
+        "p95_ms": percentile(ordered, 0.95) * 1000,
+        "p99_ms": percentile(ordered, 0.99) * 1000,
+    }
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    concurrency: int,
+    requests: int,
+    seed: int = 0,
+) -> dict:
+    """Send `requests` requests from `concurrency` clients, after a warmup."""
+
+    if scenario.max_requests is not None:
+        requests = min(requests, scenario.max_requests)
+
+    latencies: list[float] = []
+    errors = 0
+
+    async def client_loop(index: int, jobs: Any, record: bool) -> None:
+        nonlocal errors
+        rng = random.Random(seed * 1000 + index)
+
+        for _ in jobs:
+            start = time.perf_counter()
+            response = await client.request(
+                scenario.method, scenario.path(rng), **scenario.options()
+            )
+            latency = time.perf_counter() - start
+
+            if record:
+                latencies.append(latency)
+                errors += response.status_code >= 400
+
+    async def run(count: int, record: bool) -> float:
+        # A shared iterator hands out the next request to whichever client
+        # is free.
+        jobs = iter(range(count))
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(client_loop(i, jobs, record) for i in range(concurrency))
+        )
+        return time.perf_counter() - start
+
+    await run(min(requests, max(concurrency, requests // 10)), record=False)
+    elapsed = await run(requests, record=True)
+    return summarize(latencies, elapsed, errors)
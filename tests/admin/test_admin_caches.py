@@ -0,0 +1,31 @@
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from app.models import Blogpost
+from tests.utils.schemas import UserExtended
+
+
+def test_get_cache_stats_admin(
+    client: TestClient, test_admin: UserExtended, test_blogposts: list[Blogpost]
+) -> None:
+    """Test reading cache counters as an admin."""
+
+    client.get(f"/api/get/blogpost/{test_blogposts[0].id}")
+    client.get(f"/api/get/blogpost/{test_blogposts[0].id}")
+
+    client.headers.update({"Authorization": f"Bearer {test_admin.access_token}"})
+    response = client.get("/api/admin/caches")
+
+    assert response.status_code == status.HTTP_200_OK
+    stats = response.json()["data"]["blogposts"]
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_get_cache_stats_forbidden(client: TestClient, test_user: UserExtended) -> None:
+    """Test that regular users cannot read cache counters."""
+
+    client.headers.update({"Authorization": f"Bearer {test_user.access_token}"})
+    response = client.get("/api/admin/caches")
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -0,0 +1,70 @@
+import asyncio
+
+from anyio.from_thread import BlockingPortal
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config import settings
+from app.db.pool import InstrumentedAsyncQueuePool, get_pool_stats
+from app.db.session import async_engine
+from tests.utils.schemas import UserExtended
+
+
+def test_engine_uses_pool_settings() -> None:
+    """Test that the API engine is sized from the settings."""
+
+    stats = get_pool_stats(async_engine.pool)
+    assert stats["pool_class"] == "InstrumentedAsyncQueuePool"
+    assert stats["size"] == settings.DB_POOL_SIZE
+    assert stats["max_overflow"] == settings.DB_MAX_OVERFLOW
+    assert async_engine.pool._pre_ping == settings.DB_POOL_PRE_PING
+
+
+def test_pool_records_checkout_waits(portal: BlockingPortal) -> None:
+    """Test that checkouts waiting on a full pool are measured."""
+
+    engine = create_async_engine(
+        settings.ASYNC_TEST_DB_URL,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=1,
+        max_overflow=0,
+    )
+
+    async def hold_connection() -> None:
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT pg_sleep(0.1)"))
+
+    async def run() -> dict:
+        await asyncio.gather(hold_connection(), hold_connection())
+        stats = get_pool_stats(engine.pool)
+        await engine.dispose()
+        return stats
+
+    stats = portal.call(run)
+
+    assert stats["checkouts"] == 2
+    assert stats["checked_out"] == 0
+    assert stats["max_wait_ms"] >= 50, "Second checkout should wait for the first"
+
+
+def test_get_pool_stats_admin(client: TestClient, test_admin: UserExtended) -> None:
+    """Test reading pool statistics as an admin."""
+
+    client.headers.update({"Authorization": f"Bearer {test_admin.access_token}"})
+    response = client.get("/api/admin/db/pool")
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()["data"]
+    assert data["size"] == settings.DB_POOL_SIZE
+    assert 0 <= data["utilization"] <= 1
+
+
+def test_get_pool_stats_forbidden(client: TestClient, test_user: UserExtended) -> None:
+    """Test that regular users cannot read pool statistics."""
+
+    client.headers.update({"Authorization": f"Bearer {test_user.access_token}"})
+    response = client.get("/api/admin/db/pool")
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
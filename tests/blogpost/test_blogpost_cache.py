@@ -0,0 +1,103 @@
+from functools import partial
+from typing import cast
+
+from anyio.from_thread import BlockingPortal
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud import crud_delete_blogpost, crud_update_blogpost
+from app.crud.blogpost import blogpost_cache
+from app.models import Blogpost
+from tests.conftest import async_engine
+from tests.utils.queries import count_queries
+
+
+def test_get_blogpost_is_served_from_cache(
+    client: TestClient, test_blogposts: list[Blogpost]
+) -> None:
+    """Test that repeated reads of a blogpost skip the database."""
+
+    blogpost = test_blogposts[0]
+    response = client.get(f"/api/get/blogpost/{blogpost.id}")
+    assert response.status_code == status.HTTP_200_OK
+
+    with count_queries(async_engine.sync_engine) as counter:
+        by_id = client.get(f"/api/get/blogpost/{blogpost.id}")
+        by_slug = client.get(f"/api/get/blogpost/{blogpost.slug}")
+
+    assert counter.count == 0, counter.statements
+    assert by_id.json() == response.json()
+    assert by_slug.json() == response.json(), "Slug entry is filled with the id one"
+    assert blogpost_cache.stats()["hits"] == 2
+
+
+def test_get_blogposts_is_served_from_cache(
+    client: TestClient, test_blogposts: list[Blogpost]
+) -> None:
+    """Test that repeated listing pages skip the database."""
+
+    response = client.get("/api/get/blogposts/python", params={"limit": 5})
+
+    with count_queries(async_engine.sync_engine) as counter:
+        cached = client.get("/api/get/blogposts/python", params={"limit": 5})
+
+    assert counter.count == 0, counter.statements
+    assert cached.json() == response.json()
+
+
+def test_update_blogpost_invalidates_cache(
+    client: TestClient,
+    db_session: AsyncSession,
+    portal: BlockingPortal,
+    test_blogposts: list[Blogpost],
+) -> None:
+    """Test that an update drops the post and the listings it appears in."""
+
+    blogpost = test_blogposts[0]
+    untagged = test_blogposts[1]
+    client.get(f"/api/get/blogpost/{blogpost.id}")
+    client.get(f"/api/get/blogpost/{untagged.id}")
+    client.get("/api/get/blogposts/python")
+    client.get("/api/get/blogposts/sql")
+
+    portal.call(
+        partial(
+            crud_update_blogpost,
+            id=cast(int, blogpost.id),
+            blogpost_data={"title": "Updated title", "slug": "updated_slug"},
+            db=db_session,
+        )
+    )
+
+    assert ("blogpost", "id", blogpost.id) not in blogpost_cache
+    assert ("blogpost", "slug", blogpost.slug) not in blogpost_cache
+    assert ("blogpost", "id", untagged.id) in blogpost_cache
+
+    response = client.get("/api/get/blogpost/updated_slug")
+    assert response.json()["data"]["title"] == "Updated title"
+
+    response = client.get("/api/get/blogposts/python")
+    assert response.json()["data"]["items"][0]["title"] == "Updated title"
+
+
+def test_delete_blogpost_invalidates_cache(
+    client: TestClient,
+    db_session: AsyncSession,
+    portal: BlockingPortal,
+    test_blogposts: list[Blogpost],
+) -> None:
+    """Test that a deleted blogpost is not served from the cache."""
+
+    blogpost = test_blogposts[0]
+    client.get(f"/api/get/blogpost/{blogpost.slug}")
+    client.get("/api/get/blogposts")
+
+    portal.call(partial(crud_delete_blogpost, id=cast(int, blogpost.id), db=db_session))
+
+    response = client.get(f"/api/get/blogpost/{blogpost.slug}")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    response = client.get("/api/get/blogposts")
+    ids = [item["id"] for item in response.json()["data"]["items"]]
+    assert blogpost.id not in ids
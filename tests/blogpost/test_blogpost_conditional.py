@@ -0,0 +1,129 @@
+from functools import partial
+from typing import cast
+
+from anyio.from_thread import BlockingPortal
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud import crud_update_blogpost
+from app.crud.blogpost import blogpost_cache
+from app.models import Blogpost
+from tests.conftest import async_engine
+from tests.utils.queries import count_queries
+
+
+def test_get_blogpost_sets_validators(
+    client: TestClient, test_blogposts: list[Blogpost]
+) -> None:
+    """Test that a blogpost response carries ETag and Last-Modified."""
+
+    response = client.get(f"/api/get/blogpost/{test_blogposts[0].slug}")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["etag"].startswith('"')
+    assert response.headers["last-modified"].endswith("GMT")
+
+
+def test_get_blogpost_if_none_match(
+    client: TestClient, test_blogposts: list[Blogpost]
+) -> None:
+    """Test that a matching If-None-Match is answered with 304."""
+
+    url = f"/api/get/blogpost/{test_blogposts[0].id}"
+    etag = client.get(url).headers["etag"]
+
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+    response = client.get(url, headers={"If-None-Match": '"other", W/' + etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    response = client.get(url, headers={"If-None-Match": '"other"'})
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_get_blogpost_if_modified_since(
+    client: TestClient, test_blogposts: list[Blogpost]
+) -> None:
+    """Test that If-Modified-Since is honored when there is no ETag."""
+
+    url = f"/api/get/blogpost/{test_blogposts[0].id}"
+    last_modified = client.get(url).headers["last-modified"]
+
+    response = client.get(url, headers={"If-Modified-Since": last_modified})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    response = client.get(
+        url, headers={"If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_not_modified_skips_loading_content(
+    client: TestClient, test_blogposts: list[Blogpost]
+) -> None:
+    """Test that an uncached conditional request only reads the validators."""
+
+    url = f"/api/get/blogpost/{test_blogposts[0].id}"
+    etag = client.get(url).headers["etag"]
+    blogpost_cache.clear()
+
+    with count_queries(async_engine.sync_engine) as counter:
+        response = client.get(url, headers={"If-None-Match": etag})
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert counter.count == 1
+    assert "content" not in counter.statements[0]
+
+
+def test_update_changes_etag(
+    client: TestClient,
+    db_session: AsyncSession,
+    portal: BlockingPortal,
+    test_blogposts: list[Blogpost],
+) -> None:
+    """Test that an update makes the previous ETag stale."""
+
+    blogpost = test_blogposts[0]
+    url = f"/api/get/blogpost/{blogpost.id}"
+    etag = client.get(url).headers["etag"]
+    listing_etag = client.get("/api/get/blogposts").headers["etag"]
+
+    portal.call(
+        partial(
+            crud_update_blogpost,
+            id=cast(int, blogpost.id),
+            blogpost_data={"preview": "New preview"},
+            db=db_session,
+        )
+    )
+
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["etag"] != etag
+
+    response = client.get("/api/get/blogposts", headers={"If-None-Match": listing_etag})
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_get_blogposts_if_none_match(
+    client: TestClient, test_blogposts: list[Blogpost]
+) -> None:
+    """Test conditional requests on listing pages."""
+
+    response = client.get("/api/get/blogposts", params={"limit": 5})
+    etag = response.headers["etag"]
+    assert "last-modified" not in response.headers
+
+    response = client.get(
+        "/api/get/blogposts", params={"limit": 5}, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    response = client.get(
+        "/api/get/blogposts", params={"limit": 6}, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == status.HTTP_200_OK
@@ -0,0 +1,140 @@
+from functools import partial
+
+import pytest
+from anyio.from_thread import BlockingPortal
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.enums import LoadStrategy
+from app.crud import crud_get_blogpost, crud_get_blogposts
+from app.models import Blogpost
+from tests.conftest import async_engine
+from tests.utils.queries import count_queries
+
+
+def test_get_blogposts_paginates_with_cursor(
+    client: TestClient, test_blogposts: list[Blogpost]
+) -> None:
+    """Test walking every page of the blogpost listing."""
+
+    seen: list[int] = []
+    cursor = None
+
+    while True:
+        params: dict = {"limit": 10}
+        if cursor:
+            params["cursor"] = cursor
+
+        response = client.get("/api/get/blogposts", params=params)
+        assert response.status_code == status.HTTP_200_OK
+
+        data = response.json()["data"]
+        assert len(data["items"]) <= 10, "Page should not exceed the limit"
+        seen.extend(item["id"] for item in data["items"])
+
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == [b.id for b in test_blogposts], "Pages should be newest first"
+
+
+def test_get_blogposts_omits_content(
+    client: TestClient, test_blogposts: list[Blogpost]
+) -> None:
+    """Test that the listing does not include the post content."""
+
+    response = client.get("/api/get/blogposts", params={"limit": 5})
+    assert response.status_code == status.HTTP_200_OK
+
+    items = response.json()["data"]["items"]
+    assert len(items) == 5
+    assert all("content" not in item for item in items), "Content should be omitted"
+    assert items[0]["preview"] == test_blogposts[0].preview
+
+
+def test_get_blogposts_by_tag_paginates(
+    client: TestClient, test_blogposts: list[Blogpost]
+) -> None:
+    """Test that tag listings are paginated as well."""
+
+    response = client.get("/api/get/blogposts/python", params={"limit": 5})
+    assert response.status_code == status.HTTP_200_OK
+
+    data = response.json()["data"]
+    assert len(data["items"]) == 5
+    assert all(
+        "python" in {tag["name"] for tag in item["tags"]} for item in data["items"]
+    )
+
+    response = client.get(
+        "/api/get/blogposts/python", params={"limit": 5, "cursor": data["next_cursor"]}
+    )
+    next_ids = [item["id"] for item in response.json()["data"]["items"]]
+    assert not set(next_ids) & {item["id"] for item in data["items"]}
+
+
+def test_get_blogposts_invalid_cursor(client: TestClient) -> None:
+    """Test that a malformed cursor is rejected."""
+
+    response = client.get("/api/get/blogposts", params={"cursor": "not-a-cursor"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    response = client.get("/api/get/blogposts", params={"limit": 0})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.parametrize(
+    "strategy, expected", [(LoadStrategy.SELECTIN, 2), (LoadStrategy.JOINED, 1)]
+)
+def test_crud_get_blogposts_loads_tags_eagerly(
+    db_session: AsyncSession,
+    portal: BlockingPortal,
+    test_blogposts: list[Blogpost],
+    strategy: LoadStrategy,
+    expected: int,
+) -> None:
+    """Test that serializing a listing does not lazy load tags per post."""
+
+    db_session.expire_all()
+
+    with count_queries(async_engine.sync_engine) as counter:
+        blogposts = portal.call(
+            partial(crud_get_blogposts, db=db_session, load_strategy=strategy)
+        )
+        tags = [tag.name for blogpost in blogposts for tag in blogpost.tags]
+
+    assert len(blogposts) == len(test_blogposts)
+    assert len(tags) == 38
+    assert counter.count == expected, counter.statements
+
+
+def test_crud_get_blogpost_loads_tags_eagerly(
+    db_session: AsyncSession, portal: BlockingPortal, test_blogposts: list[Blogpost]
+) -> None:
+    """Test that a single blogpost comes with its tags."""
+
+    slug = str(test_blogposts[0].slug)
+    db_session.expire_all()
+
+    with count_queries(async_engine.sync_engine) as counter:
+        blogpost = portal.call(partial(crud_get_blogpost, db=db_session, slug=slug))
+        assert blogpost is not None
+        tags = [tag.name for tag in blogpost.tags]
+
+    assert sorted(tags) == ["python", "sql"]
+    assert counter.count == 2, counter.statements
+
+
+def test_get_blogposts_query_budget(
+    client: TestClient, test_blogposts: list[Blogpost]
+) -> None:
+    """Test that a listing page costs a constant number of queries."""
+
+    with count_queries(async_engine.sync_engine) as counter:
+        response = client.get("/api/get/blogposts", params={"limit": 25})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.json()["data"]["items"]) == 25
+    assert counter.count == 2, counter.statements
@@ -0,0 +1,171 @@
+import io
+import json
+from unittest.mock import ANY
+
+import pytest
+from anyio.from_thread import BlockingPortal
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.cli.importer import run_import
+from app.core.config import settings
+from app.models import Blogpost
+from tests.conftest import async_engine, engine
+from tests.utils.queries import count_queries
+from tests.utils.schemas import UserExtended
+
+
+def ndjson(rows: list) -> bytes:
+    return b"".join(
+        (row if isinstance(row, bytes) else json.dumps(row).encode()) + b"\n"
+        for row in rows
+    )
+
+
+def post_row(i: int, **kwargs: object) -> dict:
+    return {
+        "title": f"Imported {i}",
+        "slug": f"imported_{i}",
+        "banner": "banner.png",
+        "content": f"Imported content number {i}",
+        "tags": ["python", {"name": "archive", "icon": "archive.svg"}],
+        **kwargs,
+    }
+
+
+def test_import_blogposts(
+    client: TestClient, test_admin: UserExtended, test_blogposts: list[Blogpost]
+) -> None:
+    """Test importing rows over several batches, reporting the bad ones."""
+
+    rows: list[dict | bytes] = [post_row(i) for i in range(7)]
+    rows.insert(2, b"{not json")
+    rows.insert(4, post_row(99, slug=test_blogposts[0].slug))
+    rows.insert(6, post_row(98, slug="imported_0"))
+    rows.insert(8, {"slug": "no_title"})
+
+    response = client.post(
+        "/api/import/blogposts",
+        params={"batch_size": 3},
+        content=ndjson(rows),
+        headers={"Authorization": f"Bearer {test_admin.access_token}"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    data = response.json()["data"]
+    assert data["imported"] == 7
+    assert [(error["line"], error["slug"]) for error in data["failed"]] == [
+        (3, None),
+        (5, test_blogposts[0].slug),
+        (7, "imported_0"),
+        (9, "no_title"),
+    ]
+    assert data["failed_count"] == 4
+    assert "already exists" in data["failed"][1]["error"]
+
+    imported = client.get("/api/get/blogpost/imported_3").json()["data"]
+    assert imported["author_id"] == test_admin.id
+    assert imported["word_count"] == 4, "Derived fields should be filled"
+    assert sorted(tag["name"] for tag in imported["tags"]) == ["archive", "python"]
+
+    stats = client.get("/api/get/tags/stats").json()["data"]["tags"]
+    assert {tag["name"]: tag["count"] for tag in stats}["archive"] == 7
+
+
+def test_import_new_tag_by_name(client: TestClient, test_admin: UserExtended) -> None:
+    """Test that a post tagged with a new tag by name can be read back."""
+
+    response = client.post(
+        "/api/import/blogposts",
+        content=ndjson([post_row(0, tags=["brand_new"])]),
+        headers={"Authorization": f"Bearer {test_admin.access_token}"},
+    )
+    assert response.json()["data"]["imported"] == 1
+
+    response = client.get("/api/get/blogpost/imported_0")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["data"]["tags"] == [
+        {"id": ANY, "name": "brand_new", "icon": None, "description": None}
+    ]
+
+    for url in ("/api/get/blogposts", "/api/get/blogposts/brand_new"):
+        response = client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["data"]["items"][0]["tags"][0]["icon"] is None
+
+
+def test_import_blogposts_queries_per_batch(
+    client: TestClient, test_admin: UserExtended
+) -> None:
+    """Test that the number of queries depends on batches, not rows."""
+
+    headers = {"Authorization": f"Bearer {test_admin.access_token}"}
+    with count_queries(async_engine.sync_engine) as counter:
+        response = client.post(
+            "/api/import/blogposts",
+            params={"batch_size": 50},
+            content=ndjson([post_row(i) for i in range(100)]),
+            headers=headers,
+        )
+
+    assert response.json()["data"]["imported"] == 100
+    # Per batch: conflict lookup, tag upsert, tag ids, posts, tag links.
+    inserts = [s for s in counter.statements if s.lstrip().startswith("INSERT")]
+    assert len(inserts) <= 2 * 3, "Each batch should insert with one statement"
+
+
+def test_import_blogposts_forbidden(
+    client: TestClient, test_user: UserExtended
+) -> None:
+    """Test that only admins can import."""
+
+    response = client.post(
+        "/api/import/blogposts",
+        content=ndjson([post_row(0)]),
+        headers={"Authorization": f"Bearer {test_user.access_token}"},
+    )
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_import_keeps_the_first_errors(
+    client: TestClient, test_admin: UserExtended, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that only the first failed rows are reported, the others counted."""
+
+    monkeypatch.setattr(settings, "IMPORT_MAX_ERRORS", 3)
+    rows = [b"{not json"] * 7 + [post_row(0)]
+
+    response = client.post(
+        "/api/import/blogposts",
+        params={"batch_size": 2},
+        content=ndjson(rows),
+        headers={"Authorization": f"Bearer {test_admin.access_token}"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    data = response.json()["data"]
+    assert data["imported"] == 1
+    assert [error["line"] for error in data["failed"]] == [1, 2, 3]
+    assert data["failed_count"] == 7
+
+
+def test_import_cli(app: object, portal: BlockingPortal) -> None:
+    """Test the import command reading a file."""
+
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO users (username, email, password, role, is_active) "
+                "VALUES ('writer', 'writer@gmail.com', 'x', 'ADMIN', true)"
+            )
+        )
+
+    file = io.BytesIO(ndjson([post_row(i) for i in range(5)] + [post_row(0)]))
+    summary = portal.call(
+        lambda: run_import(async_sessionmaker(async_engine), file, author="writer")
+    )
+
+    assert summary["imported"] == 5
+    assert [error["line"] for error in summary["failed"]] == [6]
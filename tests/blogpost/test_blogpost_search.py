@@ -0,0 +1,122 @@
+from datetime import datetime
+
+import pytest
+from anyio.from_thread import BlockingPortal
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Blogpost
+from tests.utils.schemas import UserExtended
+
+
+@pytest.fixture(scope="function")
+def search_blogposts(
+    db_session: AsyncSession, portal: BlockingPortal, test_user: UserExtended
+) -> list[Blogpost]:
+    documents = [
+        ("Postgres indexing", "GIN indexes explained", "Text about trees."),
+        ("Cooking pasta", "A quick dinner", "Boil water, then add the postgres."),
+        ("Gardening", "Tomatoes in spring", "Nothing to see here."),
+        ("Hidden postgres tips", "Draft", "Postgres vacuum internals."),
+    ]
+    blogposts = [
+        Blogpost(
+            title=title,
+            slug=f"search_{i}",
+            author_id=test_user.id,
+            banner="banner.png",
+            content=content,
+            preview=preview,
+            created_at=datetime(2025, 1, i + 1),
+            is_active=i != 3,
+        )
+        for i, (title, preview, content) in enumerate(documents)
+    ]
+    db_session.add_all(blogposts)
+    portal.call(db_session.commit)
+    return blogposts
+
+
+def test_search_blogposts_ranks_matches(
+    client: TestClient, search_blogposts: list[Blogpost]
+) -> None:
+    """Test that title matches rank above content matches."""
+
+    response = client.get("/api/search/blogposts", params={"q": "postgres"})
+    assert response.status_code == status.HTTP_200_OK
+
+    items = response.json()["data"]["items"]
+    assert [item["slug"] for item in items] == ["search_0", "search_1"]
+    assert items[0]["rank"] > items[1]["rank"]
+    assert "content" not in items[0]
+
+
+def test_search_blogposts_highlights_snippet(
+    client: TestClient, search_blogposts: list[Blogpost]
+) -> None:
+    """Test that the snippet highlights the matched words."""
+
+    response = client.get("/api/search/blogposts", params={"q": "boiling water"})
+    items = response.json()["data"]["items"]
+
+    assert len(items) == 1
+    assert "<mark>Boil</mark>" in items[0]["snippet"]
+    assert "<mark>water</mark>" in items[0]["snippet"]
+
+
+def test_search_blogposts_escapes_snippet(
+    client: TestClient,
+    db_session: AsyncSession,
+    portal: BlockingPortal,
+    test_user: UserExtended,
+) -> None:
+    """Test that markup of the document is escaped, only the highlight is HTML."""
+
+    db_session.add(
+        Blogpost(
+            title="Markup",
+            slug="markup",
+            author_id=test_user.id,
+            banner="banner.png",
+            content='<script>alert("boil")</script> Boil & <b>water</b>',
+            preview="Preview",
+        )
+    )
+    portal.call(db_session.commit)
+
+    response = client.get("/api/search/blogposts", params={"q": "boil water"})
+    snippet = response.json()["data"]["items"][0]["snippet"]
+
+    assert "<script>" not in snippet and "<b>" not in snippet
+    assert "&lt;script&gt;" in snippet
+    assert "&amp;" in snippet
+    assert "<mark>water</mark>" in snippet
+
+
+def test_search_blogposts_paginates(
+    client: TestClient, search_blogposts: list[Blogpost]
+) -> None:
+    """Test walking search results page by page."""
+
+    response = client.get("/api/search/blogposts", params={"q": "postgres", "limit": 1})
+    data = response.json()["data"]
+    assert [item["slug"] for item in data["items"]] == ["search_0"]
+
+    response = client.get(
+        "/api/search/blogposts",
+        params={"q": "postgres", "limit": 1, "cursor": data["next_cursor"]},
+    )
+    data = response.json()["data"]
+    assert [item["slug"] for item in data["items"]] == ["search_1"]
+    assert data["next_cursor"] is None
+
+
+def test_search_blogposts_invalid_params(client: TestClient) -> None:
+    """Test that missing queries and malformed cursors are rejected."""
+
+    response = client.get("/api/search/blogposts")
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    response = client.get("/api/search/blogposts", params={"q": "x", "cursor": "bad"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
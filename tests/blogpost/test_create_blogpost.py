@@ -0,0 +1,165 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, cast
+
+from anyio.from_thread import BlockingPortal
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.cli.backfill import run_backfill
+from app.crud import crud_create_blogpost, crud_update_blogpost
+from app.models import Blogpost
+from tests.conftest import engine
+from tests.utils.schemas import UserExtended
+
+blogpost_example = {
+    "title": "Derived fields",
+    "slug": "derived_fields",
+    "banner": "banner.png",
+    "content": "## Intro\n\n" + "Lorem ipsum dolor sit amet. " * 100,
+    "tags": [{"id": None, "name": "python", "icon": "python.svg"}],
+}
+
+
+def create_blogpost(
+    db_session: AsyncSession, portal: BlockingPortal, author: UserExtended, **data: Any
+) -> Blogpost:
+    blogpost_data = {**blogpost_example, "author_id": author.id, **data}
+    return portal.call(crud_create_blogpost, blogpost_data, db_session)
+
+
+def test_create_blogpost_derives_content_fields(
+    db_session: AsyncSession, portal: BlockingPortal, test_user: UserExtended
+) -> None:
+    """Test that word count, reading time, excerpt and hash are computed."""
+
+    blogpost = create_blogpost(db_session, portal, test_user)
+
+    assert blogpost.word_count == 501
+    assert blogpost.reading_time == 3
+    assert blogpost.excerpt.startswith("Intro Lorem ipsum")
+    assert blogpost.preview == blogpost.excerpt, "Preview should default to excerpt"
+    assert len(blogpost.content_hash) == 64
+    assert [tag.name for tag in blogpost.tags] == ["python"]
+
+
+def test_create_blogpost_keeps_given_preview(
+    db_session: AsyncSession, portal: BlockingPortal, test_user: UserExtended
+) -> None:
+    """Test that a hand written preview is not replaced."""
+
+    blogpost = create_blogpost(db_session, portal, test_user, preview="Hand written")
+    assert blogpost.preview == "Hand written"
+
+
+def test_create_blogpost_reuses_existing_tags(
+    db_session: AsyncSession, portal: BlockingPortal, test_user: UserExtended
+) -> None:
+    """Test that tags are resolved by name instead of duplicated."""
+
+    first = create_blogpost(db_session, portal, test_user)
+    second = create_blogpost(
+        db_session, portal, test_user, title="Second", slug="second"
+    )
+
+    assert first.tags[0].id == second.tags[0].id, "Tag should be shared"
+
+
+def test_update_blogpost_refreshes_derived_fields(
+    db_session: AsyncSession, portal: BlockingPortal, test_user: UserExtended
+) -> None:
+    """Test that updating the content recomputes the derived fields."""
+
+    created = create_blogpost(db_session, portal, test_user)
+    content_hash = created.content_hash
+
+    blogpost = portal.call(
+        crud_update_blogpost,
+        cast(int, created.id),
+        {"content": "Just four words here"},
+        db_session,
+    )
+
+    assert blogpost.word_count == 4
+    assert blogpost.excerpt == "Just four words here"
+    assert blogpost.preview == blogpost.excerpt, "Generated preview should follow"
+    assert blogpost.content_hash != content_hash
+
+
+def insert_old_blogposts(count: int) -> None:
+    """Commit `count` blogposts stored without derived fields."""
+
+    with Session(engine) as session:
+        session.execute(
+            text(
+                "INSERT INTO users (username, email, password, role, is_active) "
+                "VALUES ('writer', 'writer@gmail.com', 'x', 'USER', true)"
+            )
+        )
+        author_id = session.scalar(text("SELECT id FROM users"))
+        session.add_all(
+            Blogpost(
+                title=f"Old {i}",
+                slug=f"old_{i}",
+                author_id=author_id,
+                content="one two three " * (i + 1),
+            )
+            for i in range(count)
+        )
+        session.commit()
+
+
+def test_backfill_derived_fields(app: object) -> None:
+    """Test the backfill of blogposts stored without derived fields."""
+
+    insert_old_blogposts(7)
+    assert run_backfill(engine, batch_size=3, workers=2) == 7
+    assert run_backfill(engine, batch_size=3, workers=2) == 0, "Nothing left to do"
+
+    with Session(engine) as session:
+        rows = session.execute(
+            text("SELECT word_count, reading_time, content_hash FROM blogposts")
+        ).all()
+
+    assert sorted(row.word_count for row in rows) == [3 * (i + 1) for i in range(7)]
+    assert all(row.reading_time == 1 and row.content_hash for row in rows)
+
+
+class RecordingExecutor(ThreadPoolExecutor):
+    """Records when a batch is submitted and when its results are collected."""
+
+    def __init__(self) -> None:
+        super().__init__(max_workers=2)
+        self.events: list[tuple[str, int]] = []
+
+    def map(self, fn: Callable, *iterables: Iterable, **kwargs: Any) -> Iterator:
+        rows = list(iterables[0])
+        first_id = rows[0][0]
+        self.events.append(("submit", first_id))
+        results = super().map(fn, rows)
+
+        def collect() -> Iterator:
+            self.events.append(("collect", first_id))
+            yield from results
+
+        return collect()
+
+
+def test_backfill_reads_ahead_of_the_analysis(app: object) -> None:
+    """Test that the next batch is read before the previous one is collected."""
+
+    insert_old_blogposts(5)
+    executor = RecordingExecutor()
+
+    with executor:
+        assert run_backfill(engine, batch_size=2, executor=executor) == 5
+
+    ids = [first_id for kind, first_id in executor.events if kind == "submit"]
+    assert executor.events == [
+        ("submit", ids[0]),
+        ("submit", ids[1]),
+        ("collect", ids[0]),
+        ("submit", ids[2]),
+        ("collect", ids[1]),
+        ("collect", ids[2]),
+    ]
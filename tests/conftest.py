@@ -1,38 +1,80 @@
 import os
 import sys
-from typing import Any, Generator
+from datetime import datetime, timedelta
+from typing import Any, AsyncGenerator, Generator
 
 import pytest
+from anyio.from_thread import BlockingPortal, start_blocking_portal
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app.api import router_auth, router_blog, router_project, router_tag, router_user
+from app.core.cache import caches
 from app.core.config import settings
 from app.core.enums import UserRoles
+from app.core.jobs import job_queue
 from app.core.jwt import create_access_token
+from app.core.metrics import request_metrics
 from app.core.password import hash_password
+from app.core.ratelimit import rate_limiter
+from app.core.revocation import token_revocations
 from app.db.base import Base
-from app.db.session import get_db
+from app.db.instrumentation import instrument_engine
+from app.db.session import get_db, get_read_db
+from app.main import create_app
+from app.models import Blogpost, Tag
 from tests.utils.schemas import UserExtended
 
+DB_URL = settings.TEST_DB_URL
+engine = create_engine(DB_URL)
 
-def start_application() -> FastAPI:
-    app = FastAPI()
-    app.include_router(router_auth, prefix="/api")
-    app.include_router(router_blog, prefix="/api")
-    app.include_router(router_project, prefix="/api")
-    app.include_router(router_tag, prefix="/api")
-    app.include_router(router_user, prefix="/api")
-    return app
+ASYNC_DB_URL = settings.ASYNC_TEST_DB_URL
+async_engine = create_async_engine(ASYNC_DB_URL, poolclass=NullPool)
+instrument_engine(async_engine.sync_engine)
 
 
-DB_URL = settings.TEST_DB_URL
-engine = create_engine(DB_URL)
-session_testing = sessionmaker(autocommit=False, autoflush=True, bind=engine)
+@pytest.fixture(scope="function")
+def portal() -> Generator[BlockingPortal, Any, None]:
+    """
+    Event loop shared by the async database session and the TestClient.
+
+    asyncpg connections are bound to the loop that opened them, so fixtures
+    run their coroutines through this portal and the client reuses it.
+    """
+
+    with start_blocking_portal() as portal:
+        yield portal
+
+
+@pytest.fixture(scope="function", autouse=True)
+def clear_caches() -> None:
+    """
+    Empty the in-process caches, rate limits and metrics, ids are reused
+    across tests.
+    """
+
+    for cache in caches.values():
+        cache.clear()
+        cache.reset_stats()
+
+    rate_limiter.reset()
+    token_revocations.reset()
+    request_metrics.reset()
+    job_queue.reset_stats()
+
+
+@pytest.fixture(scope="function", autouse=True)
+def no_listing_warmup(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Test writes are never committed, a warm-up job reading from its own
+    connection would cache listings without them.
+    """
+
+    monkeypatch.setattr(settings, "BLOGPOST_CACHE_WARMUP", False)
 
 
 @pytest.fixture(scope="function")
@@ -42,46 +84,57 @@ def app() -> Generator[FastAPI, Any, None]:
     """
 
     Base.metadata.create_all(bind=engine)
-    _app = start_application()
+    _app = create_app()
     yield _app
     Base.metadata.drop_all(bind=engine)
 
 
 @pytest.fixture(scope="function")
-def db_session(app: FastAPI) -> Generator[Session, Any, None]:
+def db_session(
+    app: FastAPI, portal: BlockingPortal
+) -> Generator[AsyncSession, Any, None]:
     """
     Create a new database session for testing.
     """
-    connection = engine.connect()
-    transaction = connection.begin()
-    session = session_testing(bind=connection)
+
+    async def open_session() -> tuple:
+        connection = await async_engine.connect()
+        transaction = await connection.begin()
+        session = AsyncSession(bind=connection, expire_on_commit=False)
+        return connection, transaction, session
+
+    async def close_session() -> None:
+        await session.close()
+        await transaction.rollback()
+        await connection.close()
+
+    connection, transaction, session = portal.call(open_session)
 
     yield session
 
-    session.close()
-    transaction.rollback()
-    connection.close()
+    portal.call(close_session)
 
 
 @pytest.fixture(scope="function")
-def client(app: FastAPI, db_session: Session) -> Generator[TestClient, Any, None]:
+def client(
+    app: FastAPI, db_session: AsyncSession, portal: BlockingPortal
+) -> Generator[TestClient, Any, None]:
     """
     Create a TestClient for the FastAPI app.
     """
 
-    def get_test_db() -> Generator[Session, Any, None]:
-        try:
-            yield db_session
-        finally:
-            pass
+    async def get_test_db() -> AsyncGenerator[AsyncSession, Any]:
+        yield db_session
 
     app.dependency_overrides[get_db] = get_test_db
-    with TestClient(app) as client:
-        yield client
+    app.dependency_overrides[get_read_db] = get_test_db
+    client = TestClient(app)
+    client.portal = portal
+    yield client
 
 
 @pytest.fixture(scope="function")
-def test_user(db_session: Session) -> UserExtended:
+def test_user(db_session: AsyncSession, portal: BlockingPortal) -> UserExtended:
     user_data = {
         "username": "testuser",
         "email": "test@gmail.com",
@@ -92,14 +145,14 @@ def test_user(db_session: Session) -> UserExtended:
 
     from app.crud import crud_create_user
 
-    user = crud_create_user(user_data, db=db_session).__dict__
+    user = portal.call(crud_create_user, user_data, db_session).__dict__
     user["unhashed_password"] = "SecurePassword123"
     user["access_token"] = create_access_token(sub=str(user["id"]))
     return UserExtended(**user)
 
 
 @pytest.fixture(scope="function")
-def test_admin(db_session: Session) -> UserExtended:
+def test_admin(db_session: AsyncSession, portal: BlockingPortal) -> UserExtended:
     user_data = {
         "username": "testadmin",
         "email": "admin@gmail.com",
@@ -110,7 +163,38 @@ def test_admin(db_session: Session) -> UserExtended:
 
     from app.crud import crud_create_user
 
-    user = crud_create_user(user_data, db=db_session).__dict__
+    user = portal.call(crud_create_user, user_data, db_session).__dict__
     user["unhashed_password"] = "SecurePassword123"
     user["access_token"] = create_access_token(sub=str(user["id"]))
     return UserExtended(**user)
+
+
+@pytest.fixture(scope="function")
+def test_blogposts(
+    db_session: AsyncSession, portal: BlockingPortal, test_user: UserExtended
+) -> list[Blogpost]:
+    """Create 25 active blogposts, newest first, the even ones tagged `python`."""
+
+    tag = Tag(name="python", icon="python.svg")
+    other_tag = Tag(name="sql", icon="sql.svg")
+    db_session.add_all([tag, other_tag])
+
+    base_date = datetime(2025, 1, 1)
+    blogposts = []
+    for i in range(25):
+        blogpost = Blogpost(
+            title=f"Blogpost {i}",
+            slug=f"blogpost_{i}",
+            author_id=test_user.id,
+            banner="banner.png",
+            content=f"Content of blogpost {i}",
+            preview=f"Preview of blogpost {i}",
+            created_at=base_date + timedelta(days=i),
+            tags=[tag, other_tag] if i % 2 == 0 else [other_tag],
+            is_active=True,
+        )
+        blogposts.append(blogpost)
+
+    db_session.add_all(blogposts)
+    portal.call(db_session.commit)
+    return sorted(blogposts, key=lambda b: b.created_at, reverse=True)
@@ -1,11 +1,23 @@
 import time
+from datetime import timedelta
+from unittest.mock import patch
 
 import pytest
+from anyio.from_thread import BlockingPortal
+from fastapi import status
 from fastapi.testclient import TestClient
-from sqlalchemy.orm import Session
+from jose import jwt
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.auth import get_current_user
-from app.core.jwt import create_access_token, create_refresh_token, verify_access_token
+from app.core.jwt import (
+    create_access_token,
+    create_refresh_token,
+    create_token,
+    verified_tokens,
+    verify_access_token,
+)
+from app.core.revocation import token_revocations
 from tests.utils.schemas import UserExtended
 
 
@@ -21,10 +33,12 @@ def test_create_access_token() -> None:
     assert decoded_data["sub"] == sub, "Decoded token data should match input data"
 
 
-def test_get_current_user(db_session: Session, test_user: UserExtended) -> None:
+def test_get_current_user(
+    db_session: AsyncSession, portal: BlockingPortal, test_user: UserExtended
+) -> None:
     """Test getting the current user from a valid token."""
 
-    current_user = get_current_user(token=test_user.access_token, db=db_session)
+    current_user = portal.call(get_current_user, test_user.access_token, db_session)
     assert current_user is not None, "Current user should not be None"
 
     assert current_user.id == test_user.id, "Current user ID should match test user"
@@ -122,3 +136,50 @@ def test_refresh_token_success(client: TestClient, test_user: UserExtended) -> N
     assert response.status_code == 200
     assert response.json()["success"] is True
     assert new_access_token != access_token, "Access token should be refreshed"
+
+
+def test_verified_tokens_are_cached() -> None:
+    """Test that a token is only decoded once while it is valid."""
+
+    token = create_access_token(sub="42")
+
+    with patch("jose.jwt.decode", wraps=jwt.decode) as decode:
+        assert verify_access_token(token)["sub"] == "42"
+        assert verify_access_token(token)["sub"] == "42"
+
+    assert decode.call_count == 1
+    assert verified_tokens.stats()["hits"] == 1
+
+
+def test_verified_token_cache_expires_with_token() -> None:
+    """Test that cached claims do not outlive the token."""
+
+    token = create_token({"sub": "42"}, expires_delta=timedelta(seconds=1))
+    verify_access_token(token)
+
+    time.sleep(2.1)
+    with pytest.raises(ValueError, match="Invalid or expired token"):
+        verify_access_token(token)
+
+
+def test_logout_revokes_access_token(
+    client: TestClient, test_user: UserExtended
+) -> None:
+    """Test that an access token is rejected after logout."""
+
+    headers = {"Authorization": f"Bearer {test_user.access_token}"}
+    url = f"/api/update/user/{test_user.id}"
+    assert client.put(url, json={}, headers=headers).status_code == 200
+
+    client.post("/api/logout", headers=headers)
+
+    response = client.put(url, json={}, headers=headers)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    # Another worker, or this one once the filter is rebuilt, rejects it too.
+    token_revocations.reset()
+    response = client.put(url, json={}, headers=headers)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    logout = client.post("/api/logout", headers={"Authorization": "Bearer garbage"})
+    assert logout.status_code == status.HTTP_200_OK, "Nothing to revoke"
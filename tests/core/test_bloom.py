@@ -0,0 +1,21 @@
+from app.core.bloom import BloomFilter
+
+
+def test_bloom_has_no_false_negatives() -> None:
+    """Test that every added item is found."""
+
+    bloom = BloomFilter.from_items((f"item-{i}" for i in range(1000)), capacity=1000)
+
+    assert all(f"item-{i}" in bloom for i in range(1000))
+    assert bloom.count == 1000
+
+
+def test_bloom_false_positive_rate() -> None:
+    """Test that the false positive rate stays close to the configured one."""
+
+    bloom = BloomFilter(capacity=5000, error_rate=0.01)
+    for i in range(5000):
+        bloom.add(f"in-{i}")
+
+    false_positives = sum(f"out-{i}" in bloom for i in range(20000))
+    assert false_positives / 20000 < 0.02
@@ -0,0 +1,88 @@
+from app.core.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_cache_counts_hits_and_misses() -> None:
+    """Test the hit and miss counters."""
+
+    cache = TTLCache(maxsize=10, ttl=60)
+
+    assert cache.get("a") is None
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    assert cache.get("a") == 1
+
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["hit_ratio"] == 2 / 3
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    """Test that the oldest unused entry is evicted when the cache is full."""
+
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert "a" in cache and "c" in cache
+    assert "b" not in cache, "Least recently used entry should be evicted"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_expires_entries() -> None:
+    """Test that entries expire after the TTL."""
+
+    clock = FakeClock()
+    cache = TTLCache(maxsize=10, ttl=5, clock=clock)
+    cache.set("a", 1)
+
+    clock.now = 4.9
+    assert cache.get("a") == 1
+
+    clock.now = 5
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+    assert len(cache) == 0
+
+
+def test_cache_entry_ttl() -> None:
+    """Test per entry TTLs, capped by the cache TTL."""
+
+    clock = FakeClock()
+    cache = TTLCache(maxsize=10, ttl=5, clock=clock)
+    cache.set("short", 1, ttl=1)
+    cache.set("long", 2, ttl=60)
+
+    clock.now = 1
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
+
+    clock.now = 5
+    assert cache.get("long") is None
+
+
+def test_cache_invalidation() -> None:
+    """Test invalidating entries by key and by predicate."""
+
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set(("post", 1), "one")
+    cache.set(("list", "all"), [1])
+    cache.set(("list", "python"), [1])
+    cache.set(("list", "sql"), [])
+
+    cache.invalidate(("post", 1), ("post", 2))
+    cache.invalidate_where(lambda key: key[0] == "list" and key[1] in {"all", "sql"})
+
+    assert ("list", "python") in cache
+    assert len(cache) == 1
+    assert cache.stats()["invalidations"] == 3
@@ -0,0 +1,154 @@
+import gzip
+
+import pytest
+from fastapi import FastAPI, status
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core import compression, responses
+from app.core.compression import CompressionMiddleware, negotiate_encoding
+from app.core.config import settings
+from app.core.responses import rendered_responses
+from app.models import Blogpost
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (None, None),
+        ("", None),
+        ("identity", None),
+        ("gzip", "gzip"),
+        ("deflate, gzip;q=0.5", "gzip"),
+        ("gzip;q=0", None),
+        ("*", compression.ENCODINGS[0]),
+        ("*;q=0, gzip", "gzip"),
+    ],
+)
+def test_negotiate_encoding(header: str | None, expected: str | None) -> None:
+    """Test picking the content coding from Accept-Encoding."""
+
+    assert negotiate_encoding(header) == expected
+
+
+def test_negotiate_prefers_brotli() -> None:
+    """Test that brotli wins ties when it is installed."""
+
+    pytest.importorskip("brotli")
+    assert negotiate_encoding("gzip, br") == "br"
+    assert negotiate_encoding("gzip, br;q=0.5") == "gzip"
+
+
+@pytest.fixture
+def plain_client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware)
+
+    @app.get("/text/{size}")
+    def text(size: int) -> PlainTextResponse:
+        return PlainTextResponse("a" * size)
+
+    @app.get("/tagged")
+    def tagged() -> PlainTextResponse:
+        return PlainTextResponse("a" * 2048, headers={"ETag": '"tag"'})
+
+    @app.get("/stream")
+    def stream() -> StreamingResponse:
+        return StreamingResponse(
+            (b"a" * 2048 for _ in range(2)), media_type="text/plain"
+        )
+
+    return TestClient(app)
+
+
+def test_middleware_compresses_large_bodies(plain_client: TestClient) -> None:
+    """Test that only bodies over the threshold are compressed."""
+
+    headers = {"Accept-Encoding": "gzip"}
+    size = settings.COMPRESSION_MIN_SIZE
+
+    response = plain_client.get(f"/text/{size}", headers=headers)
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < size
+    assert response.text == "a" * size
+
+    response = plain_client.get(f"/text/{size - 1}", headers=headers)
+    assert "content-encoding" not in response.headers
+
+    response = plain_client.get(f"/text/{size}", headers={"Accept-Encoding": "br;q=0"})
+    assert "content-encoding" not in response.headers
+
+    response = plain_client.get("/stream", headers=headers)
+    assert "content-encoding" not in response.headers
+    assert len(response.content) == 4096
+
+    response = plain_client.get("/tagged", headers=headers)
+    assert response.headers["etag"] == '"tag-gzip"', "Each coding has its own ETag"
+
+
+def test_precompressed_listing_is_reused(
+    client: TestClient,
+    test_blogposts: list[Blogpost],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that repeated requests reuse the stored rendered bodies."""
+
+    calls: list[str] = []
+
+    def counting_compress(body: bytes, encoding: str) -> bytes:
+        calls.append(encoding)
+        return gzip.compress(body)
+
+    def failing_envelope(*args: object, **kwargs: object) -> None:
+        raise AssertionError("Cached bodies should not be serialized again")
+
+    monkeypatch.setattr(responses, "compress", counting_compress)
+    headers = {"Accept-Encoding": "gzip"}
+
+    first = client.get("/api/get/blogposts", headers=headers)
+    assert first.status_code == status.HTTP_200_OK
+    assert first.headers["content-encoding"] == "gzip"
+    assert first.headers["vary"] == "Accept-Encoding"
+    assert calls == ["gzip"]
+
+    monkeypatch.setattr(responses, "envelope", failing_envelope)
+
+    second = client.get("/api/get/blogposts", headers=headers)
+    assert second.content == first.content
+    assert second.headers["etag"] == first.headers["etag"]
+    assert calls == ["gzip"], "The compressed body should come from the cache"
+
+    identity = client.get("/api/get/blogposts", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in identity.headers
+    assert identity.json() == first.json()
+    assert len(rendered_responses) == 2
+
+
+def test_etag_differs_per_coding(
+    client: TestClient, test_blogposts: list[Blogpost]
+) -> None:
+    """Test that every coding gets its own strong ETag, revalidated per coding."""
+
+    gzipped = client.get("/api/get/blogposts", headers={"Accept-Encoding": "gzip"})
+    identity = client.get("/api/get/blogposts", headers={"Accept-Encoding": "identity"})
+
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert gzipped.headers["etag"].endswith('-gzip"')
+    assert gzipped.headers["etag"] != identity.headers["etag"]
+
+    response = client.get(
+        "/api/get/blogposts",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": gzipped.headers["etag"]},
+    )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["etag"] == gzipped.headers["etag"]
+
+    response = client.get(
+        "/api/get/blogposts",
+        headers={
+            "Accept-Encoding": "identity",
+            "If-None-Match": gzipped.headers["etag"],
+        },
+    )
+    assert response.status_code == status.HTTP_200_OK
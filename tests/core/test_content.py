@@ -0,0 +1,29 @@
+from app.core.content import analyze_content, make_excerpt, to_plain_text
+
+
+def test_plain_text_strips_markup() -> None:
+    """Test that markdown, HTML and code blocks are dropped from the text."""
+
+    content = (
+        "# Title\n\nSome **bold** [link](http://a.b) <b>html</b>\n```py\ncode\n```"
+    )
+    assert to_plain_text(content) == "Title Some bold link html"
+
+
+def test_excerpt_cuts_at_word_boundary() -> None:
+    """Test that long excerpts end on a whole word."""
+
+    assert make_excerpt("short text", length=20) == "short text"
+    assert make_excerpt("one two three four", length=10) == "one two…"
+
+
+def test_analyze_content() -> None:
+    """Test the derived fields of a blogpost's content."""
+
+    fields = analyze_content("word " * 450)
+
+    assert fields["word_count"] == 450
+    assert fields["reading_time"] == 3, "Reading time should round up"
+    assert len(fields["excerpt"]) <= 281
+    assert len(fields["content_hash"]) == 64
+    assert analyze_content("")["reading_time"] == 1
@@ -0,0 +1,210 @@
+import asyncio
+import os
+import threading
+from pathlib import Path
+
+import pytest
+from anyio.from_thread import BlockingPortal
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.config import settings
+from app.core.enums import JobExecutor
+from app.core.exceptions import JobQueueFullError
+from app.core.jobs import JobQueue, job_queue
+from app.crud.blogpost import blogpost_cache, schedule_listing_warmup
+from app.db import session
+from tests.conftest import async_engine
+from tests.utils.schemas import UserExtended
+
+
+def make_queue(**kwargs: object) -> JobQueue:
+    options: dict = {
+        "maxsize": 10,
+        "workers": 2,
+        "thread_workers": 2,
+        "process_workers": 1,
+        "retries": 3,
+        "retry_delay": 0,
+        "put_timeout": 0.05,
+        **kwargs,
+    }
+    return JobQueue(**options)
+
+
+def write_pid(path: str) -> None:
+    Path(path).write_text(str(os.getpid()))
+
+
+def test_jobs_run_on_every_executor(tmp_path: Path) -> None:
+    """Test that jobs run on the loop, a thread pool and a process pool."""
+
+    queue = make_queue()
+    ran: dict[str, object] = {}
+
+    async def on_loop(value: int) -> None:
+        ran["loop"] = value
+
+    def on_thread() -> None:
+        ran["thread"] = threading.current_thread().name
+
+    async def run() -> None:
+        await queue.enqueue(on_loop, 1)
+        await queue.enqueue(on_thread)
+        await queue.enqueue(
+            write_pid, str(tmp_path / "pid"), executor=JobExecutor.PROCESS
+        )
+        await queue.drain()
+        await queue.shutdown()
+
+    asyncio.run(run())
+
+    assert ran["loop"] == 1
+    assert str(ran["thread"]).startswith("jobs")
+    assert int((tmp_path / "pid").read_text()) != os.getpid()
+    assert queue.stats()["completed"] == 3
+
+
+def test_identical_waiting_jobs_are_deduplicated() -> None:
+    """Test that a job is not queued twice while an identical one waits."""
+
+    queue = make_queue(workers=1)
+    calls = []
+
+    async def job(value: int) -> None:
+        calls.append(value)
+
+    async def run() -> list[bool]:
+        queued = [
+            await queue.enqueue(job, 1),
+            await queue.enqueue(job, 1),
+            await queue.enqueue(job, 2),
+        ]
+        await queue.drain()
+        queued.append(await queue.enqueue(job, 1))
+        await queue.shutdown()
+        return queued
+
+    assert asyncio.run(run()) == [True, False, True, True]
+    assert calls == [1, 2, 1]
+    assert queue.stats()["deduplicated"] == 1
+
+
+def test_failing_jobs_are_retried() -> None:
+    """Test that failures are retried, then dropped once out of retries."""
+
+    queue = make_queue(retries=2)
+    attempts = {"flaky": 0, "broken": 0}
+
+    async def flaky() -> None:
+        attempts["flaky"] += 1
+        if attempts["flaky"] < 3:
+            raise ConnectionError
+
+    async def broken() -> None:
+        attempts["broken"] += 1
+        raise ConnectionError
+
+    async def run() -> None:
+        await queue.enqueue(flaky)
+        await queue.enqueue(broken)
+        await queue.drain()
+        await queue.shutdown()
+
+    asyncio.run(run())
+
+    assert attempts == {"flaky": 3, "broken": 3}
+    stats = queue.stats()
+    assert (stats["completed"], stats["failed"], stats["retried"]) == (1, 1, 4)
+
+
+def test_full_queue_pushes_back() -> None:
+    """Test that enqueueing waits for room, then raises when none is made."""
+
+    queue = make_queue(maxsize=1, workers=0)
+
+    async def job(value: int) -> None:
+        pass
+
+    async def run() -> None:
+        await queue.enqueue(job, 1)
+        with pytest.raises(JobQueueFullError):
+            await queue.enqueue(job, 2)
+        assert await queue.enqueue(job, 1) is False, "Deduplicated, not rejected"
+        await queue.shutdown(timeout=0.01)
+
+    asyncio.run(run())
+    assert queue.stats()["rejected"] == 1
+
+
+def test_cancelled_enqueue_is_not_deduplicated() -> None:
+    """Test that a caller cancelled while waiting for room leaves no job behind."""
+
+    queue = make_queue(maxsize=1, workers=0, put_timeout=10)
+
+    async def job(value: int) -> None:
+        pass
+
+    async def run() -> None:
+        await queue.enqueue(job, 1)
+        waiting = asyncio.create_task(queue.enqueue(job, 2))
+        await asyncio.sleep(0.01)
+        waiting.cancel()
+        await asyncio.gather(waiting, return_exceptions=True)
+
+        with pytest.raises(JobQueueFullError):
+            queue.enqueue_nowait(job, 2)
+        await queue.shutdown(timeout=0.01)
+
+    asyncio.run(run())
+    assert queue.stats()["enqueued"] == 1
+
+
+def test_enqueue_nowait_drops_jobs_when_full() -> None:
+    """Test that a full queue rejects at once instead of waiting for room."""
+
+    queue = make_queue(maxsize=1, workers=0, put_timeout=10)
+
+    async def job(value: int) -> None:
+        pass
+
+    async def run() -> None:
+        assert queue.enqueue_nowait(job, 1)
+        with pytest.raises(JobQueueFullError):
+            queue.enqueue_nowait(job, 2)
+        assert queue.enqueue_nowait(job, 1) is False, "Deduplicated, not rejected"
+        await queue.shutdown(timeout=0.01)
+
+    asyncio.run(run())
+    assert queue.stats()["rejected"] == 1
+
+
+def test_listing_warmup(
+    app: FastAPI, portal: BlockingPortal, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that listings invalidated by a write are loaded back, once each."""
+
+    monkeypatch.setattr(settings, "BLOGPOST_CACHE_WARMUP", True)
+    monkeypatch.setattr(session, "AsyncSessionLocal", async_sessionmaker(async_engine))
+
+    async def warm() -> None:
+        schedule_listing_warmup({"python"})
+        schedule_listing_warmup({"python"})
+        await job_queue.drain()
+        await job_queue.shutdown()
+
+    portal.call(warm)
+
+    assert len(blogpost_cache) == 2, "The `all` and `python` first pages"
+    assert job_queue.stats()["completed"] == 2
+
+
+def test_get_job_stats(client: TestClient, test_admin: UserExtended) -> None:
+    """Test reading the job queue counters as an admin."""
+
+    client.headers.update({"Authorization": f"Bearer {test_admin.access_token}"})
+    response = client.get("/api/admin/jobs")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["data"]["maxsize"] == settings.JOBS_QUEUE_SIZE
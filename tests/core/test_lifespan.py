@@ -0,0 +1,93 @@
+import subprocess
+import sys
+
+import pytest
+from anyio.from_thread import BlockingPortal
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import create_async_engine
+
+import app.main as main
+from app.core.config import settings
+from app.crud.blogpost import blogpost_cache
+from app.db import replicas as replicas_module
+from app.db import session
+from app.db.pool import InstrumentedAsyncQueuePool, get_pool_stats
+from app.models import Blogpost
+
+
+def test_lifespan_warms_and_disposes(
+    app: FastAPI, test_blogposts: list[Blogpost], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that startup builds and warms the pool, preloads, and disposes it."""
+
+    # Restored afterwards, the lifespan replaces them.
+    for name in ("async_engine", "AsyncSessionLocal"):
+        monkeypatch.setattr(session, name, getattr(session, name))
+    monkeypatch.setattr(replicas_module, "replicas", replicas_module.replicas)
+
+    test_settings = settings.model_copy(
+        update={
+            "DB_NAME": f"test_{settings.DB_NAME}",
+            "DB_POOL_SIZE": 3,
+            "DB_POOL_WARM": 2,
+            "APP_NAME": "Test app",
+        }
+    )
+
+    with TestClient(main.create_app(test_settings)) as client:
+        engine = session.async_engine
+        assert engine.url.database == test_settings.DB_NAME
+        stats = get_pool_stats(engine.pool)
+        assert stats["size"] == 3, "Built from the app settings"
+        assert stats["checked_in"] == 2, "The pool should be warmed"
+        assert stats["checked_out"] == 0
+        assert len(blogpost_cache) == 1, "The first listing page is preloaded"
+
+        response = client.get("/api/get/blogposts")
+        assert response.status_code == status.HTTP_200_OK
+        assert blogpost_cache.hits == 1
+        assert client.get("/").json()["message"].startswith("Welcome to Test app")
+
+    assert get_pool_stats(engine.pool)["checked_in"] == 0, "Disposed on shutdown"
+
+
+def test_import_is_lazy() -> None:
+    """Test that importing the app module builds nothing and loads no crypto."""
+
+    code = (
+        "import sys, app.main; "
+        "print('app' in vars(app.main), "
+        "[m for m in ('jose', 'passlib', 'psycopg2') if m in sys.modules])"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+
+    assert result.stdout.strip() == "False []"
+    assert isinstance(main.app, FastAPI)
+    assert main.app is main.app
+
+
+def test_warm_pool_is_capped_to_capacity(
+    portal: BlockingPortal, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that warming more connections than the pool holds does not time out."""
+
+    engine = create_async_engine(
+        settings.ASYNC_TEST_DB_URL,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=2,
+        max_overflow=1,
+        pool_timeout=0.5,
+    )
+    monkeypatch.setattr(session, "async_engine", engine)
+
+    try:
+        portal.call(session.warm_pool, 10)
+        stats = get_pool_stats(engine.pool)
+        assert stats["checkouts"] == 3
+        assert stats["timeouts"] == 0
+        assert stats["checked_in"] == 2, "The overflow connection is not kept"
+    finally:
+        portal.call(engine.dispose)
@@ -0,0 +1,72 @@
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.metrics import RequestMetrics, request_metrics
+from app.models import Blogpost
+
+
+def test_histogram_buckets() -> None:
+    """Test that observations land in cumulative buckets with sum and count."""
+
+    metrics = RequestMetrics(buckets=(0.1, 1.0))
+    for seconds in (0.05, 0.1, 0.5, 3.0):
+        metrics.started()
+        metrics.finished("GET", "/api/x", 200, seconds)
+
+    lines = list(metrics.render())
+    labels = 'method="GET",route="/api/x",status="200"'
+
+    assert f'http_request_duration_seconds_bucket{{{labels},le="0.1"}} 2' in lines
+    assert f'http_request_duration_seconds_bucket{{{labels},le="1.0"}} 3' in lines
+    assert f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 4' in lines
+    assert f"http_request_duration_seconds_sum{{{labels}}} 3.65" in lines
+    assert f"http_request_duration_seconds_count{{{labels}}} 4" in lines
+    assert "http_requests_in_flight 0" in lines
+
+
+def test_label_values_are_escaped() -> None:
+    """Test escaping quotes and backslashes in label values."""
+
+    metrics = RequestMetrics()
+    metrics.started()
+    metrics.finished("GET", '/a"b\\c', 200, 0.01)
+
+    assert any('route="/a\\"b\\\\c"' in line for line in metrics.render())
+
+
+def test_metrics_endpoint(client: TestClient, test_blogposts: list[Blogpost]) -> None:
+    """Test that requests are recorded by route template and exposed."""
+
+    client.get(f"/api/get/blogpost/{test_blogposts[0].id}")
+    client.get(f"/api/get/blogpost/{test_blogposts[1].id}")
+    client.get("/api/no/such/route")
+
+    response = client.get("/metrics")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+
+    body = response.text
+    detail = 'method="GET",route="/api/get/blogpost/{id:int}",status="200"'
+    assert f"http_request_duration_seconds_count{{{detail}}} 2" in body
+    unmatched = 'method="GET",route="<unmatched>",status="404"'
+    assert f"http_request_duration_seconds_count{{{unmatched}}} 1" in body
+    assert "http_requests_in_flight 1" in body, "The scrape itself is in flight"
+    assert "db_pool_checked_out " in body
+    assert "# TYPE db_pool_checkouts_total counter" in body
+
+
+def test_metrics_can_be_disabled(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that disabling metrics stops recording and hides the endpoint."""
+
+    monkeypatch.setattr(settings, "METRICS_ENABLED", False)
+
+    assert client.get("/metrics").status_code == status.HTTP_404_NOT_FOUND
+    assert list(request_metrics.render())[2:] == [
+        "# HELP http_requests_in_flight Requests currently being served.",
+        "# TYPE http_requests_in_flight gauge",
+        "http_requests_in_flight 0",
+    ]
@@ -0,0 +1,44 @@
+from typing import AsyncIterator
+
+from anyio.from_thread import BlockingPortal
+
+from app.core.ndjson import NDJSONLineError, batched, iter_chunks, iter_ndjson
+
+
+def decode(portal: BlockingPortal, chunks: list[bytes], max_line_bytes: int) -> list:
+    async def collect() -> list:
+        return [item async for item in iter_ndjson(iter_chunks(chunks), max_line_bytes)]
+
+    return portal.call(collect)
+
+
+def test_lines_split_across_chunks(portal: BlockingPortal) -> None:
+    """Test that lines are rebuilt whatever the chunk boundaries."""
+
+    chunks = [b'{"a": 1}\n{"a"', b": 2}\n\n", b'{"a": 3}']
+    assert decode(portal, chunks, 1024) == [(1, {"a": 1}), (2, {"a": 2}), (4, {"a": 3})]
+
+
+def test_invalid_and_oversized_lines_are_reported(portal: BlockingPortal) -> None:
+    """Test that bad lines are yielded as errors without stopping the stream."""
+
+    chunks = [b"not json\n", b'{"a": "' + b"x" * 40, b"x" * 40 + b'"}\n{"a": 1}\n']
+    items = decode(portal, chunks, 32)
+
+    assert [line for line, _ in items] == [1, 2, 3]
+    assert isinstance(items[0][1], NDJSONLineError)
+    assert str(items[1][1]) == "Line is too long"
+    assert items[2][1] == {"a": 1}
+
+
+def test_batched(portal: BlockingPortal) -> None:
+    """Test grouping an async stream into fixed size batches."""
+
+    async def numbers() -> AsyncIterator[int]:
+        for i in range(5):
+            yield i
+
+    async def collect() -> list:
+        return [batch async for batch in batched(numbers(), 2)]
+
+    assert portal.call(collect) == [[0, 1], [2, 3], [4]]
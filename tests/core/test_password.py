@@ -0,0 +1,164 @@
+import asyncio
+import time
+from typing import cast
+
+import pytest
+from anyio.from_thread import BlockingPortal
+from fastapi import status
+from fastapi.testclient import TestClient
+from passlib.context import CryptContext
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.exceptions import PasswordHasherBusyError
+from app.core.password import PasswordHasher, verify_password
+from app.crud import crud_get_user
+from tests.utils.schemas import UserExtended
+
+
+def test_hasher_keeps_loop_responsive(portal: BlockingPortal) -> None:
+    """Test that the event loop keeps running while a hash is computed."""
+
+    hasher = PasswordHasher(workers=1, max_pending=4)
+
+    async def run() -> int:
+        ticks = 0
+
+        async def tick() -> None:
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker = asyncio.create_task(tick())
+        await hasher.run(time.sleep, 0.2)
+        ticker.cancel()
+        return ticks
+
+    assert portal.call(run) >= 5, "The loop should not be blocked"
+    assert hasher.stats()["completed"] == 1
+    hasher.shutdown()
+
+
+def test_hasher_rejects_when_full(portal: BlockingPortal) -> None:
+    """Test that jobs beyond `max_pending` are rejected instead of queued."""
+
+    hasher = PasswordHasher(workers=1, max_pending=2)
+
+    async def run() -> list:
+        jobs = [hasher.run(time.sleep, 0.1) for _ in range(3)]
+        return await asyncio.gather(*jobs, return_exceptions=True)
+
+    results = portal.call(run)
+
+    assert sum(isinstance(r, PasswordHasherBusyError) for r in results) == 1
+    stats = hasher.stats()
+    assert stats["rejected"] == 1
+    assert stats["max_seen_pending"] == 2
+    assert stats["p95_wait_ms"] >= 50, "The second job should have queued"
+    hasher.shutdown()
+
+
+def test_cancelled_caller_keeps_slot_until_job_finishes(
+    portal: BlockingPortal,
+) -> None:
+    """Test that a job still running for a cancelled caller counts as pending."""
+
+    hasher = PasswordHasher(workers=1, max_pending=1)
+
+    async def run() -> tuple[int, int]:
+        task = asyncio.create_task(hasher.run(time.sleep, 0.2))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        during = hasher.pending
+
+        with pytest.raises(PasswordHasherBusyError):
+            await hasher.run(time.sleep, 0)
+
+        await asyncio.sleep(0.3)
+        return during, hasher.pending
+
+    assert portal.call(run) == (1, 0)
+    assert hasher.stats()["completed"] == 1
+    hasher.shutdown()
+
+
+def test_login_rehashes_outdated_password(
+    client: TestClient,
+    db_session: AsyncSession,
+    portal: BlockingPortal,
+    test_user: UserExtended,
+) -> None:
+    """Test that a hash made with a lower cost is upgraded on login."""
+
+    user = portal.call(crud_get_user, db_session, test_user.id)
+    assert user is not None
+    weak = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4)
+    user.password = weak.hash(test_user.unhashed_password)
+    portal.call(db_session.commit)
+
+    response = client.post(
+        "/api/login",
+        data={"username": test_user.username, "password": test_user.unhashed_password},
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    password = cast(str, user.password)
+    assert password.startswith(f"$2b${settings.BCRYPT_ROUNDS:02d}$")
+    assert verify_password(test_user.unhashed_password, password)
+
+
+def test_update_password(client: TestClient, test_user: UserExtended) -> None:
+    """Test changing a password checks the old hash and stores a new one."""
+
+    payload = {
+        "old_password": "WrongPassword1!",
+        "new_password": "NewPassword123!",
+        "new_password2": "NewPassword123!",
+    }
+    response = client.put(f"/api/update/password/{test_user.id}", json=payload)
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    payload["old_password"] = test_user.unhashed_password
+    response = client.put(f"/api/update/password/{test_user.id}", json=payload)
+    assert response.status_code == status.HTTP_200_OK
+
+    response = client.post(
+        "/api/login",
+        data={"username": test_user.username, "password": "NewPassword123!"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.parametrize("path", ["/api/login", "/api/create/user"])
+def test_busy_hasher_returns_503(
+    client: TestClient,
+    test_user: UserExtended,
+    monkeypatch: pytest.MonkeyPatch,
+    path: str,
+) -> None:
+    """Test that a full hashing queue is reported as a retryable 503."""
+
+    from app.core import password
+
+    monkeypatch.setattr(password.password_hasher, "max_pending", 0)
+
+    if path == "/api/login":
+        response = client.post(
+            path,
+            data={"username": test_user.username, "password": "SecurePassword123"},
+        )
+    else:
+        response = client.post(
+            path,
+            json={
+                "username": "other",
+                "email": "other@gmail.com",
+                "password": "SecurePassword123!",
+                "password2": "SecurePassword123!",
+            },
+        )
+
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response.headers["Retry-After"] == "1"
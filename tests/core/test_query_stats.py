@@ -0,0 +1,98 @@
+import logging
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.db.instrumentation import QueryStats, statement_shape
+from app.models import Blogpost
+from tests.conftest import async_engine
+from tests.utils.queries import assert_max_queries
+
+
+@pytest.mark.parametrize(
+    "url, budget",
+    [
+        ("/api/get/blogposts", 2),
+        ("/api/get/blogposts/python", 2),
+        ("/api/get/blogpost/blogpost_0", 2),
+        ("/api/search/blogposts?q=blogpost", 2),
+        ("/api/get/tags/stats", 2),
+    ],
+)
+def test_query_budget(
+    client: TestClient, test_blogposts: list[Blogpost], url: str, budget: int
+) -> None:
+    """Test that read endpoints stay within their query budget, uncached."""
+
+    with assert_max_queries(async_engine.sync_engine, budget):
+        response = client.get(url)
+
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_statement_shape() -> None:
+    """Test that bound values and IN list lengths do not change the shape."""
+
+    one = statement_shape("SELECT * FROM tags WHERE id IN ($1)\n  AND x = $2")
+    many = statement_shape("SELECT * FROM tags WHERE id IN ($1, $2, $3) AND x = $4")
+
+    assert one == many == "SELECT * FROM tags WHERE id IN (?) AND x = ?"
+
+
+def test_query_stats_records(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test counting, timing, slow statements and repeated shapes."""
+
+    monkeypatch.setattr(settings, "SQL_SLOW_QUERY_MS", 50)
+    stats = QueryStats()
+    for id in range(3):
+        stats.record(f"SELECT * FROM users WHERE id = ${id + 1}", 0.01)
+    stats.record("SELECT * FROM tags", 0.06)
+
+    assert stats.count == 4
+    assert stats.total_time == pytest.approx(0.09)
+    assert stats.slow == [("SELECT * FROM tags", 0.06)]
+    assert stats.repeated(2) == [("SELECT * FROM users WHERE id = ?", 3)]
+    assert stats.repeated(3) == []
+    assert stats.server_timing() == 'db;dur=90.0;desc="4 queries"'
+
+
+def test_server_timing_in_dev(
+    client: TestClient,
+    test_blogposts: list[Blogpost],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that the request's query count is only sent in dev mode."""
+
+    monkeypatch.setattr(settings, "IS_DEV", True)
+    response = client.get("/api/get/blogposts/sql")
+    assert response.headers["server-timing"].endswith('desc="2 queries"')
+
+    monkeypatch.setattr(settings, "IS_DEV", False)
+    response = client.get("/api/get/blogposts/python")
+    assert "server-timing" not in response.headers
+
+
+def test_repeated_statements_are_logged(
+    client: TestClient,
+    test_blogposts: list[Blogpost],
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test the N+1 warning for shapes repeated over the threshold."""
+
+    monkeypatch.setattr(settings, "SQL_REPEAT_WARN_THRESHOLD", 1)
+    with caplog.at_level(logging.WARNING, logger="app.db.instrumentation"):
+        for slug in ("blogpost_0", "blogpost_1"):
+            client.get(f"/api/get/blogpost/{slug}")
+
+    assert not caplog.records, "Each request is counted on its own"
+
+    monkeypatch.setattr(settings, "SQL_REPEAT_WARN_THRESHOLD", 0)
+    with caplog.at_level(logging.WARNING, logger="app.db.instrumentation"):
+        client.get("/api/get/blogpost/blogpost_2")
+
+    assert len(caplog.records) == 2
+    assert "possible N+1" in caplog.records[0].getMessage()
+    assert "GET /api/get/blogpost/blogpost_2" in caplog.records[0].getMessage()
@@ -0,0 +1,134 @@
+import pytest
+from anyio.from_thread import BlockingPortal
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.password import password_hasher
+from app.core.ratelimit import (
+    MemoryCounterStore,
+    Rate,
+    SlidingWindowLimiter,
+    TokenBucketLimiter,
+)
+from tests.conftest import async_engine
+from tests.utils.queries import count_queries
+from tests.utils.schemas import UserExtended
+
+
+class FakeClock:
+    def __init__(self, now: float = 0.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_parse_rate() -> None:
+    """Test the `<limit>/<period>` rate notation."""
+
+    assert Rate.parse("5/minute") == Rate(5, 60)
+    assert Rate.parse("100/hours") == Rate(100, 3600)
+    with pytest.raises(ValueError):
+        Rate.parse("5 per minute")
+
+
+def test_token_bucket(portal: BlockingPortal) -> None:
+    """Test bursts up to the limit, then one token per refill interval."""
+
+    clock = FakeClock()
+    limiter = TokenBucketLimiter(clock=clock)
+    rate = Rate(3, 60)
+
+    results = [portal.call(limiter.hit, "key", rate) for _ in range(4)]
+    assert results[:3] == [0, 0, 0]
+    assert results[3] == pytest.approx(20), "One token refills every 20 seconds"
+
+    clock.now = 20
+    assert portal.call(limiter.hit, "key", rate) == 0
+    assert portal.call(limiter.hit, "other", rate) == 0, "Keys are independent"
+
+
+def test_sliding_window(portal: BlockingPortal) -> None:
+    """Test that the previous window still counts while it slides out."""
+
+    clock = FakeClock(600)
+    limiter = SlidingWindowLimiter(MemoryCounterStore(clock=clock), clock=clock)
+    rate = Rate(4, 60)
+
+    assert [portal.call(limiter.hit, "key", rate) for _ in range(4)] == [0] * 4
+    assert portal.call(limiter.hit, "key", rate) == pytest.approx(60)
+
+    # Halfway through the next window, half of the 5 previous hits remain.
+    clock.now = 690
+    assert portal.call(limiter.hit, "key", rate) == 0
+    assert portal.call(limiter.hit, "key", rate) > 0
+
+
+def test_login_is_limited_before_any_query(
+    client: TestClient, test_user: UserExtended, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that rejected logins do no database or password work."""
+
+    monkeypatch.setattr(settings, "RATE_LIMIT_LOGIN_USERNAME", "2/minute")
+    data = {"username": test_user.username, "password": "WrongPassword"}
+
+    for _ in range(2):
+        response = client.post("/api/login", data=data)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    verified = password_hasher.stats()["completed"]
+    with count_queries(async_engine.sync_engine) as counter:
+        response = client.post("/api/login", data=data)
+
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert int(response.headers["Retry-After"]) >= 1
+    assert counter.count == 0, "Rejected logins should not query the database"
+    assert password_hasher.stats()["completed"] == verified, "Nor verify passwords"
+
+    other = {"username": "someone", "password": "WrongPassword"}
+    response = client.post("/api/login", data=other)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED, "Per username"
+
+
+def test_login_limited_by_ip(
+    client: TestClient, test_user: UserExtended, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test the per IP login limit across usernames."""
+
+    monkeypatch.setattr(settings, "RATE_LIMIT_LOGIN", "3/minute")
+
+    statuses = [
+        client.post(
+            "/api/login", data={"username": f"user{i}", "password": "x"}
+        ).status_code
+        for i in range(4)
+    ]
+    assert statuses == [401, 401, 401, 429]
+
+
+def test_write_endpoints_are_limited(
+    client: TestClient, test_user: UserExtended, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test the write limit on authenticated endpoints."""
+
+    monkeypatch.setattr(settings, "RATE_LIMIT_WRITE", "2/minute")
+    headers = {"Authorization": f"Bearer {test_user.access_token}"}
+    url = f"/api/update/user/{test_user.id}"
+
+    assert client.put(url, json={}, headers=headers).status_code == 200
+    assert client.put(url, json={}, headers=headers).status_code == 200
+    assert client.put(url, json={}, headers=headers).status_code == 429
+
+
+def test_rate_limit_disabled(
+    client: TestClient, test_user: UserExtended, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that limits can be switched off."""
+
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", False)
+    monkeypatch.setattr(settings, "RATE_LIMIT_LOGIN", "1/minute")
+
+    for _ in range(3):
+        response = client.post("/api/login", data={"username": "x", "password": "x"})
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
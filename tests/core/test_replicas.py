@@ -0,0 +1,214 @@
+import time
+from typing import cast
+
+import pytest
+from anyio.from_thread import BlockingPortal
+from fastapi import FastAPI, Request, status
+from fastapi.testclient import TestClient
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.enums import UserRoles
+from app.core.jwt import create_access_token
+from app.db import replicas as replicas_module
+from app.db import session
+from app.db.replicas import (
+    PIN_COOKIE,
+    ReadYourWritesMiddleware,
+    ReplicaSet,
+    create_replica_engine,
+    is_pinned_to_primary,
+    open_replica_session,
+)
+from app.db.session import get_read_db
+from app.models import Blogpost, User
+from tests.conftest import engine
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def fake_engine() -> AsyncEngine:
+    # Stands in for a replica engine where it is only compared, never used.
+    return cast(AsyncEngine, object())
+
+
+def make_request(cookie: str | None = None) -> Request:
+    headers = [(b"cookie", cookie.encode())] if cookie else []
+    return Request({"type": "http", "method": "GET", "headers": headers})
+
+
+def test_round_robin_skips_replicas_marked_down() -> None:
+    """Test that a replica marked down is skipped until its retry interval."""
+
+    first, second = fake_engine(), fake_engine()
+    clock = FakeClock()
+    replica_set = ReplicaSet([first, second], retry_interval=30, clock=clock)
+
+    assert [replica_set.choose() for _ in range(4)] == [first, second, first, second]
+
+    replica_set.mark_down(first)
+    assert [replica_set.choose() for _ in range(3)] == [second, second, second]
+    assert replica_set.healthy() == [second]
+
+    replica_set.mark_down(second)
+    assert replica_set.choose() is None, "No healthy replica left"
+
+    clock.now = 31
+    assert {replica_set.choose(), replica_set.choose()} == {first, second}
+
+
+def test_empty_replica_set() -> None:
+    """Test that no replica configured means reading from the primary."""
+
+    replica_set = ReplicaSet([])
+
+    assert not replica_set
+    assert replica_set.choose() is None
+
+
+def test_pinned_to_primary_after_a_write() -> None:
+    """Test that the pin cookie holds for the window and forged values are ignored."""
+
+    now = time.time()
+    window = settings.READ_YOUR_WRITES_WINDOW
+
+    assert is_pinned_to_primary(make_request(f"{PIN_COOKIE}={now + window - 1}"))
+    assert not is_pinned_to_primary(make_request(f"{PIN_COOKIE}={now - 1}"))
+    assert not is_pinned_to_primary(make_request(f"{PIN_COOKIE}={now + 3600}"))
+    assert not is_pinned_to_primary(make_request(f"{PIN_COOKIE}=soon"))
+    assert not is_pinned_to_primary(make_request())
+
+
+def test_writes_set_the_pin_cookie(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that successful writes pin the client, reads and failures do not."""
+
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware)
+
+    @app.get("/read")
+    def read(request: Request) -> dict:
+        return {"pinned": is_pinned_to_primary(request)}
+
+    @app.post("/write")
+    def write() -> dict:
+        return {}
+
+    @app.post("/fail", status_code=400)
+    def fail() -> dict:
+        return {}
+
+    client = TestClient(app)
+
+    assert PIN_COOKIE not in client.post("/write").cookies, "No replica configured"
+
+    monkeypatch.setattr(replicas_module, "replicas", ReplicaSet([fake_engine()]))
+
+    assert PIN_COOKIE not in client.get("/read").cookies
+    assert PIN_COOKIE not in client.post("/fail").cookies
+    assert client.get("/read").json() == {"pinned": False}
+
+    response = client.post("/write")
+    assert PIN_COOKIE in response.cookies
+    assert "HttpOnly" in response.headers["set-cookie"]
+    assert client.get("/read").json() == {"pinned": True}
+
+
+def test_unreachable_replica_falls_back(
+    portal: BlockingPortal, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that an unreachable replica is marked down and a healthy one is used."""
+
+    monkeypatch.setattr(settings, "DB_REPLICA_CONNECT_TIMEOUT", 1)
+    down = create_replica_engine(
+        settings.ASYNC_TEST_DB_URL.replace(f":{settings.DB_PORT}/", ":1/", 1)
+    )
+    up = create_replica_engine(settings.ASYNC_TEST_DB_URL)
+    replica_set = ReplicaSet([down, up])
+    monkeypatch.setattr(replicas_module, "replicas", replica_set)
+
+    async def read() -> tuple:
+        db = await open_replica_session(make_request())
+        assert db is not None
+        async with db:
+            read_only = await db.scalar(text("SHOW transaction_read_only"))
+            return db.bind, read_only
+
+    try:
+        bind, read_only = portal.call(read)
+        assert bind.pool is up.pool
+        assert read_only == "on", "Replica sessions are read-only"
+        assert replica_set.healthy() == [up]
+
+        replica_set.mark_down(up)
+        assert portal.call(open_replica_session, make_request()) is None
+    finally:
+        portal.call(replica_set.dispose)
+
+
+def test_pinned_read_sees_the_write_behind_a_lagging_replica(
+    app: FastAPI,
+    client: TestClient,
+    db_session: AsyncSession,
+    portal: BlockingPortal,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that a lagging replica read cannot cache data a pinned writer sees."""
+
+    # Committed, so the replica sees the blogpost as it was before the write.
+    with engine.begin() as conn:
+        user_id = conn.scalar(
+            insert(User).returning(User.id),
+            {
+                "username": "writer",
+                "email": "writer@example.com",
+                "password": "unused",
+                "role": UserRoles.ADMIN,
+                "is_active": True,
+            },
+        )
+        blogpost_id = conn.scalar(
+            insert(Blogpost).returning(Blogpost.id),
+            {
+                "title": "Before",
+                "slug": "lagging",
+                "author_id": user_id,
+                "banner": "banner.png",
+                "content": "Content",
+                "preview": "Preview",
+            },
+        )
+
+    # Primary sessions join the test transaction, which the replica never
+    # sees: it lags every write made by the test.
+    replica_set = ReplicaSet([create_replica_engine(settings.ASYNC_TEST_DB_URL)])
+    monkeypatch.setattr(replicas_module, "replicas", replica_set)
+    monkeypatch.setattr(
+        session,
+        "AsyncSessionLocal",
+        async_sessionmaker(bind=db_session.bind, expire_on_commit=False),
+    )
+    del app.dependency_overrides[get_read_db]
+
+    reader = TestClient(app)
+    reader.portal = portal
+    path = f"/api/get/blogpost/{blogpost_id}"
+
+    try:
+        client.headers["Authorization"] = f"Bearer {create_access_token(str(user_id))}"
+        response = client.put(
+            f"/api/update/blogpost/{blogpost_id}", json={"title": "After"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert PIN_COOKIE in client.cookies
+
+        assert reader.get(path).json()["data"]["title"] == "Before", "Replica lags"
+        assert client.get(path).json()["data"]["title"] == "After", "Pinned read"
+    finally:
+        portal.call(replica_set.dispose)
@@ -0,0 +1,64 @@
+import asyncio
+import json
+
+from fastapi import status
+from fastapi.routing import serialize_response
+from fastapi.testclient import TestClient
+from fastapi.utils import create_model_field
+
+from app.core.responses import FastJSONResponse, envelope
+from app.models import Blogpost
+from app.schemas import BlogpostListItem, PageBase, ResponseBase
+
+
+def test_envelope_matches_response_model(test_blogposts: list[Blogpost]) -> None:
+    """Test that the single pass body equals the validated one."""
+
+    data = {
+        "items": [BlogpostListItem.model_validate(b) for b in test_blogposts],
+        "next_cursor": "cursor",
+    }
+    field = create_model_field(
+        "Response", ResponseBase[PageBase[BlogpostListItem]], mode="serialization"
+    )
+    validated = asyncio.run(
+        serialize_response(
+            field=field, response_content={"success": True, "data": data}
+        )
+    )
+
+    response = envelope(data)
+
+    assert response.media_type == "application/json"
+    assert json.loads(bytes(response.body)) == validated
+    assert FastJSONResponse(validated).body == response.body
+
+
+def test_listing_keeps_envelope(
+    client: TestClient, test_blogposts: list[Blogpost]
+) -> None:
+    """Test that listings served by `envelope` keep every envelope field."""
+
+    response = client.get("/api/get/blogposts", params={"limit": 2})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/json"
+    assert "etag" in response.headers
+
+    body = response.json()
+    assert body.keys() == {"success", "message", "data", "error"}
+    assert body["success"] is True
+    assert body["data"]["items"][0]["created_at"] == (
+        test_blogposts[0].created_at.isoformat()
+    )
+
+
+def test_errors_keep_envelope(client: TestClient) -> None:
+    """Test that error responses are unchanged by the default response class."""
+
+    response = client.get("/api/get/blogpost/404")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json() == {"detail": "Blogpost not found"}
+
+    response = client.get("/api/get/blogposts", params={"limit": 0})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert response.json()["detail"][0]["loc"] == ["query", "limit"]
@@ -0,0 +1,160 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import timedelta
+from typing import AsyncIterator
+
+import pytest
+from anyio.from_thread import BlockingPortal
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.jwt import verify_access_token
+from app.core.revocation import (
+    RevocationList,
+    prune_revoked_tokens,
+    token_revocations,
+)
+from app.crud import crud_revoke_token
+from app.db.base import utc_now
+from app.models import RevokedToken
+from tests.conftest import async_engine
+from tests.utils.queries import count_queries
+from tests.utils.schemas import UserExtended
+
+FINGERPRINT = "3f1c838b9f6a05f4b482e8f3a6a4a243"
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def count_revoked_tokens(db: AsyncSession) -> int:
+    return await db.scalar(select(func.count()).select_from(RevokedToken)) or 0
+
+
+def login(client: TestClient, user: UserExtended) -> tuple[str, str]:
+    response = client.post(
+        "/api/login",
+        data={"username": user.username, "password": user.unhashed_password},
+        headers={"x-Device-Fingerprint": FINGERPRINT},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    return response.json()["data"]["access_token"], response.cookies["refresh_token"]
+
+
+def refresh(client: TestClient, access_token: str, refresh_token: str) -> int:
+    client.cookies.set("refresh_token", refresh_token)
+    response = client.post(
+        "/api/refresh",
+        headers={
+            "Authorization": f"Bearer {access_token}",
+            "x-Device-Fingerprint": FINGERPRINT,
+        },
+    )
+    return response.status_code
+
+
+def test_refresh_token_has_jti(client: TestClient, test_user: UserExtended) -> None:
+    """Test that every refresh token carries a unique id."""
+
+    _, first = login(client, test_user)
+    _, second = login(client, test_user)
+
+    assert verify_access_token(first)["jti"] != verify_access_token(second)["jti"]
+
+
+def test_logout_revokes_refresh_token(
+    client: TestClient, test_user: UserExtended
+) -> None:
+    """Test that a refresh token cannot be used after logout."""
+
+    access_token, refresh_token = login(client, test_user)
+    assert refresh(client, access_token, refresh_token) == status.HTTP_200_OK
+
+    client.cookies.set("refresh_token", refresh_token)
+    client.post("/api/logout")
+
+    assert refresh(client, access_token, refresh_token) == 401
+
+
+def test_unrevoked_refresh_skips_database(
+    client: TestClient, test_user: UserExtended
+) -> None:
+    """Test that the not-revoked case is answered by the filter alone."""
+
+    access_token, refresh_token = login(client, test_user)
+    refresh(client, access_token, refresh_token)
+
+    with count_queries(async_engine.sync_engine) as counter:
+        assert refresh(client, access_token, refresh_token) == status.HTTP_200_OK
+
+    assert counter.count == 0
+    assert token_revocations.db_checks == 0
+
+
+def test_revocations_sync_and_rebuild(
+    db_session: AsyncSession, portal: BlockingPortal
+) -> None:
+    """Test picking up revocations of other workers and dropping expired ones."""
+
+    clock = FakeClock()
+    revocations = RevocationList(
+        capacity=100, error_rate=0.01, sync_interval=5, prune_interval=60, clock=clock
+    )
+    later = utc_now() + timedelta(days=1)
+
+    portal.call(crud_revoke_token, db_session, "a" * 32, later)
+    assert portal.call(revocations.is_revoked, db_session, "a" * 32)
+
+    # Revoked by another worker: visible after the next sync.
+    portal.call(crud_revoke_token, db_session, "b" * 32, later)
+    assert not portal.call(revocations.is_revoked, db_session, "b" * 32)
+    clock.now = 5
+    assert portal.call(revocations.is_revoked, db_session, "b" * 32)
+
+    portal.call(crud_revoke_token, db_session, "c" * 32, utc_now())
+    clock.now = 60
+    assert not portal.call(revocations.is_revoked, db_session, "c" * 32)
+    assert "c" * 32 not in revocations.filter, "Expired rows should be dropped"
+    assert portal.call(count_revoked_tokens, db_session) == 3, "Sync only reads"
+
+
+def test_expired_revocations_are_pruned_in_background(
+    db_session: AsyncSession, portal: BlockingPortal
+) -> None:
+    """Test that the pruning task deletes expired rows on its own session."""
+
+    portal.call(crud_revoke_token, db_session, "a" * 32, utc_now())
+    portal.call(crud_revoke_token, db_session, "b" * 32, utc_now() + timedelta(1))
+
+    pruned = asyncio.Event()
+
+    @asynccontextmanager
+    async def sessionmaker() -> AsyncIterator[AsyncSession]:
+        yield db_session
+        pruned.set()
+
+    async def prune_once() -> None:
+        task = asyncio.create_task(prune_revoked_tokens(sessionmaker, 0.01))
+        await pruned.wait()
+        task.cancel()
+
+    portal.call(asyncio.wait_for, prune_once(), 5)
+    assert portal.call(count_revoked_tokens, db_session) == 1
+
+
+@pytest.mark.parametrize("cookie", ["garbage", None])
+def test_logout_without_valid_refresh_token(
+    client: TestClient, cookie: str | None
+) -> None:
+    """Test that logout succeeds whatever the refresh cookie holds."""
+
+    if cookie:
+        client.cookies.set("refresh_token", cookie)
+    assert client.post("/api/logout").status_code == status.HTTP_200_OK
@@ -0,0 +1,118 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+from anyio.from_thread import BlockingPortal
+from sqlalchemy import text
+
+from app.cli import serve as serve_module
+from app.cli.serve import pin_pool_sizes, serve, size_pools, worker_count
+from app.core.config import settings
+from app.db import session
+from app.db.pool import InstrumentedAsyncQueuePool
+
+
+def test_size_pools() -> None:
+    """Test that per-worker pools are only shrunk to fit the connection limit."""
+
+    assert size_pools(100, 10, 4, pool_size=5, max_overflow=10) == (5, 10)
+    assert size_pools(100, 10, 8, pool_size=5, max_overflow=10) == (5, 6)
+    assert size_pools(30, 10, 8, pool_size=5, max_overflow=10) == (2, 0)
+
+    with pytest.raises(ValueError):
+        size_pools(15, 10, 8, pool_size=5, max_overflow=10)
+
+
+def test_worker_count(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that workers default to the setting, then to the CPU count."""
+
+    monkeypatch.setattr(serve_module, "available_cpus", lambda: 6)
+
+    assert worker_count() == 6
+    assert worker_count(3) == 3
+
+    monkeypatch.setattr(settings, "SERVER_WORKERS", 2)
+    assert worker_count() == 2
+
+
+def test_pin_pool_sizes(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that pinned sizes reach the settings and the workers' environment."""
+
+    monkeypatch.setattr(settings, "DB_MAX_CONNECTIONS", 50)
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 5)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 10)
+    monkeypatch.setenv("DB_POOL_SIZE", "5")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "10")
+
+    pin_pool_sizes(workers=5)
+
+    assert (settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW) == (5, 3)
+    assert (os.environ["DB_POOL_SIZE"], os.environ["DB_MAX_OVERFLOW"]) == ("5", "3")
+
+
+def test_pin_pool_sizes_reads_the_server_limit(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that max_connections is read from the server when not configured."""
+
+    monkeypatch.setattr(settings, "DB_MAX_CONNECTIONS", None)
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 1000)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 0)
+    monkeypatch.setenv("DB_POOL_SIZE", "1000")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "0")
+
+    pin_pool_sizes(workers=1)
+
+    assert settings.DB_POOL_SIZE < 1000
+
+
+def test_serve(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that serve runs uvicorn with the sized workers and drain timeout."""
+
+    calls = []
+    fake_uvicorn = SimpleNamespace(run=lambda *args, **kwargs: calls.append(kwargs))
+    monkeypatch.setattr(serve_module, "uvicorn", fake_uvicorn)
+    monkeypatch.setattr(serve_module, "pin_pool_sizes", lambda workers: None)
+
+    serve(workers=3, port=9000)
+
+    assert calls[0]["workers"] == 3
+    assert calls[0]["port"] == 9000
+    assert calls[0]["host"] == settings.SERVER_HOST
+    assert calls[0]["timeout_graceful_shutdown"] == settings.SERVER_GRACEFUL_TIMEOUT
+
+    monkeypatch.setattr(serve_module, "uvicorn", None)
+    with pytest.raises(SystemExit):
+        serve()
+
+
+def test_forked_child_gets_a_fresh_pool(portal: BlockingPortal) -> None:
+    """Test that a forked process does not reuse the connections of its parent."""
+
+    async def checkout() -> None:
+        async with session.async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    portal.call(checkout)
+    parent_pool = session.async_engine.pool
+    assert isinstance(parent_pool, InstrumentedAsyncQueuePool)
+    assert parent_pool.checkedin() >= 1
+
+    read, write = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        pool = session.async_engine.pool
+        fresh = (
+            pool is not parent_pool
+            and isinstance(pool, InstrumentedAsyncQueuePool)
+            and pool.checkedin() == 0
+            and pool.stats.checkouts == 0
+        )
+        os.write(write, b"1" if fresh else b"0")
+        os._exit(0)
+
+    os.close(write)
+    os.waitpid(pid, 0)
+    assert os.read(read, 1) == b"1"
+    os.close(read)
+    assert session.async_engine.pool is parent_pool, "The parent keeps its pool"
@@ -0,0 +1,24 @@
+import asyncio
+import time
+
+from anyio.from_thread import BlockingPortal
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tests.conftest import async_engine
+
+
+def test_slow_queries_do_not_block_the_event_loop(portal: BlockingPortal) -> None:
+    """Test that concurrent queries overlap instead of running one after another."""
+
+    async def sleep_query() -> None:
+        async with AsyncSession(async_engine) as session:
+            await session.execute(text("SELECT pg_sleep(0.3)"))
+
+    async def run_concurrently() -> float:
+        start = time.perf_counter()
+        await asyncio.gather(*(sleep_query() for _ in range(4)))
+        return time.perf_counter() - start
+
+    elapsed = portal.call(run_concurrently)
+    assert elapsed < 0.9, "Four 0.3s queries should run concurrently"
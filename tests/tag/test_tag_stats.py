@@ -0,0 +1,103 @@
+from anyio.from_thread import BlockingPortal
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.enums import Tier
+from app.models import Blogpost, Project, Tech
+from tests.conftest import async_engine
+from tests.utils.queries import count_queries
+from tests.utils.schemas import UserExtended
+
+
+def get_counts(client: TestClient, facet: str) -> dict:
+    response = client.get("/api/get/tags/stats")
+    assert response.status_code == status.HTTP_200_OK
+    return {item["name"]: item["count"] for item in response.json()["data"][facet]}
+
+
+def test_tag_stats_counts_posts(
+    client: TestClient, test_blogposts: list[Blogpost]
+) -> None:
+    """Test the number of posts per tag, most used first."""
+
+    response = client.get("/api/get/tags/stats")
+    assert response.status_code == status.HTTP_200_OK
+
+    tags = response.json()["data"]["tags"]
+    assert [(tag["name"], tag["count"]) for tag in tags] == [
+        ("sql", 25),
+        ("python", 13),
+    ]
+
+
+def test_tag_stats_follow_writes(
+    client: TestClient,
+    test_admin: UserExtended,
+    test_blogposts: list[Blogpost],
+) -> None:
+    """Test that deactivating, retagging and deleting posts move the counts."""
+
+    headers = {"Authorization": f"Bearer {test_admin.access_token}"}
+    python_post = next(b for b in test_blogposts if len(b.tags) == 2)
+    sql_posts = [b for b in test_blogposts if len(b.tags) == 1]
+
+    client.put(
+        f"/api/update/blogpost/{python_post.id}",
+        json={"is_active": False},
+        headers=headers,
+    )
+    assert get_counts(client, "tags") == {"sql": 24, "python": 12}
+
+    client.put(
+        f"/api/update/blogpost/{python_post.id}",
+        json={"is_active": True},
+        headers=headers,
+    )
+    client.put(
+        f"/api/update/blogpost/{sql_posts[0].id}",
+        json={"tags": [{"id": None, "name": "python", "icon": "python.svg"}]},
+        headers=headers,
+    )
+    client.delete(f"/api/delete/blogpost/{sql_posts[1].id}", headers=headers)
+
+    assert get_counts(client, "tags") == {"sql": 23, "python": 14}
+
+
+def test_tech_stats_counts_active_projects(
+    client: TestClient,
+    db_session: AsyncSession,
+    portal: BlockingPortal,
+    test_user: UserExtended,
+) -> None:
+    """Test the number of active projects per tech."""
+
+    python, docker = Tech(name="python"), Tech(name="docker")
+    db_session.add_all(
+        Project(
+            title=f"Project {i}",
+            oneliner="One liner",
+            description="Description",
+            author_id=test_user.id,
+            tier=Tier.A,
+            techs=[python, docker] if i < 2 else [python],
+            is_active=i != 3,
+        )
+        for i in range(4)
+    )
+    portal.call(db_session.commit)
+
+    assert get_counts(client, "techs") == {"python": 3, "docker": 2}
+
+
+def test_tag_stats_do_not_aggregate(
+    client: TestClient, test_blogposts: list[Blogpost]
+) -> None:
+    """Test that reading the facets never counts the link tables."""
+
+    with count_queries(async_engine.sync_engine) as counter:
+        response = client.get("/api/get/tags/stats")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert counter.count == 2
+    assert not any("count(" in statement.lower() for statement in counter.statements)
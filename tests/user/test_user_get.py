@@ -1,19 +1,20 @@
 import pytest
+from anyio.from_thread import BlockingPortal
 from fastapi import status
 from fastapi.testclient import TestClient
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.crud import crud_get_user
 from tests.utils.schemas import UserExtended
 
 
 def test_crud_get_user_raises_value_error_if_not_user_or_id(
-    db_session: Session,
+    db_session: AsyncSession, portal: BlockingPortal
 ) -> None:
     """Test creating a user with missing id."""
 
     with pytest.raises(ValueError, match="Either id or username must be provided."):
-        crud_get_user(db=db_session)
+        portal.call(crud_get_user, db_session)
 
 
 def test_get_user_success(client: TestClient, test_user: UserExtended) -> None:
@@ -0,0 +1,123 @@
+import pytest
+from anyio.from_thread import BlockingPortal
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.enums import UserRoles
+from app.core.password import hash_password
+from app.crud import crud_create_user, crud_get_user
+from app.crud.user import user_login_query
+from tests.utils.schemas import UserExtended
+
+
+@pytest.mark.parametrize("login", ["TestUser", "TEST@GMAIL.COM"])
+def test_login_ignores_case(
+    client: TestClient, test_user: UserExtended, login: str
+) -> None:
+    """Test logging in with the username or email in another casing."""
+
+    response = client.post(
+        "/api/login", data={"username": login, "password": test_user.unhashed_password}
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_login_with_legacy_username_containing_at(
+    client: TestClient, db_session: AsyncSession, portal: BlockingPortal
+) -> None:
+    """Test that usernames stored before "@" was rejected can still log in."""
+
+    user_data = {
+        "username": "legacy@name",
+        "email": "legacy@gmail.com",
+        "password": hash_password("SecurePassword123"),
+        "role": UserRoles.USER,
+        "is_active": True,
+    }
+    user = portal.call(crud_create_user, user_data, db_session)
+
+    response = client.post(
+        "/api/login",
+        data={"username": "Legacy@Name", "password": "SecurePassword123"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    found = portal.call(crud_get_user, db_session, None, "legacy@gmail.com")
+    assert found is not None and found.id == user.id
+
+
+def test_uniqueness_checks_their_own_column(
+    db_session: AsyncSession, portal: BlockingPortal, test_user: UserExtended
+) -> None:
+    """Test that an email without "@" is not compared to the usernames."""
+
+    user_data = {
+        "username": "other",
+        "email": test_user.username,
+        "password": hash_password("SecurePassword123"),
+        "role": UserRoles.USER,
+        "is_active": True,
+    }
+
+    user = portal.call(crud_create_user, user_data, db_session)
+    assert user.email == test_user.username
+
+
+def test_usernames_are_unique_ignoring_case(
+    client: TestClient, test_user: UserExtended
+) -> None:
+    """Test that usernames and emails only differing in case conflict."""
+
+    user = {
+        "username": "TESTUSER",
+        "email": "other@gmail.com",
+        "password": "SecurePassword123!",
+        "password2": "SecurePassword123!",
+    }
+    response = client.post("/api/create/user", json=user)
+    assert response.status_code == status.HTTP_409_CONFLICT
+
+    user.update(username="other", email="Test@Gmail.com")
+    response = client.post("/api/create/user", json=user)
+    assert response.status_code == status.HTTP_409_CONFLICT
+
+    user.update(username="with@sign", email="other@gmail.com")
+    response = client.post("/api/create/user", json=user)
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.parametrize(
+    "login, index",
+    [
+        ("TestUser", "ix_users_username_lower"),
+        ("Test@Gmail.com", "ix_users_email_lower"),
+    ],
+)
+def test_login_lookup_plan(
+    db_session: AsyncSession,
+    portal: BlockingPortal,
+    test_user: UserExtended,
+    login: str,
+    index: str,
+) -> None:
+    """Test that a login lookup is a single probe of one lower() index."""
+
+    query = user_login_query(login).compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+
+    async def explain() -> dict:
+        # Tiny test tables would be scanned sequentially regardless.
+        await db_session.execute(text("SET LOCAL enable_seqscan = off"))
+        result = await db_session.execute(text(f"EXPLAIN (FORMAT JSON) {query}"))
+        return result.scalar_one()[0]["Plan"]
+
+    plan = portal.call(explain)
+
+    assert plan["Node Type"] == "Index Scan", plan
+    assert plan["Index Name"] == index
+    assert "Plans" not in plan, "No other scan should be involved"
+    found = portal.call(crud_get_user, db_session, None, login)
+    assert found is not None and found.id == test_user.id
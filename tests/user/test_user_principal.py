@@ -0,0 +1,75 @@
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from tests.conftest import async_engine
+from tests.utils.queries import count_queries
+from tests.utils.schemas import UserExtended
+
+
+def auth_headers(user: UserExtended) -> dict:
+    return {"Authorization": f"Bearer {user.access_token}"}
+
+
+def test_principal_is_cached(client: TestClient, test_admin: UserExtended) -> None:
+    """Test that repeated authenticated requests skip the user lookup."""
+
+    headers = auth_headers(test_admin)
+    assert client.get("/api/admin/db/pool", headers=headers).status_code == 200
+
+    with count_queries(async_engine.sync_engine) as counter:
+        response = client.get("/api/admin/db/pool", headers=headers)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert counter.count == 0, "The principal should come from the cache"
+
+
+def test_strict_lookup_bypasses_cache(
+    client: TestClient, test_admin: UserExtended, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that strict mode reads the user on every request."""
+
+    monkeypatch.setattr(settings, "AUTH_STRICT_USER_LOOKUP", True)
+    headers = auth_headers(test_admin)
+    client.get("/api/admin/db/pool", headers=headers)
+
+    with count_queries(async_engine.sync_engine) as counter:
+        client.get("/api/admin/db/pool", headers=headers)
+
+    assert counter.count == 1
+
+
+def test_role_change_invalidates_principal(
+    client: TestClient, test_admin: UserExtended
+) -> None:
+    """Test that a demoted admin loses access immediately."""
+
+    headers = auth_headers(test_admin)
+    assert client.get("/api/admin/db/pool", headers=headers).status_code == 200
+
+    client.put(
+        f"/api/update/user/{test_admin.id}", json={"role": "user"}, headers=headers
+    )
+
+    response = client.get("/api/admin/db/pool", headers=headers)
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_deactivation_invalidates_principal(
+    client: TestClient, test_user: UserExtended, test_admin: UserExtended
+) -> None:
+    """Test that deactivated and deleted users are rejected right away."""
+
+    user_headers = auth_headers(test_user)
+    admin_headers = auth_headers(test_admin)
+    user_url = f"/api/update/user/{test_user.id}"
+    assert client.put(user_url, json={}, headers=user_headers).status_code == 200
+
+    client.put(user_url, json={"is_active": False}, headers=admin_headers)
+    response = client.put(user_url, json={}, headers=user_headers)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    client.delete(f"/api/delete/user/{test_admin.id}", headers=admin_headers)
+    response = client.get("/api/admin/db/pool", headers=admin_headers)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,49 @@
+from contextlib import contextmanager
+from typing import Any, Generator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryCounter:
+    """
+    Collects the SQL statements executed on an engine.
+    """
+
+    def __init__(self) -> None:
+        self.statements: list[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def __call__(self, conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        if not statement.lstrip().upper().startswith(("SAVEPOINT", "RELEASE")):
+            self.statements.append(statement)
+
+
+@contextmanager
+def count_queries(engine: Engine) -> Generator[QueryCounter, Any, None]:
+    """Count the queries executed on `engine` inside the block."""
+
+    counter = QueryCounter()
+    event.listen(engine, "before_cursor_execute", counter)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", counter)
+
+
+@contextmanager
+def assert_max_queries(
+    engine: Engine, budget: int
+) -> Generator[QueryCounter, Any, None]:
+    """Fail when the block executes more than `budget` queries on `engine`."""
+
+    with count_queries(engine) as counter:
+        yield counter
+
+    statements = "\n".join(counter.statements)
+    assert (
+        counter.count <= budget
+    ), f"{counter.count} queries executed, the budget is {budget}:\n{statements}"